@@ -0,0 +1,97 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import argparse
+from luis_sdk.luis_response import LUISResponse
+from .measure import time_per_call
+from .payloads import synthetic_response
+
+def _scan(res, types, ranges):
+    '''
+    Looks entities up by type and by range the way slot filling code does without an index.
+    :param res: The LUISResponse object.
+    :param types: The entity types looked up.
+    :param ranges: The (start, end) ranges looked up.
+    :return: The number of entities found.
+    '''
+    found = 0
+    for entity_type in types:
+        found += len([entity for entity in res.get_entities() if entity.get_type() == entity_type])
+    for start, end in ranges:
+        found += len([entity for entity in res.get_entities() if entity.get_start_idx() is not None
+                      and entity.get_start_idx() <= end and entity.get_end_idx() >= start])
+    return found
+
+def _indexed(res, types, ranges):
+    '''
+    Looks the same entities up through the response's entity index.
+    :param res: The LUISResponse object.
+    :param types: The entity types looked up.
+    :param ranges: The (start, end) ranges looked up.
+    :return: The number of entities found.
+    '''
+    index = res.get_entity_index()
+    found = 0
+    for entity_type in types:
+        found += len(index.get_entities_by_type(entity_type))
+    for start, end in ranges:
+        found += len(index.get_entities_overlapping(start, end))
+    return found
+
+def main(argv=None):
+    '''
+    Compares scanning the entity lists with the entity index for a turn's worth of lookups
+    by type and by character range, building the index included.
+    Run from the python3 directory with: python -m benchmarks.entity_index
+    :param argv: The command line arguments, sys.argv if None.
+    :return: None.
+    '''
+    parser = argparse.ArgumentParser(description='Entity lookups with and without the entity index.')
+    parser.add_argument('--lookups', type=int, default=10, help='lookups by type and by range per turn')
+    args = parser.parse_args(argv)
+
+    print('%-10s %14s %14s' % ('entities', 'scan us', 'index us'))
+    for num_entities in (6, 30, 120):
+        payload = synthetic_response(num_intents=1, num_entities=num_entities, num_composites=0)
+        entities = payload['entities']
+        types = [entities[i * 7 % num_entities]['type'] for i in range(args.lookups)]
+        ranges = [(entities[i * 5 % num_entities]['startIndex'], entities[i * 5 % num_entities]['startIndex'] + 10)
+                  for i in range(args.lookups)]
+        responses = [LUISResponse(payload) for _ in range(2)]
+        assert _scan(responses[0], types, ranges) == _indexed(responses[1], types, ranges)
+        scan = time_per_call(lambda: _scan(LUISResponse(payload), types, ranges), number=500)
+        indexed = time_per_call(lambda: _indexed(LUISResponse(payload), types, ranges), number=500)
+        print('%-10d %14.2f %14.2f' % (num_entities, scan * 1e6, indexed * 1e6))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import argparse
+import io
+import json
+import time
+from luis_sdk.batch import result_record
+from luis_sdk.luis_exporter import LUISColumnarExporter, pyarrow
+from luis_sdk.luis_response import LUISResponse
+from .payloads import synthetic_response
+
+def _per_row_json(responses):
+    '''
+    Writes responses the way the batch command does, one JSON object per row built from the getters.
+    :param responses: A list of LUISResponse objects.
+    :return: The number of bytes written.
+    '''
+    output = io.BytesIO()
+    for res in responses:
+        output.write(json.dumps(result_record(res.get_query(), res), ensure_ascii=False).encode('UTF-8') + b'\n')
+    return len(output.getvalue())
+
+def _columnar(responses, output_format, row_group_size):
+    '''
+    Writes responses with a LUISColumnarExporter.
+    :param responses: A list of LUISResponse objects or raw JSON payloads.
+    :param output_format: "parquet", "csv" or "jsonl".
+    :param row_group_size: The number of rows per row group.
+    :return: The number of bytes written.
+    '''
+    output = io.BytesIO()
+    with LUISColumnarExporter(output, output_format, row_group_size=row_group_size) as exporter:
+        exporter.write_many(responses)
+    return len(output.getvalue())
+
+def main(argv=None):
+    '''
+    Compares the CPU time and output size of exporting responses as per-row JSON
+    with the columnar exporter's Parquet, CSV and JSONL outputs.
+    Run from the python3 directory with: python -m benchmarks.export
+    :param argv: The command line arguments, sys.argv if None.
+    :return: None.
+    '''
+    parser = argparse.ArgumentParser(description='Columnar export of LUIS responses.')
+    parser.add_argument('--responses', type=int, default=20000, help='responses exported')
+    parser.add_argument('--distinct', type=int, default=20000, help='distinct synthetic payloads')
+    parser.add_argument('--row-group-size', type=int, default=10000, help='rows per row group')
+    args = parser.parse_args(argv)
+
+    bodies = [json.dumps(synthetic_response(10, 6, 1, seed=i)).encode('UTF-8') for i in range(args.distinct)]
+    responses = [LUISResponse(bodies[i % len(bodies)]) for i in range(args.responses)]
+    decoded = [json.loads(bodies[i % len(bodies)]) for i in range(args.responses)]
+    cases = [('per-row json (getters)', lambda: _per_row_json(responses))]
+    formats = ('parquet', 'csv', 'jsonl') if pyarrow is not None else ('csv', 'jsonl')
+    for output_format in formats:
+        cases.append(('%s (responses)' % output_format
+                      , lambda f=output_format: _columnar(responses, f, args.row_group_size)))
+        cases.append(('%s (decoded json)' % output_format
+                      , lambda f=output_format: _columnar(decoded, f, args.row_group_size)))
+    print('%-26s %10s %14s' % ('export', 'us/row', 'bytes/row'))
+    for name, func in cases:
+        start = time.perf_counter()
+        size = func()
+        elapsed = time.perf_counter() - start
+        print('%-26s %10.2f %14.1f' % (name, elapsed / args.responses * 1e6, size / args.responses))
+
+if __name__ == '__main__':
+    main()
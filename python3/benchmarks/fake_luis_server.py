@@ -0,0 +1,359 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+from .payloads import scaled_response
+
+class _FakeLUISHandler(BaseHTTPRequestHandler):
+    '''
+    Answers the LUIS v2.0 predict and reply requests with canned responses.
+    '''
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        '''
+        Serves a predict request, or a reply request if it carries a context id.
+        :return: None.
+        '''
+        server = self.server.fake_luis
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        if not parts.path.startswith('/luis/v2.0/apps/') or 'q' not in query:
+            self._send(404, {'statusCode': 404, 'message': 'Resource not found'})
+            return
+        server.count_request()
+        try:
+            delay = server.get_latency()
+            if delay > 0:
+                time.sleep(delay)
+            if server.is_throttled():
+                self._send(429, {'statusCode': 429, 'message': 'Rate limit is exceeded. Try again in 1 seconds.'}
+                           , {'Retry-After': '1'})
+                return
+            if server.should_fail():
+                self._send(503, {'statusCode': 503, 'message': 'Service unavailable'})
+                return
+            body = server.make_response(query['q'][0], query.get('contextid', [None])[0]
+                                        , query.get('forceset', [None])[0])
+            self._send(200, body)
+        finally:
+            server.finish_request()
+
+    def _send(self, status, body, headers=None):
+        '''
+        Writes a JSON response.
+        :param status: The HTTP status code.
+        :param body: The dictionary to be sent as JSON.
+        :param headers: A dictionary of extra headers, or None.
+        :return: None.
+        '''
+        data = json.dumps(body).encode('UTF-8')
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        '''
+        Keeps the request log quiet.
+        :return: None.
+        '''
+        pass
+
+class _FakeLUISHTTPServer(ThreadingHTTPServer):
+    '''
+    A threading HTTP server that accepts bursts of new connections and stays quiet
+    when a client drops a connection, as cancelled hedged requests do.
+    '''
+    daemon_threads = True
+    request_queue_size = 128
+
+    def handle_error(self, request, client_address):
+        '''
+        Ignores the errors of connections closed by the client.
+        :return: None.
+        '''
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+class FakeLUISServer:
+    '''
+    Fake LUIS Server Class.
+    A local stand-in for the LUIS endpoint serving canned v2.0 predict and reply
+    responses over plain HTTP keep-alive connections, with a configurable latency
+    and payload size.
+    '''
+
+    def __init__(self, latency=0.0, num_intents=10, num_entities=6, port=0):
+        '''
+        A constructor for the FakeLUISServer class.
+        :param latency: The number of seconds each request is delayed by.
+        :param num_intents: The number of intents in each response.
+        :param num_entities: The number of entities in each response.
+        :param port: The port to listen on, any free port if 0.
+        '''
+        self._latency = latency
+        self._error_rate = 0.0
+        self._slow_fraction = 0.0
+        self._slow_latency = 0.0
+        self._quota = None
+        self._quota_burst = 0.0
+        self._quota_tokens = 0.0
+        self._quota_updated = 0.0
+        self._num_throttled = 0
+        self._template = scaled_response(num_intents=num_intents, num_entities=num_entities)
+        self._lock = threading.Lock()
+        self._num_requests = 0
+        self._in_flight = 0
+        self._max_in_flight = 0
+        self._httpd = _FakeLUISHTTPServer(('127.0.0.1', port), _FakeLUISHandler)
+        self._httpd.fake_luis = self
+        self._thread = None
+
+    def __enter__(self):
+        '''
+        Starts serving when entering a with block.
+        :return: The server itself.
+        '''
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        '''
+        Stops serving when leaving a with block.
+        :return: None.
+        '''
+        self.stop()
+
+    def start(self):
+        '''
+        Starts serving in a background thread.
+        :return: The server itself.
+        '''
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        '''
+        Stops serving and closes the listening socket.
+        :return: None.
+        '''
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join()
+
+    def get_host(self):
+        '''
+        A getter for the server's address.
+        :return: A "127.0.0.1:port" string.
+        '''
+        return '%s:%d' % self._httpd.server_address[:2]
+
+    def get_num_requests(self):
+        '''
+        A getter for the number of requests served so far.
+        :return: The number of requests.
+        '''
+        return self._num_requests
+
+    def get_max_in_flight(self):
+        '''
+        A getter for the largest number of requests served at once, which reset_max_in_flight starts over.
+        :return: The number of requests.
+        '''
+        return self._max_in_flight
+
+    def reset_max_in_flight(self):
+        '''
+        Starts counting the largest number of requests served at once over.
+        :return: None.
+        '''
+        with self._lock:
+            self._max_in_flight = self._in_flight
+
+    def get_latency(self):
+        '''
+        A getter for the delay of the next request, which is the slow latency
+        for the configured fraction of the requests.
+        :return: The number of seconds to wait before answering.
+        '''
+        if self._slow_fraction > 0 and random.random() < self._slow_fraction:
+            return self._slow_latency
+        return self._latency
+
+    def set_latency(self, latency):
+        '''
+        A setter for the delay of the following requests.
+        :param latency: The number of seconds each request is delayed by.
+        :return: None.
+        '''
+        self._latency = latency
+
+    def set_tail_latency(self, slow_fraction, slow_latency):
+        '''
+        Makes a fraction of the following requests slow, to simulate a latency tail.
+        :param slow_fraction: A number between 0 and 1.
+        :param slow_latency: The number of seconds the slow requests are delayed by.
+        :return: None.
+        '''
+        self._slow_fraction = slow_fraction
+        self._slow_latency = slow_latency
+
+    def set_quota(self, rate, burst=None):
+        '''
+        Answers the requests over a number of transactions per second with a 429 error,
+        as LUIS does for the subscription tiers.
+        :param rate: The number of requests per second, None to remove the quota.
+        :param burst: The number of requests that may arrive at once, rate if None.
+        :return: None.
+        '''
+        with self._lock:
+            self._quota = rate
+            self._quota_burst = float(rate if burst is None else burst) if rate is not None else 0.0
+            self._quota_tokens = self._quota_burst
+            self._quota_updated = time.monotonic()
+
+    def is_throttled(self):
+        '''
+        Decides whether the current request goes over the quota or not.
+        :return: A boolean that expresses whether the request is throttled or not.
+        '''
+        if self._quota is None:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            self._quota_tokens = min(self._quota_burst
+                                     , self._quota_tokens + (now - self._quota_updated) * self._quota)
+            self._quota_updated = now
+            if self._quota_tokens < 1:
+                self._num_throttled += 1
+                return True
+            self._quota_tokens -= 1
+            return False
+
+    def get_num_throttled(self):
+        '''
+        A getter for the number of requests answered with a 429 error so far.
+        :return: The number of requests.
+        '''
+        return self._num_throttled
+
+    def set_error_rate(self, error_rate):
+        '''
+        A setter for the fraction of the following requests answered with a 503 error.
+        :param error_rate: A number between 0 and 1.
+        :return: None.
+        '''
+        self._error_rate = error_rate
+
+    def should_fail(self):
+        '''
+        Decides whether the current request is answered with an error or not.
+        :return: A boolean that expresses whether the request fails or not.
+        '''
+        return self._error_rate > 0 and random.random() < self._error_rate
+
+    def count_request(self):
+        '''
+        Counts a served request, and the requests being served at once.
+        :return: None.
+        '''
+        with self._lock:
+            self._num_requests += 1
+            self._in_flight += 1
+            self._max_in_flight = max(self._max_in_flight, self._in_flight)
+
+    def finish_request(self):
+        '''
+        Stops counting a request as being served.
+        :return: None.
+        '''
+        with self._lock:
+            self._in_flight -= 1
+
+    def make_response(self, text, context_id=None, force_set_parameter_name=None):
+        '''
+        Builds the canned response for a request.
+        :param text: The request's query.
+        :param context_id: The request's dialog context id, None for a predict request.
+        :param force_set_parameter_name: The request's forceset parameter name.
+        :return: A dictionary containing the response data.
+        '''
+        response = dict(self._template, query=text)
+        dialog = dict(response['dialog'])
+        if context_id is not None:
+            dialog['contextId'] = context_id
+            dialog['status'] = 'Finished'
+            dialog.pop('prompt', None)
+            dialog.pop('parameterName', None)
+            if force_set_parameter_name is not None:
+                dialog['parameterName'] = force_set_parameter_name
+        response['dialog'] = dialog
+        return response
+
+def main(argv=None):
+    '''
+    Runs a fake LUIS server in the foreground, so that benchmarks can target it from another process.
+    Run from the python3 directory with: python -m benchmarks.fake_luis_server --help
+    :param argv: The command line arguments, sys.argv if None.
+    :return: None.
+    '''
+    parser = argparse.ArgumentParser(description='Local stand-in for the LUIS v2.0 endpoint.')
+    parser.add_argument('--port', type=int, default=8000, help='port to listen on')
+    parser.add_argument('--latency', type=float, default=0.0, help='delay per request, in seconds')
+    parser.add_argument('--intents', type=int, default=10, help='intents per response')
+    parser.add_argument('--entities', type=int, default=6, help='entities per response')
+    args = parser.parse_args(argv)
+    server = FakeLUISServer(args.latency, args.intents, args.entities, args.port).start()
+    print('Serving fake LUIS on %s' % server.get_host())
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import argparse
+import asyncio
+import time
+from luis_sdk import LUISClient, AsyncLUISClient, LUISHedgingPolicy
+from .fake_luis_server import FakeLUISServer
+from .measure import percentile
+
+def _sync_latencies(client, requests):
+    '''
+    Times sequential predictions.
+    :param client: The LUISClient object.
+    :param requests: The number of predictions.
+    :return: A sorted list of latencies in seconds.
+    '''
+    latencies = []
+    for i in range(requests):
+        start = time.perf_counter()
+        client.predict('utterance %d' % i)
+        latencies.append(time.perf_counter() - start)
+    return sorted(latencies)
+
+def _many_latencies(client, requests, concurrency):
+    '''
+    Times concurrent predictions made with predict_many, from the moment each text is taken.
+    :param client: The LUISClient object.
+    :param requests: The number of predictions.
+    :param concurrency: The number of predictions in flight.
+    :return: A sorted list of latencies in seconds.
+    '''
+    started = {}
+    def texts():
+        for i in range(requests):
+            text = 'utterance %d' % i
+            started[text] = time.perf_counter()
+            yield text
+    latencies = []
+    for text, res in client.predict_many(texts(), concurrency, ordered=False):
+        if isinstance(res, Exception):
+            raise res
+        latencies.append(time.perf_counter() - started[text])
+    return sorted(latencies)
+
+def _async_latencies(client, requests, concurrency):
+    '''
+    Times concurrent asyncio predictions, closing the client's pool at the end.
+    :param client: The AsyncLUISClient object.
+    :param requests: The number of predictions.
+    :param concurrency: The number of predictions in flight.
+    :return: A sorted list of latencies in seconds.
+    '''
+    async def run():
+        latencies = []
+        semaphore = asyncio.Semaphore(concurrency)
+        async def predict(text):
+            async with semaphore:
+                start = time.perf_counter()
+                await client.predict(text)
+                latencies.append(time.perf_counter() - start)
+        await asyncio.gather(*(predict('utterance %d' % i) for i in range(requests)))
+        client.close()
+        return sorted(latencies)
+    return asyncio.run(run())
+
+def main(argv=None):
+    '''
+    Compares latency percentiles with and without hedging against a fake server
+    whose answers are occasionally slow.
+    Run from the python3 directory with: python -m benchmarks.hedging
+    :param argv: The command line arguments, sys.argv if None.
+    :return: None.
+    '''
+    parser = argparse.ArgumentParser(description='Hedged requests against a fake server with a latency tail.')
+    parser.add_argument('--requests', type=int, default=1000, help='requests per run')
+    parser.add_argument('--latency', type=float, default=0.005, help='usual server delay, in seconds')
+    parser.add_argument('--slow-fraction', type=float, default=0.03, help='fraction of slow requests')
+    parser.add_argument('--slow-latency', type=float, default=0.2, help='delay of the slow requests, in seconds')
+    parser.add_argument('--percentile', type=float, default=90.0, help='hedging percentile')
+    parser.add_argument('--concurrency', type=int, default=64, help='predictions in flight in the concurrent runs')
+    args = parser.parse_args(argv)
+
+    with FakeLUISServer(args.latency) as server:
+        server.set_tail_latency(args.slow_fraction, args.slow_latency)
+        endpoint = 'http://' + server.get_host()
+        print('%-22s %9s %9s %9s %9s %8s %8s %6s' % (
+            'run', 'p50 ms', 'p95 ms', 'p99 ms', 'max ms', 'total s', 'hedges', 'won'))
+        for name in ('sync', 'sync hedged', 'sync concurrent', 'sync concurrent hedged', 'asyncio', 'asyncio hedged'):
+            hedging = LUISHedgingPolicy(args.percentile, max_hedge_ratio=0.1) if name.endswith('hedged') else None
+            start = time.perf_counter()
+            if name.startswith('sync concurrent'):
+                client = LUISClient('bench-app', 'bench-key', endpoint=endpoint, hedging=hedging)
+                latencies = _many_latencies(client, args.requests, args.concurrency)
+                client.shutdown()
+            elif name.startswith('sync'):
+                client = LUISClient('bench-app', 'bench-key', endpoint=endpoint, hedging=hedging)
+                latencies = _sync_latencies(client, args.requests)
+                client.shutdown()
+            else:
+                client = AsyncLUISClient('bench-app', 'bench-key', endpoint=endpoint, hedging=hedging)
+                latencies = _async_latencies(client, args.requests, 8)
+            total = time.perf_counter() - start
+            stats = hedging.get_stats() if hedging is not None else {'hedges': '-', 'hedges_won': '-'}
+            if hedging is not None:
+                hedging.shutdown()
+            print('%-22s %9.2f %9.2f %9.2f %9.2f %8.2f %8s %6s' % (
+                name, percentile(latencies, 50) * 1e3, percentile(latencies, 95) * 1e3
+                , percentile(latencies, 99) * 1e3, latencies[-1] * 1e3, total, stats['hedges'], stats['hedges_won']))
+
+if __name__ == '__main__':
+    main()
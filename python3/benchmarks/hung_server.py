@@ -0,0 +1,109 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import argparse
+import asyncio
+from luis_sdk import LUISClient, AsyncLUISClient, LUISCircuitBreaker
+from .fake_luis_server import FakeLUISServer
+
+def _sync_outcomes(host, calls, deadline, breaker):
+    '''
+    Sends predictions with a deadline from the sync client.
+    :param host: The fake server's "127.0.0.1:port" address.
+    :param calls: The number of predictions.
+    :param deadline: The deadline of each prediction, in seconds.
+    :param breaker: The LUISCircuitBreaker object.
+    :return: A list of the names of the exceptions raised, "ok" for the successful calls.
+    '''
+    client = LUISClient('bench-app', 'bench-key', endpoint='http://' + host, circuit_breaker=breaker)
+    outcomes = []
+    for i in range(calls):
+        try:
+            client.predict('utterance %d' % i, deadline=deadline)
+            outcomes.append('ok')
+        except Exception as exc:
+            outcomes.append(type(exc).__name__)
+    client.shutdown()
+    return outcomes
+
+def _async_outcomes(host, calls, deadline, breaker):
+    '''
+    Sends predictions with a deadline from the asyncio client.
+    :param host: The fake server's "127.0.0.1:port" address.
+    :param calls: The number of predictions.
+    :param deadline: The deadline of each prediction, in seconds.
+    :param breaker: The LUISCircuitBreaker object.
+    :return: A list of the names of the exceptions raised, "ok" for the successful calls.
+    '''
+    async def run():
+        client = AsyncLUISClient('bench-app', 'bench-key', endpoint='http://' + host, circuit_breaker=breaker)
+        outcomes = []
+        for i in range(calls):
+            try:
+                await client.predict('utterance %d' % i, deadline=deadline)
+                outcomes.append('ok')
+            except Exception as exc:
+                outcomes.append(type(exc).__name__)
+        client.close()
+        return outcomes
+    return asyncio.run(run())
+
+def main(argv=None):
+    '''
+    Sends predictions with a short deadline to a fake server that never answers in time,
+    and checks that the timeouts open the circuit breaker.
+    Run from the python3 directory with: python -m benchmarks.hung_server
+    :param argv: The command line arguments, sys.argv if None.
+    :return: None.
+    '''
+    parser = argparse.ArgumentParser(description='Circuit breaker against a hung server and caller deadlines.')
+    parser.add_argument('--calls', type=int, default=6, help='predictions per client')
+    parser.add_argument('--deadline', type=float, default=0.2, help='deadline of each prediction, in seconds')
+    parser.add_argument('--stall', type=float, default=5.0, help='server delay, in seconds')
+    parser.add_argument('--failure-threshold', type=int, default=3, help='failures that open the circuit')
+    args = parser.parse_args(argv)
+
+    failed = []
+    with FakeLUISServer(args.stall) as server:
+        for name, outcomes in (('sync', _sync_outcomes), ('asyncio', _async_outcomes)):
+            breaker = LUISCircuitBreaker(failure_threshold=args.failure_threshold, recovery_timeout=60.0)
+            results = outcomes(server.get_host(), args.calls, args.deadline, breaker)
+            state = breaker.get_state()
+            print('%-8s %-7s %s' % (name, state, ', '.join(results)))
+            if state != 'open':
+                failed.append(name)
+    if failed:
+        raise SystemExit('the circuit stayed closed for: %s' % ', '.join(failed))
+
+if __name__ == '__main__':
+    main()
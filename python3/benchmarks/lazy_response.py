@@ -0,0 +1,75 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import json
+from luis_sdk.luis_response import LUISResponse
+from .measure import time_per_call, memory_per_call
+from .payloads import verbose_response
+
+def main():
+    '''
+    Compares eager and lazy LUISResponse parsing of a typical verbose payload
+    for a handler that only reads the top scoring intent.
+    Run from the python3 directory with: python -m benchmarks.lazy_response
+    :return: None.
+    '''
+    payload = json.dumps(verbose_response())
+    decoded = verbose_response()
+
+    def eager():
+        res = LUISResponse(payload)
+        res.get_top_intent()
+        return res
+
+    def lazy():
+        res = LUISResponse(payload, lazy=True)
+        res.get_top_intent()
+        return res
+
+    def eager_decoded():
+        return LUISResponse(decoded)
+
+    def lazy_decoded():
+        res = LUISResponse(decoded, lazy=True)
+        res.get_top_intent()
+        return res
+
+    print('%-28s %12s %14s %12s' % ('mode', 'us/response', 'bytes held', 'peak bytes'))
+    for name, func in (('eager (json + build)', eager), ('lazy (json + top intent)', lazy)
+                       , ('eager (build only)', eager_decoded), ('lazy (top intent only)', lazy_decoded)):
+        per_call = time_per_call(func)
+        held, peak = memory_per_call(func)
+        print('%-28s %12.2f %14.0f %12.0f' % (name, per_call * 1e6, held, peak))
+
+if __name__ == '__main__':
+    main()
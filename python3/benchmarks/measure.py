@@ -0,0 +1,106 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import gc
+import time
+import tracemalloc
+
+def time_per_call(func, number=10000, repeat=5):
+    '''
+    Times a function, keeping the best of several runs to reduce noise.
+    :param func: The function to be timed, called without arguments.
+    :param number: The number of calls per run.
+    :param repeat: The number of runs.
+    :return: The best run's time per call in seconds.
+    '''
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = (time.perf_counter() - start) / number
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def memory_per_call(func, number=1000):
+    '''
+    Measures the memory allocated by a function, keeping every result alive.
+    :param func: The function to be measured, called without arguments.
+    :param number: The number of calls.
+    :return: A tuple of the bytes still held per result and the peak bytes per call.
+    '''
+    gc.collect()
+    results = []
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        for _ in range(number):
+            results.append(func())
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del results
+    return (retained - before) / number, (peak - before) / number
+
+def allocations_per_call(func, number=200):
+    '''
+    Counts the memory blocks and bytes a function allocates and keeps alive, keeping every result alive.
+    :param func: The function to be measured, called without arguments.
+    :param number: The number of calls.
+    :return: A tuple of the blocks and the bytes still held per result.
+    '''
+    gc.collect()
+    results = []
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        for _ in range(number):
+            results.append(func())
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del results
+    ignored = (tracemalloc.Filter(False, tracemalloc.__file__),)
+    diff = after.filter_traces(ignored).compare_to(before.filter_traces(ignored), 'filename')
+    return sum(stat.count_diff for stat in diff) / number, sum(stat.size_diff for stat in diff) / number
+
+def percentile(values, percent):
+    '''
+    Returns a nearest-rank percentile.
+    :param values: A sorted list of values.
+    :param percent: The percentile, between 0 and 100.
+    :return: The percentile's value.
+    '''
+    index = max(0, min(len(values) - 1, int(round(percent / 100.0 * len(values))) - 1))
+    return values[index]
@@ -0,0 +1,135 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import argparse
+import asyncio
+import time
+from luis_sdk import LUISClient, AsyncLUISClient, LUISMetricsCollector
+from .fake_luis_server import FakeLUISServer
+
+def _run_sync(client, requests):
+    '''
+    Predicts and replies sequentially.
+    :param client: The LUISClient object.
+    :param requests: The number of predictions, each followed by a reply.
+    :return: None.
+    '''
+    for i in range(requests):
+        client.reply('reply %d' % i, client.predict('utterance %d' % i))
+
+def _run_threaded(client, requests, concurrency):
+    '''
+    Predicts on the client's executor.
+    :param client: The LUISClient object.
+    :param requests: The number of predictions.
+    :param concurrency: The number of predictions in flight at once.
+    :return: None.
+    '''
+    for _ in client.predict_many(('utterance %d' % i for i in range(requests)), concurrency):
+        pass
+
+def _run_asyncio(client, requests, concurrency):
+    '''
+    Predicts and replies concurrently inside the event loop, closing the client's pool at the end.
+    :param client: The AsyncLUISClient object.
+    :param requests: The number of predictions, each followed by a reply.
+    :param concurrency: The number of conversations in flight at once.
+    :return: None.
+    '''
+    async def run():
+        semaphore = asyncio.Semaphore(concurrency)
+        async def converse(i):
+            async with semaphore:
+                await client.reply('reply %d' % i, await client.predict('utterance %d' % i))
+        await asyncio.gather(*(converse(i) for i in range(requests)))
+        client.close()
+    asyncio.run(run())
+
+def _run_all(endpoint, requests, concurrency, collector):
+    '''
+    Runs the sync, threaded and asyncio paths, reporting to a collector.
+    :param endpoint: The fake server's endpoint.
+    :param requests: The number of predictions per path.
+    :param concurrency: The number of calls in flight at once on the threaded and asyncio paths.
+    :param collector: The LUISMetricsCollector, or None to run without listeners.
+    :return: The elapsed seconds.
+    '''
+    listeners = None if collector is None else [collector]
+    start = time.perf_counter()
+    client = LUISClient('bench-app', 'bench-key', endpoint=endpoint, max_workers=concurrency, listeners=listeners)
+    _run_sync(client, requests)
+    _run_threaded(client, requests, concurrency)
+    client.shutdown()
+    _run_asyncio(AsyncLUISClient('bench-app', 'bench-key', endpoint=endpoint, listeners=listeners)
+                 , requests, concurrency)
+    return time.perf_counter() - start
+
+def main(argv=None):
+    '''
+    Sends predictions and replies over the sync, threaded and asyncio paths to a fake server,
+    prints the median and 95th percentile of each phase recorded by a LUISMetricsCollector
+    and the overhead of collecting them, and optionally the Prometheus text export.
+    Run from the python3 directory with: python -m benchmarks.metrics
+    :param argv: The command line arguments, sys.argv if None.
+    :return: None.
+    '''
+    parser = argparse.ArgumentParser(description='LUISMetricsCollector against a fake server.')
+    parser.add_argument('--requests', type=int, default=500, help='predictions per path')
+    parser.add_argument('--concurrency', type=int, default=20, help='calls in flight at once')
+    parser.add_argument('--latency', type=float, default=0.002, help='server delay, in seconds')
+    parser.add_argument('--prometheus', action='store_true', help='print the Prometheus text export')
+    args = parser.parse_args(argv)
+
+    with FakeLUISServer(args.latency) as server:
+        endpoint = 'http://' + server.get_host()
+        plain = _run_all(endpoint, args.requests, args.concurrency, None)
+        collector = LUISMetricsCollector()
+        traced = _run_all(endpoint, args.requests, args.concurrency, collector)
+
+    print('%-22s %-8s %8s %10s %10s' % ('metric', 'op', 'count', 'p50', 'p95'))
+    for name in ('luis_dns_seconds', 'luis_connect_seconds', 'luis_ttfb_seconds', 'luis_download_seconds'
+                 , 'luis_parse_seconds', 'luis_call_seconds', 'luis_response_bytes'):
+        for operation in ('predict', 'reply'):
+            histogram = collector.get_histogram(name, operation)
+            if histogram is None:
+                continue
+            print('%-22s %-8s %8d %10s %10s' % (
+                name, operation, histogram['count'], '<= %g' % collector.get_percentile(name, operation, 50)
+                , '<= %g' % collector.get_percentile(name, operation, 95)))
+    print('calls: %s' % collector.get_stats()['calls'])
+    print('elapsed without listeners %.3f s, with the collector %.3f s' % (plain, traced))
+    if args.prometheus:
+        print(collector.export_prometheus(), end='')
+
+if __name__ == '__main__':
+    main()
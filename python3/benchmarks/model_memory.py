@@ -0,0 +1,96 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import json
+from contextlib import contextmanager
+from luis_sdk import luis_action, luis_composite_entity, luis_composite_entity_child, luis_dialog, luis_entity \
+    , luis_entity_index, luis_intent, luis_parameter, luis_parametervalue, luis_response
+from luis_sdk.luis_response import LUISResponse
+from .measure import memory_per_call
+from .payloads import verbose_response
+
+_ModelModules = (luis_action, luis_composite_entity, luis_composite_entity_child, luis_dialog, luis_entity
+                 , luis_entity_index, luis_intent, luis_parameter, luis_parametervalue, luis_response)
+
+def _without_slots(cls):
+    '''
+    Copies a slotted class into a plain one whose instances keep their attributes in a __dict__.
+    :param cls: The class to be copied.
+    :return: The copied class.
+    '''
+    namespace = {name: value for name, value in vars(cls).items()
+                 if name not in cls.__slots__ and name not in ('__slots__', '__dict__', '__weakref__')}
+    return type(cls.__name__, cls.__bases__, namespace)
+
+@contextmanager
+def _dict_models():
+    '''
+    Swaps the model classes for copies without __slots__ in every model module,
+    so that the response objects are built as they were before the slots were added.
+    :return: A context manager yielding the copied LUISResponse class.
+    '''
+    originals = {cls for module in _ModelModules for cls in vars(module).values()
+                 if isinstance(cls, type) and '__slots__' in vars(cls) and cls.__module__ == module.__name__}
+    copies = {cls: _without_slots(cls) for cls in originals}
+    patched = []
+    for module in _ModelModules:
+        for name, value in list(vars(module).items()):
+            if isinstance(value, type) and value in copies:
+                patched.append((module, name, value))
+                setattr(module, name, copies[value])
+    try:
+        yield copies[LUISResponse]
+    finally:
+        for module, name, value in patched:
+            setattr(module, name, value)
+
+def main():
+    '''
+    Reports the memory held by the model objects of a fully built LUISResponse
+    for a typical verbose payload, the decoded JSON itself not included,
+    with the model classes using __dict__ as a baseline and with __slots__.
+    Run from the python3 directory with: python -m benchmarks.model_memory
+    :return: None.
+    '''
+    decoded = verbose_response()
+    size = len(json.dumps(decoded))
+    with _dict_models() as response_class:
+        baseline, _ = memory_per_call(lambda: response_class(decoded), number=5000)
+    held, _ = memory_per_call(lambda: LUISResponse(decoded), number=5000)
+    print('payload: %d bytes of JSON' % size)
+    print('model objects with __dict__: %.0f bytes per response' % baseline)
+    print('model objects with __slots__: %.0f bytes per response (%.0f%% less)'
+          % (held, 100.0 * (baseline - held) / baseline))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import importlib
+import json
+from luis_sdk.luis_response import LUISResponse
+from .measure import time_per_call
+from .payloads import scaled_response
+
+def _fast_decoders():
+    '''
+    Lists the third party JSON decoders that are installed.
+    :return: A list of (name, decoder) tuples.
+    '''
+    decoders = []
+    for name in ('orjson', 'ujson'):
+        try:
+            decoders.append((name, importlib.import_module(name).loads))
+        except ImportError:
+            pass
+    return decoders
+
+def main():
+    '''
+    Compares building a LUISResponse from the decoded str, as the client used to,
+    with passing the raw response bytes and with third party decoders plugged in.
+    Run from the python3 directory with: python -m benchmarks.parse_bytes
+    :return: None.
+    '''
+    for num_intents in (10, 100, 500):
+        body = json.dumps(scaled_response(num_intents=num_intents)).encode('UTF-8')
+        cases = [('str (decode + json.loads)', lambda: LUISResponse(body.decode('UTF-8')))
+                 , ('bytes (default decoder)', lambda: LUISResponse(body))
+                 , ('memoryview (default decoder)', lambda: LUISResponse(memoryview(body)))]
+        for name, decoder in _fast_decoders():
+            cases.append(('bytes (%s)' % name, lambda decoder=decoder: LUISResponse(body, json_decoder=decoder)))
+        print('%d intents, %d bytes:' % (num_intents, len(body)))
+        for name, func in cases:
+            print('  %-30s %10.1f us/response' % (name, time_per_call(func, number=200) * 1e6))
+
+if __name__ == '__main__':
+    main()
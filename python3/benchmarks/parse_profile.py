@@ -0,0 +1,116 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import argparse
+import cProfile
+import json
+import pstats
+from luis_sdk.luis_response import LUISResponse
+from luis_sdk.luis_intent import LUISIntent
+from luis_sdk.luis_entity import LUISEntity
+from luis_sdk.luis_composite_entity import LUISCompositeEntity
+from luis_sdk.luis_dialog import LUISDialog
+from .measure import time_per_call, memory_per_call, allocations_per_call
+from .payloads import synthetic_response
+
+def _stages(body):
+    '''
+    Lists the parse stages of a response body, each as a function building a fresh result.
+    :param body: The raw response bytes.
+    :return: A list of (name, function) tuples.
+    '''
+    decoded = json.loads(body)
+    return [
+        ('json.loads', lambda: json.loads(body)),
+        ('LUISResponse (bytes)', lambda: LUISResponse(body)),
+        ('LUISResponse (dict)', lambda: LUISResponse(decoded)),
+        ('LUISResponse (lazy)', lambda: LUISResponse(decoded, lazy=True)),
+        ('  intents', lambda: [LUISIntent(intent) for intent in decoded['intents']]),
+        ('  top intent', lambda: LUISIntent(decoded['topScoringIntent'])),
+        ('  entities', lambda: [LUISEntity(entity) for entity in decoded['entities']]),
+        ('  composite entities', lambda: [LUISCompositeEntity(composite)
+                                          for composite in decoded['compositeEntities']]),
+        ('  dialog', lambda: LUISDialog(decoded['dialog'])),
+    ]
+
+def _profile(body, number, limit):
+    '''
+    Profiles building LUISResponse objects from bytes in a tight loop and prints the costliest functions.
+    :param body: The raw response bytes.
+    :param number: The number of responses built.
+    :param limit: The number of functions printed.
+    :return: None.
+    '''
+    profiler = cProfile.Profile()
+    profiler.enable()
+    for _ in range(number):
+        LUISResponse(body)
+    profiler.disable()
+    pstats.Stats(profiler).strip_dirs().sort_stats('tottime').print_stats(limit)
+
+def main(argv=None):
+    '''
+    Times each stage of parsing synthetic verbose responses, in a tight loop, and measures the
+    blocks and bytes each result keeps alive and the peak bytes per call with tracemalloc.
+    The default payload has 50 intents with actions and parameters, 30 entities and 5 composite
+    entities; --scale multiplies those counts to see how the parser grows with the payload.
+    Run from the python3 directory with: python -m benchmarks.parse_profile
+    :param argv: The command line arguments, sys.argv if None.
+    :return: None.
+    '''
+    parser = argparse.ArgumentParser(description='Parse stage micro-benchmarks on synthetic LUIS responses.')
+    parser.add_argument('--scale', type=int, nargs='+', default=[1, 4], help='payload size multipliers')
+    parser.add_argument('--intents', type=int, default=50, help='intents at scale 1')
+    parser.add_argument('--entities', type=int, default=30, help='entities at scale 1')
+    parser.add_argument('--composites', type=int, default=5, help='composite entities at scale 1')
+    parser.add_argument('--parameters', type=int, default=4, help='parameters per action')
+    parser.add_argument('--number', type=int, default=200, help='calls per timing run')
+    parser.add_argument('--profile', action='store_true', help='profile the full parse with cProfile')
+    args = parser.parse_args(argv)
+
+    for scale in args.scale:
+        body = json.dumps(synthetic_response(args.intents * scale, args.entities * scale
+                                             , args.composites * scale, args.parameters)).encode('UTF-8')
+        print('scale %d: %d intents, %d entities, %d composites, %d bytes' % (
+            scale, args.intents * scale, args.entities * scale, args.composites * scale, len(body)))
+        print('  %-24s %12s %10s %12s %12s' % ('stage', 'us/call', 'blocks', 'bytes held', 'peak bytes'))
+        for name, func in _stages(body):
+            per_call = time_per_call(func, number=args.number)
+            blocks, held = allocations_per_call(func, number=args.number)
+            _, peak = memory_per_call(func, number=args.number)
+            print('  %-24s %12.2f %10.0f %12.0f %12.0f' % (name, per_call * 1e6, blocks, held, peak))
+        if args.profile:
+            _profile(body, args.number * 5, 15)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import copy
+import random
+
+_VERBOSE_RESPONSE = {
+    'query': 'book me a flight from seattle to cairo next friday for 2 adults',
+    'topScoringIntent': {
+        'intent': 'BookFlight',
+        'score': 0.9887482,
+        'actions': [{
+            'triggered': True,
+            'name': 'BookFlight',
+            'parameters': [
+                {'name': 'from', 'type': 'Location::FromLocation', 'required': True
+                 , 'value': [{'entity': 'seattle', 'type': 'Location::FromLocation', 'score': 0.9312}]},
+                {'name': 'to', 'type': 'Location::ToLocation', 'required': True
+                 , 'value': [{'entity': 'cairo', 'type': 'Location::ToLocation', 'score': 0.9541}]},
+                {'name': 'date', 'type': 'builtin.datetimeV2.date', 'required': False
+                 , 'value': [{'entity': 'next friday', 'type': 'builtin.datetimeV2.date'
+                              , 'resolution': {'values': [{'timex': '2017-06-09', 'type': 'date'
+                                                           , 'value': '2017-06-09'}]}}]},
+                {'name': 'passengers', 'type': 'builtin.number', 'required': False
+                 , 'value': [{'entity': '2', 'type': 'builtin.number', 'resolution': {'value': '2'}}]},
+            ],
+        }],
+    },
+    'intents': [
+        {'intent': 'BookFlight', 'score': 0.9887482, 'actions': [{
+            'triggered': True,
+            'name': 'BookFlight',
+            'parameters': [
+                {'name': 'from', 'type': 'Location::FromLocation', 'required': True
+                 , 'value': [{'entity': 'seattle', 'type': 'Location::FromLocation', 'score': 0.9312}]},
+                {'name': 'to', 'type': 'Location::ToLocation', 'required': True
+                 , 'value': [{'entity': 'cairo', 'type': 'Location::ToLocation', 'score': 0.9541}]},
+                {'name': 'date', 'type': 'builtin.datetimeV2.date', 'required': False
+                 , 'value': [{'entity': 'next friday', 'type': 'builtin.datetimeV2.date'
+                              , 'resolution': {'values': [{'timex': '2017-06-09', 'type': 'date'
+                                                           , 'value': '2017-06-09'}]}}]},
+                {'name': 'passengers', 'type': 'builtin.number', 'required': False
+                 , 'value': [{'entity': '2', 'type': 'builtin.number', 'resolution': {'value': '2'}}]},
+            ],
+        }]},
+        {'intent': 'BookHotel', 'score': 0.0712, 'actions': [{
+            'triggered': False,
+            'name': 'BookHotel',
+            'parameters': [
+                {'name': 'city', 'type': 'Location', 'required': True, 'value': None},
+                {'name': 'checkin', 'type': 'builtin.datetimeV2.date', 'required': True, 'value': None},
+            ],
+        }]},
+        {'intent': 'CancelBooking', 'score': 0.0312},
+        {'intent': 'CheckWeather', 'score': 0.0210},
+        {'intent': 'FlightStatus', 'score': 0.0187},
+        {'intent': 'Greeting', 'score': 0.0094},
+        {'intent': 'Help', 'score': 0.0061},
+        {'intent': 'Cancel', 'score': 0.0043},
+        {'intent': 'Utilities.Confirm', 'score': 0.0021},
+        {'intent': 'None', 'score': 0.0017},
+    ],
+    'entities': [
+        {'entity': 'seattle', 'type': 'Location::FromLocation', 'startIndex': 22, 'endIndex': 28
+         , 'score': 0.9312},
+        {'entity': 'cairo', 'type': 'Location::ToLocation', 'startIndex': 33, 'endIndex': 37
+         , 'score': 0.9541},
+        {'entity': 'next friday', 'type': 'builtin.datetimeV2.date', 'startIndex': 39, 'endIndex': 49
+         , 'resolution': {'values': [{'timex': '2017-06-09', 'type': 'date', 'value': '2017-06-09'}]}},
+        {'entity': '2', 'type': 'builtin.number', 'startIndex': 55, 'endIndex': 55
+         , 'resolution': {'value': '2'}},
+        {'entity': '2 adults', 'type': 'Passengers', 'startIndex': 55, 'endIndex': 62, 'score': 0.8812},
+        {'entity': 'adults', 'type': 'PassengerType', 'startIndex': 57, 'endIndex': 62, 'score': 0.7734},
+    ],
+    'compositeEntities': [
+        {'parentType': 'Passengers', 'value': '2 adults', 'children': [
+            {'type': 'builtin.number', 'value': '2'},
+            {'type': 'PassengerType', 'value': 'adults'},
+        ]},
+    ],
+    'dialog': {
+        'prompt': 'Which class would you like to fly?',
+        'parameterName': 'class',
+        'parameterType': 'FlightClass',
+        'contextId': '5f1ad2b4-3b1e-4b83-9dd1-2a3ff61e8a0b',
+        'status': 'Question',
+    },
+}
+
+def verbose_response():
+    '''
+    Returns a typical verbose v2.0 prediction response with a dialog,
+    ten intents, six entities and a composite entity.
+    :return: A new dictionary containing the response data.
+    '''
+    return copy.deepcopy(_VERBOSE_RESPONSE)
+
+def scaled_response(query=None, num_intents=10, num_entities=6):
+    '''
+    Returns a verbose response resized to a number of intents and entities,
+    the extra ones being renamed copies of the typical response's.
+    :param query: The response's query, the typical response's if None.
+    :param num_intents: The number of intents.
+    :param num_entities: The number of entities.
+    :return: A new dictionary containing the response data.
+    '''
+    response = verbose_response()
+    if query is not None:
+        response['query'] = query
+    intents = response['intents']
+    response['intents'] = [intents[i] if i < len(intents)
+                           else dict(intents[i % len(intents)], intent='Intent%d' % i)
+                           for i in range(num_intents)]
+    entities = response['entities']
+    response['entities'] = [entities[i] if i < len(entities)
+                            else dict(entities[i % len(entities)], type='Entity%d' % i)
+                            for i in range(num_entities)]
+    return response
+
+_BuiltinTypes = ('builtin.number', 'builtin.datetimeV2.date', 'builtin.geography.city', 'builtin.percentage')
+
+def _synthetic_entity(rng, index, start):
+    '''
+    Returns a synthetic entity, a builtin one with a resolution every fourth one, else a scored custom one.
+    :param rng: The random.Random object.
+    :param index: The entity's index, used in its name and type.
+    :param start: The entity's start index in the query.
+    :return: A dictionary containing the entity data.
+    '''
+    name = 'value%d' % index
+    entity = {'entity': name, 'startIndex': start, 'endIndex': start + len(name) - 1}
+    if index % 4 == 3:
+        entity['type'] = _BuiltinTypes[index // 4 % len(_BuiltinTypes)]
+        entity['resolution'] = {'values': [{'type': 'value', 'value': str(index)}]}
+    else:
+        entity['type'] = 'Entity%d' % index
+        entity['score'] = round(rng.random(), 7)
+    return entity
+
+def synthetic_response(num_intents=50, num_entities=30, num_composites=5, num_parameters=4, seed=0):
+    '''
+    Generates a verbose v2.0 prediction response of any size, for parse benchmarks.
+    Every intent carries an action whose parameters are filled from the entities, and the
+    composite entities group consecutive entities. The same arguments give the same response.
+    :param num_intents: The number of intents, at least 1.
+    :param num_entities: The number of entities.
+    :param num_composites: The number of composite entities, each with up to three children.
+    :param num_parameters: The number of parameters of each intent's action.
+    :param seed: The seed of the scores.
+    :return: A new dictionary containing the response data.
+    '''
+    rng = random.Random(seed)
+    words, entities, start = [], [], 0
+    for i in range(num_entities):
+        entity = _synthetic_entity(rng, i, start)
+        entities.append(entity)
+        words.append(entity['entity'])
+        start += len(entity['entity']) + 1
+
+    scores = sorted((rng.random() for _ in range(num_intents)), reverse=True)
+    intents = []
+    for i, score in enumerate(scores):
+        parameters = []
+        for j in range(num_parameters):
+            entity = entities[(i + j) % len(entities)] if entities else None
+            value = None
+            if entity is not None and (i == 0 or j % 2 == 0):
+                value = [dict((k, v) for k, v in entity.items() if k not in ('startIndex', 'endIndex'))]
+            parameters.append({'name': 'param%d' % j, 'type': 'Entity%d' % j if entity is None else entity['type']
+                               , 'required': j == 0, 'value': value})
+        intents.append({'intent': 'Intent%d' % i, 'score': round(score, 7), 'actions': [
+            {'triggered': i == 0, 'name': 'Intent%d' % i, 'parameters': parameters}]})
+
+    composites = []
+    for i in range(min(num_composites, num_entities)):
+        children = entities[i * 3:i * 3 + 3] or entities[i:i + 1]
+        composites.append({'parentType': 'Composite%d' % i, 'value': ' '.join(c['entity'] for c in children)
+                           , 'children': [{'type': c['type'], 'value': c['entity']} for c in children]})
+
+    return {
+        'query': ' '.join(words) or 'hello',
+        'topScoringIntent': copy.deepcopy(intents[0]),
+        'intents': intents,
+        'entities': entities,
+        'compositeEntities': composites,
+        'dialog': {'prompt': 'Which value?', 'parameterName': 'param1', 'parameterType': 'Entity1'
+                   , 'contextId': '5f1ad2b4-3b1e-4b83-9dd1-2a3ff61e8a0b', 'status': 'Question'},
+    }
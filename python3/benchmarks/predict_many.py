@@ -0,0 +1,84 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import argparse
+from luis_sdk import LUISClient, LUISConnectionPool
+from .fake_luis_server import FakeLUISServer
+
+def _max_in_flight(server, client, requests, concurrency):
+    '''
+    Runs predict_many and measures the largest number of requests the server handled at once.
+    :param server: The FakeLUISServer object.
+    :param client: The LUISClient object.
+    :param requests: The number of predictions.
+    :param concurrency: The concurrency passed to predict_many.
+    :return: The number of requests.
+    '''
+    server.reset_max_in_flight()
+    for _, res in client.predict_many(('utterance %d' % i for i in range(requests)), concurrency):
+        if isinstance(res, Exception):
+            raise res
+    return server.get_max_in_flight()
+
+def main(argv=None):
+    '''
+    Checks that predict_many keeps as many requests in flight as it is asked to,
+    up to what the client can send at once.
+    Run from the python3 directory with: python -m benchmarks.predict_many
+    :param argv: The command line arguments, sys.argv if None.
+    :return: None.
+    '''
+    parser = argparse.ArgumentParser(description='Requests in flight with predict_many.')
+    parser.add_argument('--requests', type=int, default=400, help='predictions per run')
+    parser.add_argument('--latency', type=float, default=0.05, help='server delay, in seconds')
+    args = parser.parse_args(argv)
+
+    runs = ((10, 5), (10, 10), (10, 50), (50, 50), (50, 20))
+    failed = []
+    with FakeLUISServer(args.latency) as server:
+        endpoint = 'http://' + server.get_host()
+        print('%8s %12s %10s %10s' % ('workers', 'concurrency', 'expected', 'in flight'))
+        for workers, concurrency in runs:
+            client = LUISClient('bench-app', 'bench-key', endpoint=endpoint, max_workers=workers
+                                , pool=LUISConnectionPool(max_size=workers))
+            expected = min(concurrency, client.get_max_concurrency())
+            in_flight = _max_in_flight(server, client, args.requests, concurrency)
+            client.shutdown()
+            print('%8d %12d %10d %10d' % (workers, concurrency, expected, in_flight))
+            if in_flight != expected:
+                failed.append('%d workers, concurrency %d' % (workers, concurrency))
+    if failed:
+        raise SystemExit('unexpected number of requests in flight for: %s' % '; '.join(failed))
+
+if __name__ == '__main__':
+    main()
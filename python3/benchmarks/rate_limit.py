@@ -0,0 +1,79 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import argparse
+import time
+from luis_sdk import LUISClient, LUISRateLimiter
+from .fake_luis_server import FakeLUISServer
+
+def _run_batch(client, requests, concurrency):
+    '''
+    Predicts a batch of texts and counts the failed predictions.
+    :param client: The LUISClient object.
+    :param requests: The number of predictions.
+    :param concurrency: The number of predictions in flight at once.
+    :return: A tuple of the elapsed seconds and the number of failed predictions.
+    '''
+    start = time.perf_counter()
+    texts = ('utterance %d' % i for i in range(requests))
+    failures = sum(1 for _, res in client.predict_many(texts, concurrency) if isinstance(res, Exception))
+    return time.perf_counter() - start, failures
+
+def main(argv=None):
+    '''
+    Runs a batch against a fake server enforcing a transactions per second quota,
+    with and without a LUISRateLimiter set to the quota, and prints the throughput
+    and how many requests were throttled.
+    Run from the python3 directory with: python -m benchmarks.rate_limit
+    :param argv: The command line arguments, sys.argv if None.
+    :return: None.
+    '''
+    parser = argparse.ArgumentParser(description='LUISRateLimiter against a fake server with a quota.')
+    parser.add_argument('--requests', type=int, default=500, help='predictions per batch')
+    parser.add_argument('--concurrency', type=int, default=20, help='predictions in flight at once')
+    parser.add_argument('--quota', type=float, default=100.0, help='transactions per second of the fake server')
+    args = parser.parse_args(argv)
+
+    with FakeLUISServer(latency=0.005) as server:
+        for name, limiter in (('no limiter', None), ('limiter', LUISRateLimiter(args.quota))):
+            server.set_quota(args.quota)
+            throttled = server.get_num_throttled()
+            client = LUISClient('bench-app', 'bench-key', endpoint='http://' + server.get_host()
+                                , max_workers=args.concurrency, rate_limiter=limiter)
+            elapsed, failures = _run_batch(client, args.requests, args.concurrency)
+            client.shutdown()
+            print('%-10s %7.1f req/s, %d failures, %d throttled' % (
+                name, (args.requests - failures) / elapsed, failures, server.get_num_throttled() - throttled))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import argparse
+import asyncio
+import threading
+import time
+from concurrent.futures import wait
+from luis_sdk import LUISClient, AsyncLUISClient, LUISConnectionPool
+from .fake_luis_server import FakeLUISServer
+from .measure import percentile
+
+def _check(res, index, context_id):
+    '''
+    Checks that a reply's response matches the request it answers.
+    :param res: The LUISResponse object.
+    :param index: The index of the reply.
+    :param context_id: The context Id the reply was sent with.
+    :return: A boolean that expresses whether the response matches or not.
+    '''
+    dialog = res.get_dialog()
+    return res.get_query() == 'reply %d' % index and dialog.get_context_id() == context_id \
+        and dialog.get_status() == 'Finished' and dialog.get_parameter_name() == 'param %d' % index
+
+def _stress_threaded(host, start, replies, concurrency):
+    '''
+    Sends the replies with callbacks on the client's executor, all of them in flight at once
+    up to the client's pending limit.
+    :param host: The fake server's "127.0.0.1:port" address.
+    :param start: The LUISResponse whose dialog the replies continue.
+    :param replies: The number of replies.
+    :param concurrency: The number of executor threads and pooled connections.
+    :return: A tuple of the elapsed seconds, the sorted latencies, and the failed and mismatched counts.
+    '''
+    client = LUISClient('bench-app', 'bench-key', endpoint='http://' + host, max_workers=concurrency
+                        , pool=LUISConnectionPool(max_size=concurrency))
+    context_id = start.get_dialog().get_context_id()
+    lock = threading.Lock()
+    latencies = []
+    counts = {'failed': 0, 'mismatched': 0}
+
+    def handlers(index, sent):
+        def on_success(res):
+            with lock:
+                latencies.append(time.perf_counter() - sent)
+                if not _check(res, index, context_id):
+                    counts['mismatched'] += 1
+        def on_failure(exc):
+            with lock:
+                counts['failed'] += 1
+        return {'on_success': on_success, 'on_failure': on_failure}
+
+    begin = time.perf_counter()
+    futures = [client.reply('reply %d' % i, start, handlers(i, time.perf_counter()), 'param %d' % i)
+               for i in range(replies)]
+    wait(futures)
+    elapsed = time.perf_counter() - begin
+    client.shutdown()
+    return elapsed, sorted(latencies), counts['failed'], counts['mismatched']
+
+def _stress_asyncio(host, start, replies, concurrency):
+    '''
+    Sends the replies as concurrent coroutines, closing the client's pool at the end.
+    :param host: The fake server's "127.0.0.1:port" address.
+    :param start: The LUISResponse whose dialog the replies continue.
+    :param replies: The number of replies.
+    :param concurrency: The client's maximum number of requests in flight.
+    :return: A tuple of the elapsed seconds, the sorted latencies, and the failed and mismatched counts.
+    '''
+    context_id = start.get_dialog().get_context_id()
+
+    async def run():
+        client = AsyncLUISClient('bench-app', 'bench-key', endpoint='http://' + host, max_concurrency=concurrency)
+        latencies = []
+
+        async def reply(index):
+            sent = time.perf_counter()
+            res = await client.reply('reply %d' % index, start, 'param %d' % index)
+            latencies.append(time.perf_counter() - sent)
+            return _check(res, index, context_id)
+
+        begin = time.perf_counter()
+        results = await asyncio.gather(*(reply(i) for i in range(replies)), return_exceptions=True)
+        elapsed = time.perf_counter() - begin
+        client.close()
+        failed = sum(1 for result in results if isinstance(result, BaseException))
+        mismatched = sum(1 for result in results if result is False)
+        return elapsed, sorted(latencies), failed, mismatched
+    return asyncio.run(run())
+
+def main(argv=None):
+    '''
+    Sends thousands of parallel replies with forceset to a fake server, in the threaded
+    and asyncio modes, checks every response against its request, and prints throughput
+    and latency percentiles, measured from submission so they include the time spent queued.
+    Exits with an error status if any reply failed or mismatched.
+    Run from the python3 directory with: python -m benchmarks.reply_stress
+    :param argv: The command line arguments, sys.argv if None.
+    :return: None.
+    '''
+    parser = argparse.ArgumentParser(description='Parallel reply stress test against a fake LUIS server.')
+    parser.add_argument('--replies', type=int, default=5000, help='replies per mode')
+    parser.add_argument('--concurrency', type=int, default=64, help='threads or coroutines in flight')
+    parser.add_argument('--latency', type=float, default=0.002, help='seconds the fake server waits per request')
+    args = parser.parse_args(argv)
+
+    errors = 0
+    with FakeLUISServer(latency=args.latency) as server:
+        client = LUISClient('bench-app', 'bench-key', endpoint='http://' + server.get_host())
+        start = client.predict('start')
+        client.close()
+        print('%-10s %7s %9s %9s %9s %9s %7s %10s' % (
+            'mode', 'count', 'req/s', 'p50 ms', 'p95 ms', 'p99 ms', 'failed', 'mismatched'))
+        for name, stress in (('threaded', _stress_threaded), ('asyncio', _stress_asyncio)):
+            elapsed, latencies, failed, mismatched = stress(server.get_host(), start, args.replies, args.concurrency)
+            errors += failed + mismatched
+            print('%-10s %7d %9.0f %9.3f %9.3f %9.3f %7d %10d' % (
+                name, args.replies, args.replies / elapsed, percentile(latencies, 50) * 1e3
+                , percentile(latencies, 95) * 1e3, percentile(latencies, 99) * 1e3, failed, mismatched))
+    if errors:
+        raise SystemExit('%d replies failed or mismatched' % errors)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import argparse
+from luis_sdk import LUISClient, LUISRouter
+from .fake_luis_server import FakeLUISServer
+
+def _run_phase(client, servers, requests):
+    '''
+    Sends predictions and counts the requests each server answered.
+    :param client: The LUISClient object.
+    :param servers: The list of FakeLUISServer objects.
+    :param requests: The number of predictions.
+    :return: A tuple of the list of requests per server and the number of failed predictions.
+    '''
+    before = [server.get_num_requests() for server in servers]
+    failures = 0
+    for i in range(requests):
+        try:
+            client.predict('utterance %d' % i)
+        except Exception:
+            failures += 1
+    return [server.get_num_requests() - count for server, count in zip(servers, before)], failures
+
+def main(argv=None):
+    '''
+    Routes predictions over three fake regional servers of different latencies,
+    takes the fastest one down half way and brings it back, and prints where
+    the requests went and what the router saw.
+    Run from the python3 directory with: python -m benchmarks.routing
+    :param argv: The command line arguments, sys.argv if None.
+    :return: None.
+    '''
+    parser = argparse.ArgumentParser(description='LUISRouter failover against fake regional servers.')
+    parser.add_argument('--requests', type=int, default=300, help='requests per phase')
+    parser.add_argument('--cooldown', type=float, default=0.5, help='seconds an unhealthy region is skipped for')
+    args = parser.parse_args(argv)
+
+    servers = [FakeLUISServer(latency).start() for latency in (0.002, 0.01, 0.03)]
+    try:
+        router = LUISRouter(['http://' + server.get_host() for server in servers], cooldown=args.cooldown)
+        client = LUISClient('bench-app', 'bench-key', router=router)
+        phases = (('all healthy', None), ('fastest failing', 1.0), ('fastest recovered', 0.0))
+        for name, error_rate in phases:
+            if error_rate is not None:
+                servers[0].set_error_rate(error_rate)
+            served, failures = _run_phase(client, servers, args.requests)
+            print('%s: %d failures' % (name, failures))
+            for server, latency, count in zip(servers, ('2ms', '10ms', '30ms'), served):
+                print('  %-22s %5s %6d requests' % (server.get_host(), latency, count))
+            for stats in router.get_stats():
+                print('  %-29s latency %s, error rate %.2f, healthy %s' % (
+                    stats['endpoint'], '-' if stats['latency'] is None else '%.1fms' % (stats['latency'] * 1e3)
+                    , stats['error_rate'], stats['healthy']))
+        client.shutdown()
+    finally:
+        for server in servers:
+            server.stop()
+
+if __name__ == '__main__':
+    main()
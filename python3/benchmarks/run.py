@@ -0,0 +1,204 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+import tracemalloc
+from luis_sdk import LUISClient, AsyncLUISClient, LUISConnectionPool, LUISAsyncConnectionPool
+from luis_sdk.luis_response import LUISResponse
+from .fake_luis_server import FakeLUISServer
+from .measure import percentile
+from .payloads import scaled_response
+
+def _local_client(client_class, host, **kwargs):
+    '''
+    Creates a client that sends its requests to the fake server.
+    :param client_class: LUISClient or AsyncLUISClient.
+    :param host: The fake server's "host:port" address.
+    :param kwargs: Extra arguments of the client's constructor.
+    :return: A client object.
+    '''
+    return client_class('bench-app', 'bench-key', endpoint='http://' + host, **kwargs)
+
+def bench_sync(host, args):
+    '''
+    Predicts one text at a time with predict.
+    :return: A list of per-request latencies in seconds.
+    '''
+    client = _local_client(LUISClient, host, pool=LUISConnectionPool(max_size=args.concurrency))
+    latencies = []
+    for i in range(args.requests):
+        start = time.perf_counter()
+        client.predict('utterance %d' % i)
+        latencies.append(time.perf_counter() - start)
+    client.shutdown()
+    return latencies
+
+def bench_threaded(host, args):
+    '''
+    Predicts through predict_async on the client's executor.
+    :return: A list of per-request latencies in seconds.
+    '''
+    client = _local_client(LUISClient, host, pool=LUISConnectionPool(max_size=args.concurrency)
+                           , max_workers=args.concurrency)
+    latencies = []
+    lock = threading.Lock()
+    futures = []
+    for i in range(args.requests):
+        start = time.perf_counter()
+        future = client.predict_async('utterance %d' % i)
+        def done(_, start=start):
+            with lock:
+                latencies.append(time.perf_counter() - start)
+        future.add_done_callback(done)
+        futures.append(future)
+    for future in futures:
+        future.result()
+    client.shutdown()
+    return latencies
+
+def bench_batch(host, args):
+    '''
+    Predicts through predict_many, timing each text from the moment it is pulled from the input.
+    :return: A list of per-request latencies in seconds.
+    '''
+    client = _local_client(LUISClient, host, pool=LUISConnectionPool(max_size=args.concurrency)
+                           , max_workers=args.concurrency)
+    starts = {}
+    def texts():
+        for i in range(args.requests):
+            text = 'utterance %d' % i
+            starts[text] = time.perf_counter()
+            yield text
+    latencies = []
+    for text, res in client.predict_many(texts(), concurrency=args.concurrency, ordered=False):
+        if isinstance(res, Exception):
+            raise res
+        latencies.append(time.perf_counter() - starts.pop(text))
+    client.shutdown()
+    return latencies
+
+def bench_asyncio(host, args):
+    '''
+    Predicts through AsyncLUISClient with concurrency coroutines.
+    :return: A list of per-request latencies in seconds.
+    '''
+    async def run():
+        client = _local_client(AsyncLUISClient, host, pool=LUISAsyncConnectionPool(max_size=args.concurrency)
+                               , max_concurrency=args.concurrency)
+        latencies = []
+        async def predict(text):
+            start = time.perf_counter()
+            await client.predict(text)
+            latencies.append(time.perf_counter() - start)
+        await asyncio.gather(*(predict('utterance %d' % i) for i in range(args.requests)))
+        client.close()
+        return latencies
+    return asyncio.run(run())
+
+def bench_parse(host, args):
+    '''
+    Parses a response body like the fake server's without any network.
+    :return: A list of per-parse latencies in seconds.
+    '''
+    body = json.dumps(scaled_response('utterance', args.intents, args.entities)).encode('UTF-8')
+    latencies = []
+    for _ in range(args.requests):
+        start = time.perf_counter()
+        LUISResponse(body)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+MODES = {
+    'sync': bench_sync,
+    'threaded': bench_threaded,
+    'batch': bench_batch,
+    'asyncio': bench_asyncio,
+    'parse': bench_parse,
+}
+
+def main(argv=None):
+    '''
+    Runs the benchmark modes against a fake LUIS server and prints
+    throughput, latency percentiles and, optionally, peak memory.
+    Run from the python3 directory with: python -m benchmarks.run --help
+    :param argv: The command line arguments, sys.argv if None.
+    :return: None.
+    '''
+    parser = argparse.ArgumentParser(description='LUISClient benchmarks against a local fake LUIS server.')
+    parser.add_argument('--modes', default=','.join(MODES), help='comma separated modes among: %s' % ', '.join(MODES))
+    parser.add_argument('--requests', type=int, default=2000, help='requests per mode')
+    parser.add_argument('--concurrency', type=int, default=16, help='requests in flight for the concurrent modes')
+    parser.add_argument('--latency', type=float, default=0.0, help='server side delay per request, in seconds')
+    parser.add_argument('--intents', type=int, default=10, help='intents per response')
+    parser.add_argument('--entities', type=int, default=6, help='entities per response')
+    parser.add_argument('--memory', action='store_true', help='trace peak memory, slows the runs down')
+    parser.add_argument('--host', help='host:port of a fake server started with "python -m benchmarks.fake_luis_server"'
+                        ', so that it does not share the interpreter with the client; one is started in process if omitted')
+    args = parser.parse_args(argv)
+
+    modes = [mode.strip() for mode in args.modes.split(',') if mode.strip()]
+    for mode in modes:
+        if mode not in MODES:
+            parser.error('unknown mode: %s' % mode)
+
+    server = None
+    host = args.host
+    if host is None:
+        server = FakeLUISServer(args.latency, args.intents, args.entities).start()
+        host = server.get_host()
+    try:
+        print('%-9s %8s %10s %9s %9s %9s %12s' % ('mode', 'count', 'req/s', 'p50 ms', 'p95 ms', 'p99 ms', 'peak KiB'))
+        for mode in modes:
+            if args.memory:
+                tracemalloc.start()
+            start = time.perf_counter()
+            latencies = MODES[mode](host, args)
+            elapsed = time.perf_counter() - start
+            peak = '-'
+            if args.memory:
+                peak = '%.0f' % (tracemalloc.get_traced_memory()[1] / 1024.0)
+                tracemalloc.stop()
+            latencies.sort()
+            print('%-9s %8d %10.0f %9.3f %9.3f %9.3f %12s' % (
+                mode, len(latencies), len(latencies) / elapsed, percentile(latencies, 50) * 1e3
+                , percentile(latencies, 95) * 1e3, percentile(latencies, 99) * 1e3, peak))
+    finally:
+        if server is not None:
+            server.stop()
+
+if __name__ == '__main__':
+    main()
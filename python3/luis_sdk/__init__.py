@@ -32,3 +32,19 @@ WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 '''
 
 from .luis_client import LUISClient
+from .luis_connection_pool import LUISConnectionPool
+from .luis_async_client import AsyncLUISClient
+from .luis_async_connection_pool import LUISAsyncConnectionPool
+from .luis_cache import LUISCache, LUISCacheBackend
+from .luis_sqlite_cache import LUISSQLiteCache
+from .luis_router import LUISRouter
+from .luis_hedging import LUISHedgingPolicy
+from .luis_retry import LUISRetryPolicy
+from .luis_errors import LUISHTTPError, LUISRateLimitExceeded, LUISCircuitOpenError, LUISDeadlineExceeded \
+    , LUISServiceTimeout
+from .luis_rate_limiter import LUISRateLimiter
+from .luis_circuit_breaker import LUISCircuitBreaker
+from .luis_session_manager import LUISSessionManager
+from .luis_metrics import LUISMetricsListener, LUISMetricsCollector
+from .luis_score_matrix import LUISScoreMatrix
+from .luis_exporter import LUISColumnarExporter
@@ -0,0 +1,243 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import argparse
+import io
+import json
+import os
+import sys
+from collections import deque
+from .luis_client import LUISClient
+from .luis_cache import LUISCache
+from .luis_sqlite_cache import LUISSQLiteCache
+from .luis_rate_limiter import LUISRateLimiter
+
+def read_utterances(lines, input_format='auto', field='query', skip=0):
+    '''
+    Streams the utterances of a text or JSONL input.
+    Blank lines, and JSONL records without the field, are skipped.
+    :param lines: An iterable of input lines.
+    :param input_format: "text" for one utterance per line, "jsonl" for one JSON object or string per line,
+    "auto" to read the lines starting with "{" or '"' as JSON, and as text if they are not valid JSON.
+    :param field: The field of the JSON objects holding the utterance.
+    :param skip: The number of lines to skip, already processed by an earlier run.
+    :return: A generator of (line number, utterance) tuples, line numbers starting at 0.
+    '''
+    for number, line in enumerate(lines):
+        if number < skip:
+            continue
+        line = line.strip()
+        if not line:
+            continue
+        text = line
+        if input_format == 'jsonl' or (input_format == 'auto' and line[0] in '{"'):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                if input_format == 'jsonl':
+                    raise ValueError('Invalid JSON on line %d' % (number + 1))
+                record = line
+            text = record.get(field) if isinstance(record, dict) else record
+            if not isinstance(text, str):
+                continue
+        if text.strip():
+            yield number, text
+
+def result_record(text, res):
+    '''
+    Flattens a prediction into the dictionary written as a JSONL output line.
+    :param text: The utterance.
+    :param res: The LUISResponse object, or the Exception the prediction failed with.
+    :return: A dictionary with the query, top intent, score and entities, or the query and error.
+    '''
+    if isinstance(res, Exception):
+        return {'query': text, 'error': '%s: %s' % (type(res).__name__, res)}
+    top_intent = res.get_top_intent()
+    return {'query': text
+            , 'top_intent': None if top_intent is None else top_intent.get_name()
+            , 'score': None if top_intent is None else top_intent.get_score()
+            , 'entities': [{'entity': entity.get_name(), 'type': entity.get_type()
+                            , 'start': entity.get_start_idx(), 'end': entity.get_end_idx()
+                            , 'score': entity.get_score()} for entity in res.get_entities() or ()]}
+
+def _load_checkpoint(path):
+    '''
+    Reads a checkpoint file.
+    :param path: The checkpoint file's path, or None.
+    :return: A tuple of the number of input lines processed and the output size in bytes, zeros if missing.
+    '''
+    if path is None or not os.path.exists(path):
+        return 0, 0
+    with open(path, encoding='UTF-8') as checkpoint:
+        state = json.load(checkpoint)
+    return state['offset'], state['output_bytes']
+
+def _save_checkpoint(path, offset, output_bytes):
+    '''
+    Atomically replaces a checkpoint file.
+    :param path: The checkpoint file's path.
+    :param offset: The number of input lines processed.
+    :param output_bytes: The size of the output file once those lines are written.
+    :return: None.
+    '''
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='UTF-8') as checkpoint:
+        json.dump({'offset': offset, 'output_bytes': output_bytes}, checkpoint)
+        checkpoint.flush()
+        os.fsync(checkpoint.fileno())
+    os.replace(temp_path, path)
+
+def run(client, lines, output, concurrency=10, input_format='auto', field='query', offset=0
+        , checkpoint=None, checkpoint_every=1000):
+    '''
+    Predicts the utterances of an input and writes a JSONL result line for each, in input order.
+    At most concurrency predictions are in flight, so memory does not grow with the input.
+    :param client: The LUISClient object.
+    :param lines: An iterable of input lines.
+    :param output: A binary file the JSONL results are written to.
+    :param concurrency: The maximum number of predictions in flight at once.
+    :param input_format: "text", "jsonl" or "auto", see read_utterances.
+    :param field: The field of the JSON objects holding the utterance.
+    :param offset: The number of input lines already processed by an earlier run.
+    :param checkpoint: The checkpoint file's path, None to not checkpoint.
+    :param checkpoint_every: The number of results written between two checkpoints.
+    :return: A tuple of the number of results written and the number of failed predictions.
+    '''
+    numbers = deque()
+
+    def texts():
+        for number, text in read_utterances(lines, input_format, field, offset):
+            numbers.append(number)
+            yield text
+
+    written = failed = 0
+    for text, res in client.predict_many(texts(), concurrency, ordered=True):
+        number = numbers.popleft()
+        record = result_record(text, res)
+        failed += 'error' in record
+        output.write(json.dumps(record, ensure_ascii=False).encode('UTF-8') + b'\n')
+        written += 1
+        if checkpoint is not None and written % checkpoint_every == 0:
+            _checkpoint(output, checkpoint, number + 1)
+    if checkpoint is not None and written:
+        _checkpoint(output, checkpoint, number + 1)
+    output.flush()
+    return written, failed
+
+def _checkpoint(output, path, offset):
+    '''
+    Flushes the output to disk, then records how far the input has been processed.
+    :param output: The binary output file.
+    :param path: The checkpoint file's path.
+    :param offset: The number of input lines processed.
+    :return: None.
+    '''
+    output.flush()
+    try:
+        os.fsync(output.fileno())
+        output_bytes = output.tell()
+    except (OSError, io.UnsupportedOperation, ValueError):
+        output_bytes = None
+    _save_checkpoint(path, offset, output_bytes)
+
+def main(argv=None):
+    '''
+    Scores a stream of utterances with LUIS and writes JSONL results.
+    Run with: python -m luis_sdk.batch --help
+    :param argv: The command line arguments, sys.argv if None.
+    :return: None.
+    '''
+    parser = argparse.ArgumentParser(prog='python -m luis_sdk.batch'
+                                     , description='Scores utterances with LUIS and writes one JSON result per line.')
+    parser.add_argument('input', nargs='?', default='-', help='input file, one utterance or JSON record per line'
+                        ', stdin if omitted or "-"')
+    parser.add_argument('-o', '--output', default='-', help='output JSONL file, stdout if omitted or "-"')
+    parser.add_argument('--app-id', default=os.environ.get('LUIS_APP_ID'), help='LUIS app id, $LUIS_APP_ID by default')
+    parser.add_argument('--app-key', default=os.environ.get('LUIS_APP_KEY')
+                        , help='LUIS subscription key, $LUIS_APP_KEY by default')
+    parser.add_argument('--endpoint', help='LUIS endpoint, the West US one by default')
+    parser.add_argument('--format', choices=('auto', 'text', 'jsonl'), default='auto', help='input format')
+    parser.add_argument('--field', default='query', help='field of the JSONL records holding the utterance')
+    parser.add_argument('--concurrency', type=int, default=10, help='predictions in flight at once')
+    parser.add_argument('--rate', type=float, help='maximum requests per second, no limit if omitted')
+    parser.add_argument('--burst', type=float, help='requests allowed at once by the rate limit, --rate by default')
+    parser.add_argument('--cache', help='SQLite cache file shared between runs, "memory" for an in-process cache')
+    parser.add_argument('--cache-ttl', type=float, default=86400.0, help='seconds a cached prediction stays valid')
+    parser.add_argument('--checkpoint', help='checkpoint file, the run resumes from it if it exists')
+    parser.add_argument('--checkpoint-every', type=int, default=1000, help='results written between checkpoints')
+    args = parser.parse_args(argv)
+
+    if not args.app_id or not args.app_key:
+        parser.error('the app id and subscription key are required')
+    if args.concurrency < 1:
+        parser.error('invalid concurrency')
+    if args.checkpoint_every < 1:
+        parser.error('invalid checkpoint interval')
+
+    offset, output_bytes = _load_checkpoint(args.checkpoint)
+    cache = None
+    if args.cache == 'memory':
+        cache = LUISCache(ttl=args.cache_ttl)
+    elif args.cache:
+        cache = LUISSQLiteCache(args.cache, ttl=args.cache_ttl)
+    rate_limiter = None if args.rate is None else LUISRateLimiter(args.rate, args.burst)
+    client = LUISClient(args.app_id, args.app_key, max_workers=args.concurrency, cache=cache
+                        , endpoint=args.endpoint, rate_limiter=rate_limiter)
+
+    if args.input == '-':
+        source = io.TextIOWrapper(sys.stdin.buffer, encoding='UTF-8')
+    else:
+        source = open(args.input, encoding='UTF-8')
+    if args.output == '-':
+        output = sys.stdout.buffer
+    elif offset:
+        output = open(args.output, 'r+b' if os.path.exists(args.output) else 'wb')
+        if output_bytes is not None:
+            output.truncate(output_bytes)
+        output.seek(0, os.SEEK_END)
+    else:
+        output = open(args.output, 'wb')
+    try:
+        written, failed = run(client, source, output, args.concurrency, args.format, args.field, offset
+                              , args.checkpoint, args.checkpoint_every)
+    finally:
+        if args.input != '-':
+            source.close()
+        if output is not sys.stdout.buffer:
+            output.close()
+        client.shutdown()
+    print('%d results written, %d failed%s' % (written, failed, ', resumed at line %d' % offset if offset else '')
+          , file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
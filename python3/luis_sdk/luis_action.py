@@ -38,6 +38,7 @@ class LUISAction:
     LUIS Action Class.
     Describes the LUIS Action structure.
     '''
+    __slots__ = ('_name', '_triggered', '_parameters')
 
     def __init__(self, action):
         '''
@@ -0,0 +1,397 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import asyncio
+import time
+import http.client
+from .luis_base_client import LUISBaseClient
+from .luis_deadline import get_end_time, get_remaining
+from .luis_response import LUISResponse
+from .luis_metrics import LUISCallTrace, LUISRequestTrace
+from .luis_errors import LUISRateLimitExceeded, LUISCircuitOpenError, LUISDeadlineExceeded, LUISServiceTimeout
+from .luis_async_connection_pool import LUISAsyncConnectionPool
+
+class AsyncLUISClient(LUISBaseClient):
+    '''
+    This is the asyncio interface of the LUIS
+    Constructs an AsyncLUISClient with the corresponding user's App Id and Subscription Keys
+    Predicts and replies inside the event loop, through awaitable predict and reply coroutines
+    '''
+
+    def __init__(self, app_id, app_key, verbose=True, pool=None, max_concurrency=100, lazy_responses=False
+                 , json_decoder=None, endpoint=None, router=None, hedging=None, retry=None
+                 , rate_limiter=None, circuit_breaker=None, connect_timeout=10.0, read_timeout=30.0
+                 , coalesce=False, listeners=None):
+        '''
+        A constructor for the AsyncLUISClient class.
+        :param app_id: A string containing the application id.
+        :param app_key: A string containing the subscription key.
+        :param verbose: A boolean to indicate whether the verbose version should used or not.
+        :param pool: A LUISAsyncConnectionPool to send the requests through, a new one is created if None.
+        :param max_concurrency: The maximum number of requests the client has in flight at once.
+        :param lazy_responses: A boolean to indicate whether the returned LUISResponse objects build
+        their intents, entities and dialog on first access or not.
+        :param json_decoder: A function that decodes the raw response bytes into a dictionary,
+        json.loads is used if None.
+        :param endpoint: The LUIS endpoint to send the requests to, such as "westeurope.api.cognitive.microsoft.com",
+        optionally with a port and an "https://" or "http://" prefix, the West US endpoint is used if None.
+        :param router: A LUISRouter spreading the requests over several regional endpoints, instead of endpoint.
+        :param hedging: A LUISHedgingPolicy to send duplicates of slow requests, None to disable hedging.
+        :param retry: A LUISRetryPolicy to send failed requests again, None to raise the first failure.
+        :param rate_limiter: A LUISRateLimiter every request sent takes a token from, None to send at will.
+        :param circuit_breaker: A LUISCircuitBreaker to stop sending requests during an outage, None to always send.
+        The client has no cache, so an open circuit always fails right away.
+        :param connect_timeout: The number of seconds allowed to connect to LUIS, for the pool created by the client,
+        None for the pool's default.
+        :param read_timeout: The number of seconds allowed to read a response, for the pool created by the client,
+        None for the pool's default.
+        :param coalesce: A boolean to indicate whether concurrent predictions of the same text share
+        a single request and response or not, responses carrying a dialog are never shared.
+        :param listeners: A list of LUISMetricsListener objects to report the phases of every call sent to, or None.
+        '''
+        if max_concurrency is None:
+            raise TypeError('NULL concurrency limit')
+        if max_concurrency < 1:
+            raise ValueError('Invalid concurrency limit')
+        super().__init__(app_id, app_key, verbose, pool, lazy_responses, json_decoder, endpoint, router, hedging
+                         , retry, rate_limiter, circuit_breaker, connect_timeout, read_timeout, coalesce, listeners)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    def _new_pool(self):
+        '''
+        Creates the connection pool used when none is passed to the constructor.
+        :return: A LUISAsyncConnectionPool object.
+        '''
+        return LUISAsyncConnectionPool(connect_timeout=self._connect_timeout, read_timeout=self._read_timeout)
+
+    async def predict(self, text, deadline=None):
+        '''
+        Predicts without blocking the event loop.
+        If the client coalesces predictions, concurrent predictions of the same text share
+        a single request and LUISResponse, which must be treated as read-only, unless it carries a dialog.
+        :param text: The text to be analysed and predicted.
+        :param deadline: The number of seconds the call may take, waiting for a concurrency slot,
+        for a connection, for the rate limiter, retries and hedges included, None for no limit.
+        A LUISDeadlineExceeded is raised once it runs out.
+        :return: A LUISResponse object containing the response data.
+        '''
+        text = self._check_text(text)
+        end_time = get_end_time(deadline)
+        if self._coalesce:
+            return await self._predict_coalesced_async(text, end_time)
+        return await self._send_and_parse_async('predict', self._predict_url_gen(text), end_time)
+
+    async def _predict_coalesced_async(self, text, end_time):
+        '''
+        Predicts, sharing the request of a concurrent identical prediction if one is in flight.
+        The first caller sends the request and the others wait for its outcome; if the first caller
+        was cancelled or its deadline ran out, the others try again with their own.
+        A response carrying a dialog is not shared, since its context Id belongs to the first
+        caller's conversation: the others then send their own prediction.
+        :param text: The text to be analysed and predicted.
+        :param end_time: The time.monotonic() value of the call's deadline, None for no limit.
+        :return: A LUISResponse object containing the response data.
+        '''
+        flight = self._cache_key(text)
+        while True:
+            future = self._flights.get(flight)
+            if future is None:
+                future = self._flights[flight] = asyncio.get_running_loop().create_future()
+                try:
+                    res = await self._send_and_parse_async('predict', self._predict_url_gen(text), end_time)
+                except asyncio.CancelledError:
+                    del self._flights[flight]
+                    future.set_result(None)
+                    raise
+                except BaseException as exc:
+                    del self._flights[flight]
+                    future.set_exception(exc)
+                    future.exception()
+                    raise
+                del self._flights[flight]
+                future.set_result(res)
+                return res
+            done, _ = await asyncio.wait([future], timeout=get_remaining(end_time))
+            if not done:
+                raise LUISDeadlineExceeded('Deadline exceeded waiting for an identical prediction')
+            try:
+                res = future.result()
+            except LUISDeadlineExceeded:
+                if end_time is not None and time.monotonic() >= end_time:
+                    raise
+                continue
+            if res is None:
+                continue
+            if res.get_dialog() is None:
+                return res
+            return await self._send_and_parse_async('predict', self._predict_url_gen(text), end_time)
+
+    async def reply(self, text, response, force_set_parameter_name=None, deadline=None):
+        '''
+        Replies without blocking the event loop.
+        :param text: The text to be analysed and predicted.
+        :param response: A LUISResponse object that contains the context Id, or its LUISDialog.
+        :param force_set_parameter_name: The name of a parameter the needs to be reset in dialog.
+        :param deadline: The number of seconds the call may take, None for no limit, see predict.
+        :return: A LUISResponse object containg the response data.
+        '''
+        text = self._check_text(text)
+        end_time = get_end_time(deadline)
+        url = self._reply_url_gen(text, response, force_set_parameter_name)
+        return await self._send_and_parse_async('reply', url, end_time, self._reply_endpoint(response))
+
+    async def _send_and_parse_async(self, operation, url, end_time, endpoint=None):
+        '''
+        Sends a GET request within one of the client's concurrency slots and parses its response,
+        reporting the call to the client's listeners.
+        :param operation: The name of the call, "predict" or "reply".
+        :param url: The request url, starting with the path.
+        :param end_time: The time.monotonic() value of the call's deadline, None for no limit.
+        :param endpoint: The (host, secure) endpoint the request is pinned to, None to pick one.
+        :return: A LUISResponse object containing the response data.
+        '''
+        call = None
+        if self._listeners:
+            call = LUISCallTrace(operation)
+            for listener in self._listeners:
+                listener.on_call_start(call)
+        try:
+            await self._acquire_slot(end_time)
+            try:
+                _, body, endpoint = await self._send_request_async(url, end_time, call, endpoint)
+            finally:
+                self._semaphore.release()
+            if call is None:
+                res = LUISResponse(body, self._lazy_responses, self._json_decoder)
+                self._pin_dialog(res, endpoint)
+                return res
+            start = time.perf_counter()
+            res = LUISResponse(body, self._lazy_responses, self._json_decoder)
+            call.parse = time.perf_counter() - start
+            call.size = len(body)
+            self._pin_dialog(res, endpoint)
+            return res
+        except BaseException as exc:
+            if call is not None:
+                call.error = exc
+            raise
+        finally:
+            if call is not None:
+                call.duration = time.perf_counter() - call.start
+                for listener in self._listeners:
+                    listener.on_call_end(call)
+
+    async def _acquire_slot(self, end_time):
+        '''
+        Waits for one of the client's concurrency slots.
+        :param end_time: The time.monotonic() value of the call's deadline, None for no limit.
+        :return: None.
+        '''
+        if end_time is None:
+            await self._semaphore.acquire()
+            return
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), get_remaining(end_time))
+        except asyncio.TimeoutError:
+            raise LUISDeadlineExceeded('Deadline exceeded waiting for a concurrency slot')
+
+    async def _send_request_async(self, url, end_time=None, call=None, endpoint=None):
+        '''
+        Sends a GET request, sending it again after a retryable failure if the client has a retry policy.
+        The backoff waits do not block the event loop, and no retry is sent if its backoff would run past the deadline.
+        :param url: The request url, starting with the path.
+        :param end_time: The time.monotonic() value of the call's deadline, None for no limit.
+        :param call: The LUISCallTrace of the call, None if the client has no listeners.
+        :param endpoint: The (host, secure) endpoint the request is pinned to, None to pick one.
+        :return: A tuple of the LUISAsyncResponse object, the response body bytes and the endpoint that answered.
+        '''
+        retry = self._retry
+        if retry is None:
+            return await self._send_attempt_async(url, end_time, call, endpoint)
+        retry.start_request()
+        attempt = 1
+        while True:
+            try:
+                return await self._send_attempt_async(url, end_time, call, endpoint)
+            except Exception as exc:
+                delay = retry.get_delay(exc, attempt)
+                if end_time is not None and time.monotonic() + delay >= end_time:
+                    raise
+                if not retry.try_retry(exc, attempt):
+                    raise
+                await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _send_attempt_async(self, url, end_time=None, call=None, endpoint=None):
+        '''
+        Sends a GET request once, hedged if the client has a hedging policy.
+        Raises a LUISCircuitOpenError without sending it while the client's circuit breaker is open.
+        :param url: The request url, starting with the path.
+        :param end_time: The time.monotonic() value of the call's deadline, None for no limit.
+        :param call: The LUISCallTrace of the call, None if the client has no listeners.
+        :param endpoint: The (host, secure) endpoint the request is pinned to, None to pick one.
+        :return: A tuple of the LUISAsyncResponse object, the response body bytes and the endpoint that answered.
+        '''
+        get_remaining(end_time)
+        breaker = self._circuit_breaker
+        token = None
+        if breaker is not None:
+            token = breaker.allow_request()
+            if not token:
+                raise LUISCircuitOpenError('LUIS circuit is open')
+        try:
+            if self._hedging is None:
+                result = await self._send_with_failover_async(url, [], end_time, call, endpoint)
+            else:
+                result = await self._send_hedged_async(url, end_time, call, endpoint)
+        except BaseException as exc:
+            if breaker is not None:
+                breaker.record_result(exc, token)
+            raise
+        if breaker is not None:
+            breaker.record_result(token=token)
+        return result
+
+    async def _send_with_failover_async(self, url, tried, end_time=None, call=None, endpoint=None):
+        '''
+        Sends a GET request to the endpoint it is pinned to, else to the client's endpoint
+        or to the endpoint picked by its router. With a router, a request that is not pinned
+        and cannot reach an endpoint, or gets a server error from it, fails over to the next best one.
+        Each request sent, failovers included, waits for a token of the client's rate limiter,
+        a LUISRateLimitExceeded is raised if none is due before the deadline.
+        Throttled requests and server errors that cannot fail over raise a LUISHTTPError.
+        :param url: The request url, starting with the path.
+        :param tried: A list of the endpoints the request was already sent to, extended in place.
+        :param end_time: The time.monotonic() value of the call's deadline, None for no limit.
+        :param call: The LUISCallTrace of the call, None if the client has no listeners.
+        :param endpoint: The (host, secure) endpoint the request is pinned to, None to pick one.
+        :return: A tuple of the LUISAsyncResponse object, the response body bytes and the endpoint that answered.
+        '''
+        pinned = endpoint
+        while True:
+            if pinned is None:
+                endpoint = self._endpoint if self._router is None else self._router.choose(tried)
+            tried.append(endpoint)
+            if self._rate_limiter is not None \
+                    and not await self._rate_limiter.acquire_async(timeout=self._limiter_timeout(end_time)):
+                raise LUISRateLimitExceeded('Rate limit exceeded')
+            start = time.monotonic()
+            try:
+                res, body = await self._pool_request_async(endpoint, url, end_time, call)
+            except LUISDeadlineExceeded as exc:
+                if self._router is not None and isinstance(exc, LUISServiceTimeout):
+                    self._router.record_failure(endpoint)
+                raise
+            except (OSError, http.client.HTTPException, asyncio.IncompleteReadError):
+                if self._router is None:
+                    raise
+                self._router.record_failure(endpoint)
+                if pinned is not None or len(set(tried)) >= len(self._router.get_endpoints()):
+                    raise
+                continue
+            if self._router is not None:
+                if res.status >= 500:
+                    self._router.record_failure(endpoint)
+                    if pinned is None and len(set(tried)) < len(self._router.get_endpoints()):
+                        continue
+                else:
+                    self._router.record_success(endpoint, time.monotonic() - start)
+            self._check_status(res)
+            return res, body, endpoint
+
+    async def _pool_request_async(self, endpoint, url, end_time, call):
+        '''
+        Sends a GET request through the client's connection pool, tracing it if the client has listeners.
+        :param endpoint: The (host, secure) endpoint to send the request to.
+        :param url: The request url, starting with the path.
+        :param end_time: The time.monotonic() value of the call's deadline, None for no limit.
+        :param call: The LUISCallTrace of the call, None if the client has no listeners.
+        :return: A tuple of the LUISAsyncResponse object and the response body bytes.
+        '''
+        if call is None:
+            return await self._pool.request(endpoint[0], 'GET', url, endpoint[1], end_time=end_time)
+        request = LUISRequestTrace(endpoint[0], endpoint[1])
+        call.requests.append(request)
+        try:
+            res, body = await self._pool.request(endpoint[0], 'GET', url, endpoint[1], end_time=end_time
+                                                 , trace=request)
+            request.status = res.status
+        except BaseException as exc:
+            request.error = exc
+            raise
+        finally:
+            for listener in self._listeners:
+                listener.on_request_end(call, request)
+        return res, body
+
+    async def _send_hedged_async(self, url, end_time=None, call=None, endpoint=None):
+        '''
+        Sends a GET request and, if it has not answered within the hedging policy's delay,
+        a duplicate over another pooled connection, or to another endpoint if the client
+        has a router. The first answer wins and the other request is cancelled.
+        :param url: The request url, starting with the path.
+        :param end_time: The time.monotonic() value of the call's deadline, None for no limit.
+        :param call: The LUISCallTrace of the call, None if the client has no listeners.
+        :param endpoint: The (host, secure) endpoint the request and its duplicate are pinned to, None to pick one.
+        :return: A tuple of the LUISAsyncResponse object, the response body bytes and the endpoint that answered.
+        '''
+        hedging = self._hedging
+        hedging.start_request()
+        start = time.monotonic()
+        tried = []
+        primary = asyncio.ensure_future(self._send_with_failover_async(url, tried, end_time, call, endpoint))
+        pending = {primary}
+        try:
+            remaining = get_remaining(end_time)
+            delay = hedging.get_delay()
+            done, _ = await asyncio.wait(pending, timeout=delay if remaining is None else min(delay, remaining))
+            expired = not done and end_time is not None and time.monotonic() >= end_time
+            if done or expired or not hedging.try_hedge():
+                result = await primary
+                hedging.record_latency(time.monotonic() - start)
+                return result
+            hedge = asyncio.ensure_future(self._send_with_failover_async(url, list(tried), end_time, call, endpoint))
+            pending.add(hedge)
+            while pending:
+                done, pending = await asyncio.wait(pending, timeout=get_remaining(end_time, LUISServiceTimeout)
+                                                   , return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    raise LUISServiceTimeout('Deadline exceeded waiting for the response')
+                winners = [task for task in done if task.exception() is None]
+                if winners:
+                    hedging.record_latency(time.monotonic() - start, winners[0] is hedge)
+                    return winners[0].result()
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
@@ -0,0 +1,441 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import asyncio
+import io
+import socket
+import ssl
+import time
+import http.client
+from collections import deque
+from .luis_errors import LUISDeadlineExceeded, LUISServiceTimeout
+
+class LUISAsyncResponse:
+    '''
+    LUIS Async Response Class.
+    Describes the status line and headers of a response read by a LUISAsyncConnectionPool,
+    mirroring the http.client.HTTPResponse attributes the client uses.
+    '''
+
+    def __init__(self, status, reason, headers, will_close):
+        '''
+        A constructor for the LUISAsyncResponse class.
+        :param status: The HTTP status code.
+        :param reason: The HTTP reason phrase.
+        :param headers: An http.client.HTTPMessage containing the response headers.
+        :param will_close: A boolean to indicate whether the server is closing the connection or not.
+        '''
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.will_close = will_close
+
+    def getheader(self, name, default=None):
+        '''
+        Returns the value of a response header.
+        :param name: The header name.
+        :param default: The value returned if the header is missing.
+        :return: The header value.
+        '''
+        return self.headers.get(name, default)
+
+class LUISAsyncConnectionPool:
+    '''
+    LUIS Async Connection Pool Class.
+    The asyncio counterpart of LUISConnectionPool, keeps a bounded number of
+    keep-alive stream connections per host on non-blocking sockets.
+    '''
+    _ReconnectErrors = (asyncio.IncompleteReadError, ConnectionResetError,
+                        ConnectionAbortedError, BrokenPipeError)
+    _ConnectTimeout = 10.0
+    _ReadTimeout = 30.0
+
+    def __init__(self, max_size=100, idle_timeout=60.0, timeout=None, connect_timeout=None, read_timeout=None):
+        '''
+        A constructor for the LUISAsyncConnectionPool class.
+        :param max_size: The maximum number of open connections per host.
+        :param idle_timeout: The number of seconds an idle connection is kept before being closed.
+        :param timeout: The number of seconds allowed to open a new connection, None for the default below.
+        :param connect_timeout: The number of seconds allowed to connect and finish the TLS handshake,
+        timeout if None, or 10 seconds if both are None.
+        :param read_timeout: The number of seconds allowed to send a request and read its whole response,
+        30 seconds if None.
+        '''
+        if max_size is None:
+            raise TypeError('NULL pool size')
+        if max_size < 1:
+            raise ValueError('Invalid pool size')
+        if idle_timeout is None:
+            raise TypeError('NULL idle timeout')
+        if idle_timeout < 0:
+            raise ValueError('Invalid idle timeout')
+        for value in (timeout, connect_timeout, read_timeout):
+            if value is not None and value <= 0:
+                raise ValueError('Invalid timeout')
+
+        self._max_size = max_size
+        self._idle_timeout = idle_timeout
+        self._timeout = timeout
+        self._connect_timeout = connect_timeout or timeout or self._ConnectTimeout
+        self._read_timeout = read_timeout or self._ReadTimeout
+        self._ssl_context = None
+        self._cond = None
+        self._idle = {}
+        self._num_conns = {}
+        self._closed = False
+
+    def get_max_size(self):
+        '''
+        A getter for the pool's maximum number of connections per host.
+        :return: Pool's maximum size.
+        '''
+        return self._max_size
+
+    def get_idle_timeout(self):
+        '''
+        A getter for the pool's idle timeout.
+        :return: Pool's idle timeout in seconds.
+        '''
+        return self._idle_timeout
+
+    def get_num_connections(self, host, secure=True):
+        '''
+        Counts the connections currently open to a host, idle or in use.
+        :param host: The host name, optionally followed by ":port".
+        :param secure: A boolean to indicate whether the connections use HTTPS or not.
+        :return: The number of open connections.
+        '''
+        return self._num_conns.get((host, secure), 0)
+
+    async def request(self, host, method, url, secure=True, headers=None, end_time=None, trace=None):
+        '''
+        Sends a request over a pooled connection and reads the whole response.
+        A request that fails on a reused connection the server has already closed
+        is sent again over a fresh connection.
+        :param host: The host name, optionally followed by ":port".
+        :param method: The HTTP method.
+        :param url: The request url, starting with the path.
+        :param secure: A boolean to indicate whether HTTPS should be used or not.
+        :param headers: A dictionary of extra request headers.
+        :param end_time: The time.monotonic() value the request must be done by, waiting for
+        a connection included, or None for no limit; a LUISDeadlineExceeded is raised past it.
+        :param trace: A LUISRequestTrace to fill the timings of the request's phases and its size in, or None.
+        :return: A tuple of the LUISAsyncResponse object and the response body bytes.
+        '''
+        while True:
+            try:
+                conn, reused = await self.acquire(host, secure, self._timeout_until(None, end_time), trace)
+            except (TimeoutError, asyncio.TimeoutError) as exc:
+                if end_time is not None and time.monotonic() >= end_time \
+                        and not isinstance(exc, LUISDeadlineExceeded):
+                    raise LUISDeadlineExceeded('Deadline exceeded waiting for a pooled connection') from exc
+                raise
+            try:
+                timeout = self._timeout_until(self._read_timeout, end_time)
+                if trace is not None:
+                    trace.reused = reused
+                if timeout is None:
+                    res, body = await self._send(conn, host, method, url, headers, trace)
+                else:
+                    try:
+                        res, body = await asyncio.wait_for(self._send(conn, host, method, url, headers, trace)
+                                                           , timeout)
+                    except asyncio.TimeoutError:
+                        if end_time is not None and time.monotonic() >= end_time:
+                            raise LUISServiceTimeout('Deadline exceeded waiting for the response')
+                        raise TimeoutError('Timed out waiting for the response')
+            except self._ReconnectErrors:
+                await self.release(host, conn, secure, reusable=False)
+                if reused:
+                    continue
+                raise
+            except BaseException:
+                await self.release(host, conn, secure, reusable=False)
+                raise
+            await self.release(host, conn, secure, reusable=not res.will_close)
+            return res, body
+
+    async def acquire(self, host, secure=True, timeout=None, trace=None):
+        '''
+        Takes a healthy idle connection to a host out of the pool,
+        or opens a new one if the host is below the pool's maximum size.
+        Waits while all the host's connections are in use.
+        :param host: The host name, optionally followed by ":port".
+        :param secure: A boolean to indicate whether HTTPS should be used or not.
+        :param timeout: The maximum number of seconds to wait for a connection, opening it included, None to wait forever.
+        :param trace: A LUISRequestTrace to fill the timings of opening a new connection in, or None.
+        :return: A tuple of the (reader, writer) connection and a boolean that expresses whether it was reused or not.
+        '''
+        key = (host, secure)
+        end_time = None if timeout is None else time.monotonic() + timeout
+        cond = self._get_cond()
+        async with cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError('Connection pool is closed')
+                idle = self._idle.get(key)
+                while idle:
+                    conn, last_used = idle.pop()
+                    if self._is_usable(conn, last_used):
+                        return conn, True
+                    conn[1].close()
+                    self._num_conns[key] -= 1
+                if self._num_conns.get(key, 0) < self._max_size:
+                    self._num_conns[key] = self._num_conns.get(key, 0) + 1
+                    break
+                remaining = None if end_time is None else end_time - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError('Timed out waiting for a pooled connection')
+                try:
+                    await asyncio.wait_for(cond.wait(), remaining)
+                except asyncio.TimeoutError:
+                    raise TimeoutError('Timed out waiting for a pooled connection')
+        try:
+            return await self._new_connection(host, secure, end_time, trace), False
+        except BaseException:
+            await self._discard(key)
+            raise
+
+    async def release(self, host, conn, secure=True, reusable=True):
+        '''
+        Gives a connection back to the pool.
+        :param host: The host name the connection was acquired for.
+        :param conn: The (reader, writer) connection to give back.
+        :param secure: A boolean to indicate whether the connection uses HTTPS or not.
+        :param reusable: A boolean to indicate whether the connection can be kept alive or not.
+        :return: None.
+        '''
+        key = (host, secure)
+        if not reusable or self._closed:
+            conn[1].close()
+            await self._discard(key)
+            return
+        now = time.monotonic()
+        cond = self._get_cond()
+        async with cond:
+            idle = self._idle.setdefault(key, deque())
+            while idle and now - idle[0][1] > self._idle_timeout:
+                idle.popleft()[0][1].close()
+                self._num_conns[key] -= 1
+            idle.append((conn, now))
+            cond.notify()
+
+    def close(self):
+        '''
+        Closes all the idle connections, connections in use are closed once released.
+        :return: None.
+        '''
+        self._closed = True
+        for key, idle in self._idle.items():
+            while idle:
+                idle.pop()[0][1].close()
+                self._num_conns[key] -= 1
+
+    def _get_cond(self):
+        '''
+        Creates the pool's condition lazily, so the pool can be built outside the event loop.
+        :return: The pool's asyncio.Condition.
+        '''
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    async def _new_connection(self, host, secure, end_time=None, trace=None):
+        '''
+        Opens a new stream connection to a host.
+        :param host: The host name, optionally followed by ":port".
+        :param secure: A boolean to indicate whether HTTPS should be used or not.
+        :param end_time: The time.monotonic() value the connection must be open by, None for no limit.
+        :param trace: A LUISRequestTrace to fill the DNS, connect and TLS timings in, or None.
+        :return: A (reader, writer) tuple.
+        '''
+        hostname, _, port = host.partition(':')
+        port = int(port) if port else (443 if secure else 80)
+        ssl_context = None
+        if secure:
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            ssl_context = self._ssl_context
+        timeout = self._timeout_until(self._connect_timeout, end_time)
+        if trace is None:
+            opening = asyncio.open_connection(hostname, port, ssl=ssl_context)
+        else:
+            opening = self._open_traced_connection(hostname, port, ssl_context, trace)
+        try:
+            return await asyncio.wait_for(opening, timeout)
+        except asyncio.TimeoutError:
+            if end_time is not None and time.monotonic() >= end_time:
+                raise LUISServiceTimeout('Deadline exceeded connecting to %s' % host)
+            raise TimeoutError('Timed out connecting to %s' % host)
+
+    @staticmethod
+    async def _open_traced_connection(hostname, port, ssl_context, trace):
+        '''
+        Opens a new stream connection, timing the DNS lookup, the TCP connect and the TLS handshake apart.
+        :param hostname: The host name.
+        :param port: The port number.
+        :param ssl_context: The SSLContext to use, None for plain HTTP.
+        :param trace: The LUISRequestTrace to fill the timings in.
+        :return: A (reader, writer) tuple.
+        '''
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        addresses = await loop.getaddrinfo(hostname, port, type=socket.SOCK_STREAM)
+        resolved = time.perf_counter()
+        trace.dns = resolved - start
+        sock, error = None, None
+        for family, sock_type, proto, _, sockaddr in addresses:
+            sock = socket.socket(family, sock_type, proto)
+            sock.setblocking(False)
+            try:
+                await loop.sock_connect(sock, sockaddr)
+            except OSError as exc:
+                sock.close()
+                sock, error = None, exc
+                continue
+            except BaseException:
+                sock.close()
+                raise
+            break
+        if sock is None:
+            raise error or OSError('No address found for %s' % hostname)
+        connected = time.perf_counter()
+        trace.connect = connected - resolved
+        try:
+            conn = await asyncio.open_connection(sock=sock, ssl=ssl_context
+                                                 , server_hostname=hostname if ssl_context is not None else None)
+        except BaseException:
+            sock.close()
+            raise
+        if ssl_context is not None:
+            trace.tls = time.perf_counter() - connected
+        return conn
+
+    @staticmethod
+    def _timeout_until(timeout, end_time):
+        '''
+        Shortens a timeout so that it does not run past a deadline.
+        :param timeout: A number of seconds, None for no limit.
+        :param end_time: The time.monotonic() value of the deadline, None for no deadline.
+        :return: A number of seconds, or None for no limit.
+        '''
+        if end_time is None:
+            return timeout
+        remaining = end_time - time.monotonic()
+        if remaining <= 0:
+            raise LUISDeadlineExceeded('Deadline exceeded')
+        return remaining if timeout is None else min(timeout, remaining)
+
+    async def _discard(self, key):
+        '''
+        Forgets a connection that was closed while it was out of the pool.
+        :param key: The (host, secure) key of the connection.
+        :return: None.
+        '''
+        cond = self._get_cond()
+        async with cond:
+            self._num_conns[key] -= 1
+            cond.notify()
+
+    def _is_usable(self, conn, last_used):
+        '''
+        Checks whether an idle connection can still be used or not.
+        A connection is stale once it has been idle for too long,
+        or once the server has closed its end of the stream.
+        :param conn: The idle (reader, writer) connection.
+        :param last_used: The monotonic time at which the connection was released.
+        :return: A boolean that expresses whether the connection is usable or not.
+        '''
+        if time.monotonic() - last_used > self._idle_timeout:
+            return False
+        reader, writer = conn
+        return not (reader.at_eof() or writer.is_closing())
+
+    async def _send(self, conn, host, method, url, headers, trace=None):
+        '''
+        Writes an HTTP/1.1 request on a connection and reads the whole response.
+        :param conn: The (reader, writer) connection.
+        :param host: The value of the Host header.
+        :param method: The HTTP method.
+        :param url: The request url, starting with the path.
+        :param headers: A dictionary of extra request headers.
+        :param trace: A LUISRequestTrace to fill the time to first byte, download time and size in, or None.
+        :return: A tuple of the LUISAsyncResponse object and the response body bytes.
+        '''
+        reader, writer = conn
+        start = time.perf_counter()
+        lines = ['%s %s HTTP/1.1' % (method, url), 'Host: %s' % host, 'Accept-Encoding: identity']
+        if headers:
+            lines.extend('%s: %s' % (name, value) for name, value in headers.items())
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        await writer.drain()
+
+        status_line = await reader.readline()
+        ttfb_time = time.perf_counter()
+        if not status_line:
+            raise http.client.RemoteDisconnected('Remote end closed connection without response')
+        version, status, reason = (status_line.decode('latin-1').rstrip('\r\n').split(' ', 2) + [''])[:3]
+        if not version.startswith('HTTP/') or not status.isdigit():
+            raise http.client.BadStatusLine(status_line)
+        header_lines = []
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise asyncio.IncompleteReadError(b''.join(header_lines), None)
+            if line in (b'\r\n', b'\n'):
+                break
+            header_lines.append(line)
+        res_headers = http.client.parse_headers(io.BytesIO(b''.join(header_lines) + b'\r\n'))
+
+        will_close = res_headers.get('Connection', '').lower() == 'close' or version == 'HTTP/1.0'
+        if res_headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b';', 1)[0], 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            body = b''.join(chunks)
+        elif res_headers.get('Content-Length') is not None:
+            body = await reader.readexactly(int(res_headers['Content-Length']))
+        else:
+            body = await reader.read()
+            will_close = True
+        if trace is not None:
+            trace.ttfb = ttfb_time - start
+            trace.download = time.perf_counter() - ttfb_time
+            trace.size = len(body)
+        return LUISAsyncResponse(int(status), reason, res_headers, will_close), body
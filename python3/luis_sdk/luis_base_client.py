@@ -0,0 +1,197 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+from urllib.parse import quote
+from .luis_dialog import LUISDialog
+from .luis_router import parse_endpoint
+from .luis_retry import parse_retry_after
+from .luis_errors import LUISHTTPError
+from .luis_deadline import get_remaining
+
+class LUISBaseClient:
+    '''
+    LUIS Base Client Class.
+    Holds what the sync LUISClient and the asyncio AsyncLUISClient share: the app's credentials,
+    the endpoint or router, the policies applied to every request, and the url and status handling.
+    '''
+    _LUISURL = 'westus.api.cognitive.microsoft.com'
+    _PredictMask = '/luis/v2.0/apps/%s?subscription-key=%s&q=%s&verbose=%s'
+    _ReplyMask = '/luis/v2.0/apps/%s?subscription-key=%s&q=%s&contextid=%s&verbose=%s'
+
+    def __init__(self, app_id, app_key, verbose=True, pool=None, lazy_responses=False, json_decoder=None
+                 , endpoint=None, router=None, hedging=None, retry=None
+                 , rate_limiter=None, circuit_breaker=None, connect_timeout=10.0, read_timeout=30.0
+                 , coalesce=False, listeners=None):
+        '''
+        A constructor for the LUISBaseClient class, see LUISClient and AsyncLUISClient for the parameters.
+        '''
+        if app_id is None:
+            raise TypeError('NULL App Id')
+        if not app_id:
+            raise ValueError('Empty App Id')
+        if ' ' in app_id:
+            raise ValueError('Invalid App Id')
+        if app_key is None:
+            raise TypeError('NULL Subscription Key')
+        if not app_key:
+            raise ValueError('Empty Subscription Key')
+        if ' ' in app_key:
+            raise ValueError('Invalid Subscription Key')
+        if endpoint is not None and router is not None:
+            raise ValueError('Pass either an endpoint or a router')
+
+        self._app_id = app_id
+        self._app_key = app_key
+        self._verbose = 'true' if verbose else 'false'
+        self._connect_timeout = connect_timeout
+        self._read_timeout = read_timeout
+        self._owns_pool = pool is None
+        self._pool = self._new_pool() if pool is None else pool
+        self._lazy_responses = lazy_responses
+        self._json_decoder = json_decoder
+        self._endpoint = parse_endpoint(self._LUISURL if endpoint is None else endpoint)
+        self._router = router
+        self._hedging = hedging
+        self._retry = retry
+        self._rate_limiter = rate_limiter
+        self._circuit_breaker = circuit_breaker
+        self._coalesce = coalesce
+        self._flights = {}
+        self._listeners = tuple(listeners) if listeners else ()
+
+    def _new_pool(self):
+        '''
+        Creates the connection pool used when none is passed to the constructor.
+        :return: A connection pool object.
+        '''
+        raise NotImplementedError
+
+    def close(self):
+        '''
+        Closes the client's connection pool, unless it was passed in by the caller.
+        :return: None.
+        '''
+        if self._owns_pool:
+            self._pool.close()
+
+    @staticmethod
+    def _check_text(text):
+        '''
+        Validates the text of a prediction or reply.
+        :param text: The text to be analysed and predicted.
+        :return: The text without its leading and trailing whitespace.
+        '''
+        if text is None:
+            raise TypeError('NULL text to predict')
+        text = text.strip()
+        if not text:
+            raise ValueError('Empty text to predict')
+        return text
+
+    def _limiter_timeout(self, end_time):
+        '''
+        Returns how long a request may wait for a token of the client's rate limiter:
+        the limiter's own timeout, shortened so that it does not run past the call's deadline.
+        :param end_time: The time.monotonic() value of the call's deadline, None for no limit.
+        :return: A number of seconds, or None for no limit.
+        '''
+        remaining = get_remaining(end_time)
+        timeout = self._rate_limiter.get_timeout()
+        if remaining is None:
+            return timeout
+        return remaining if timeout is None else min(timeout, remaining)
+
+    @staticmethod
+    def _check_status(res):
+        '''
+        Raises a LUISHTTPError for the answers a later attempt may succeed on.
+        Other error answers carry a JSON body that LUISResponse reports.
+        :param res: The HTTPResponse or LUISAsyncResponse object.
+        :return: None.
+        '''
+        if res.status == 429 or res.status >= 500:
+            raise LUISHTTPError(res.status, res.reason, parse_retry_after(res.getheader('Retry-After')))
+
+    def _cache_key(self, text):
+        '''
+        Returns the cache key of a prediction, ignoring case and repeated whitespace in the text.
+        :param text: The text to be analysed and predicted.
+        :return: An (app id, verbose flag, normalized text) tuple.
+        '''
+        return (self._app_id, self._verbose, ' '.join(text.split()).lower())
+
+    def _predict_url_gen(self, text):
+        '''
+        Returns the suitable LUIS API predict url.
+        :param text: The text to be analysed and predicted.
+        :return: LUIS API predicton url.
+        '''
+        return self._PredictMask%(self._app_id, self._app_key, quote(text), self._verbose)
+
+    def _reply_url_gen(self, text, response, force_set_parameter_name):
+        '''
+        Generates the suitable LUIS API reply url.
+        :param text: The text to be analysed and predicted.
+        :param response: A LUISResponse object that contains the context Id, or its LUISDialog.
+        :param force_set_parameter_name: The name of a parameter the needs to be reset in dialog.
+        :return: LUIS API reply url.
+        '''
+        dialog = response if isinstance(response, LUISDialog) else response.get_dialog()
+        url = self._ReplyMask%(self._app_id, self._app_key, quote(text)
+                                , dialog.get_context_id(), self._verbose)
+        if force_set_parameter_name is not None:
+            url += '&forceset=%s'%(quote(force_set_parameter_name))
+        return url
+
+    @staticmethod
+    def _reply_endpoint(response):
+        '''
+        Returns the endpoint a reply must be sent to, the one that holds its dialog's context.
+        :param response: A LUISResponse object that contains the context Id, or its LUISDialog.
+        :return: A (host, secure) tuple, None if the dialog was not received through a router.
+        '''
+        dialog = response if isinstance(response, LUISDialog) else response.get_dialog()
+        return dialog.get_endpoint()
+
+    def _pin_dialog(self, res, endpoint):
+        '''
+        Records on a response's dialog the endpoint that served it, so that the replies continuing
+        the dialog reach the region that created its context. Only needed with a router.
+        :param res: A LUISResponse object.
+        :param endpoint: The (host, secure) endpoint that served the response.
+        :return: None.
+        '''
+        if self._router is not None:
+            dialog = res.get_dialog()
+            if dialog is not None:
+                dialog.set_endpoint(endpoint)
@@ -0,0 +1,218 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import threading
+import time
+from collections import OrderedDict
+
+class LUISCacheBackend:
+    '''
+    LUIS Cache Backend Class.
+    Describes the interface the LUISClient uses to look predictions up before sending them
+    and to store the ones it receives.
+    '''
+
+    def get(self, key):
+        '''
+        Looks a response up.
+        :param key: The cache key, an (app id, verbose flag, normalized text) tuple.
+        :return: The cached LUISResponse object, or None if missing or expired.
+        '''
+        raise NotImplementedError
+
+    def get_stale(self, key):
+        '''
+        Looks a response up even if it has expired, as a fallback when LUIS cannot be reached.
+        Backends that do not keep expired responses return None.
+        :param key: The cache key, an (app id, verbose flag, normalized text) tuple.
+        :return: The cached LUISResponse object, or None if missing.
+        '''
+        return None
+
+    def set_response_options(self, lazy_responses, json_decoder):
+        '''
+        Called by the client the cache is passed to, so that backends parsing cached payloads
+        build their responses the way the client builds its own. Backends keeping the
+        LUISResponse objects themselves ignore it.
+        :param lazy_responses: A boolean to indicate whether the LUISResponse objects are built lazily or not.
+        :param json_decoder: A function that decodes the raw payload bytes into a dictionary, or None.
+        :return: None.
+        '''
+
+    def set(self, key, response, body):
+        '''
+        Caches a response.
+        :param key: The cache key, an (app id, verbose flag, normalized text) tuple.
+        :param response: The LUISResponse object to be cached.
+        :param body: The raw JSON payload bytes the response was parsed from.
+        :return: None.
+        '''
+        raise NotImplementedError
+
+    def clear(self):
+        '''
+        Removes all the cached responses.
+        :return: None.
+        '''
+        raise NotImplementedError
+
+    def get_stats(self):
+        '''
+        A getter for the cache's counters.
+        :return: A dictionary with the entries, bytes, hits, misses and evictions counts.
+        '''
+        raise NotImplementedError
+
+class LUISCache(LUISCacheBackend):
+    '''
+    LUIS Cache Class.
+    An in-process LRU cache of LUISResponse objects with a per-entry time to live,
+    bounded by a number of entries and by the size of the cached JSON payloads.
+    Cached responses are shared between callers and must be treated as read-only.
+    '''
+
+    def __init__(self, max_entries=10000, max_bytes=None, ttl=300.0, stale_ttl=0.0):
+        '''
+        A constructor for the LUISCache class.
+        :param max_entries: The maximum number of cached responses.
+        :param max_bytes: The maximum total size of the cached JSON payloads, None for no limit.
+        :param ttl: The number of seconds a response stays valid, None for no expiry.
+        :param stale_ttl: The number of seconds an expired response is kept for get_stale.
+        '''
+        if max_entries is None:
+            raise TypeError('NULL maximum number of entries')
+        if max_entries < 1:
+            raise ValueError('Invalid maximum number of entries')
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError('Invalid maximum size')
+        if ttl is not None and ttl <= 0:
+            raise ValueError('Invalid time to live')
+        if stale_ttl is None or stale_ttl < 0:
+            raise ValueError('Invalid stale time to live')
+
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._stale_ttl = stale_ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key):
+        '''
+        Looks a response up and marks it as the most recently used.
+        :param key: The cache key.
+        :return: The cached LUISResponse object, or None if missing or expired.
+        '''
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            response, size, expires = entry
+            if expires is not None:
+                now = time.monotonic()
+                if expires <= now:
+                    if expires + self._stale_ttl <= now:
+                        del self._entries[key]
+                        self._size -= size
+                        self._evictions += 1
+                    self._misses += 1
+                    return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return response
+
+    def get_stale(self, key):
+        '''
+        Looks a response up even if it has expired, within stale_ttl seconds of its expiry.
+        :param key: The cache key.
+        :return: The cached LUISResponse object, or None if missing.
+        '''
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (entry[2] is not None and entry[2] + self._stale_ttl <= time.monotonic()):
+                return None
+            return entry[0]
+
+    def set(self, key, response, body):
+        '''
+        Caches a response, evicting the least recently used ones to stay within the limits.
+        :param key: The cache key.
+        :param response: The LUISResponse object to be cached.
+        :param body: The raw JSON payload bytes the response was parsed from.
+        :return: None.
+        '''
+        size = len(body)
+        if self._max_bytes is not None and size > self._max_bytes:
+            return
+        expires = None if self._ttl is None else time.monotonic() + self._ttl
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old[1]
+            self._entries[key] = (response, size, expires)
+            self._size += size
+            while len(self._entries) > self._max_entries or \
+                    (self._max_bytes is not None and self._size > self._max_bytes):
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                self._evictions += 1
+
+    def clear(self):
+        '''
+        Removes all the cached responses, the counters are kept.
+        :return: None.
+        '''
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def get_size(self):
+        '''
+        A getter for the total size of the cached JSON payloads.
+        :return: Cache's size in bytes.
+        '''
+        return self._size
+
+    def get_stats(self):
+        '''
+        A getter for the cache's counters.
+        :return: A dictionary with the entries, bytes, hits, misses and evictions counts.
+        '''
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._size, 'hits': self._hits
+                    , 'misses': self._misses, 'evictions': self._evictions}
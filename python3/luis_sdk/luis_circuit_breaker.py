@@ -0,0 +1,191 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import threading
+import time
+import http.client
+from .luis_errors import LUISHTTPError, LUISDeadlineExceeded, LUISServiceTimeout
+
+class LUISCircuitBreaker:
+    '''
+    LUIS Circuit Breaker Class.
+    Stops sending requests to LUIS after a number of consecutive failures, so that callers
+    fail right away during an outage instead of each waiting for a socket timeout.
+    The circuit is closed while requests succeed, opens after failure_threshold consecutive
+    failures, and becomes half open after recovery_timeout seconds, letting a few trial
+    requests through: it closes again once success_threshold of them succeed, and opens
+    again as soon as one of them fails.
+    '''
+    _Closed = 'closed'
+    _Open = 'open'
+    _HalfOpen = 'half_open'
+
+    def __init__(self, failure_threshold=5, recovery_timeout=30.0, half_open_max_calls=1
+                 , success_threshold=1, cache_fallback=False):
+        '''
+        A constructor for the LUISCircuitBreaker class.
+        :param failure_threshold: The number of consecutive failures that opens the circuit.
+        :param recovery_timeout: The number of seconds the circuit stays open before trial requests are let through.
+        :param half_open_max_calls: The maximum number of trial requests in flight while half open.
+        :param success_threshold: The number of successful trial requests that closes the circuit.
+        :param cache_fallback: A boolean to indicate whether predictions are answered from the client's cache,
+        expired responses included, while the circuit is open, or fail right away.
+        '''
+        if failure_threshold is None:
+            raise TypeError('NULL failure threshold')
+        if failure_threshold < 1:
+            raise ValueError('Invalid failure threshold')
+        if recovery_timeout is None or recovery_timeout < 0:
+            raise ValueError('Invalid recovery timeout')
+        if half_open_max_calls < 1:
+            raise ValueError('Invalid number of half open calls')
+        if success_threshold < 1:
+            raise ValueError('Invalid success threshold')
+
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._half_open_max_calls = half_open_max_calls
+        self._success_threshold = success_threshold
+        self._cache_fallback = cache_fallback
+        self._lock = threading.Lock()
+        self._state = self._Closed
+        self._failures = 0
+        self._successes = 0
+        self._trials = set()
+        self._opened_at = 0.0
+        self._rejected = 0
+        self._opened = 0
+
+    def get_state(self):
+        '''
+        A getter for the circuit's state, an open circuit past its recovery timeout is reported as half open.
+        :return: "closed", "open" or "half_open".
+        '''
+        with self._lock:
+            if self._state == self._Open and time.monotonic() - self._opened_at >= self._recovery_timeout:
+                return self._HalfOpen
+            return self._state
+
+    def get_cache_fallback(self):
+        '''
+        A getter for the cache fallback flag.
+        :return: A boolean that expresses whether predictions fall back to the cache while the circuit is open or not.
+        '''
+        return self._cache_fallback
+
+    def is_failure(self, exc):
+        '''
+        Classifies the outcome of a request, only errors that point to LUIS being unreachable
+        or failing count, other errors such as throttling or the caller's deadline running out
+        before the request goes out do not. A deadline running out while connecting to LUIS
+        or waiting for its answer counts, so that a hung service still opens the circuit.
+        :param exc: The exception a request failed with.
+        :return: A boolean that expresses whether the exception counts as a failure or not.
+        '''
+        if isinstance(exc, LUISDeadlineExceeded):
+            return isinstance(exc, LUISServiceTimeout)
+        if isinstance(exc, LUISHTTPError):
+            return exc.get_status() >= 500
+        return isinstance(exc, (OSError, EOFError, http.client.HTTPException))
+
+    def allow_request(self):
+        '''
+        Decides whether a request may be sent, letting trial requests through once the recovery timeout is over.
+        Every allowed request must be followed by a call to record_result with the returned token,
+        only the results of the trial requests count while the circuit is half open.
+        :return: False if the request may not be sent, else a token that is true.
+        '''
+        with self._lock:
+            if self._state == self._Open:
+                if time.monotonic() - self._opened_at < self._recovery_timeout:
+                    self._rejected += 1
+                    return False
+                self._state = self._HalfOpen
+                self._successes = 0
+                self._trials = set()
+            if self._state == self._HalfOpen:
+                if len(self._trials) >= self._half_open_max_calls:
+                    self._rejected += 1
+                    return False
+                token = object()
+                self._trials.add(token)
+                return token
+            return True
+
+    def record_result(self, exc=None, token=None):
+        '''
+        Records the outcome of an allowed request. While the circuit is half open, the outcomes
+        of requests that are not its current trials, such as requests allowed before it opened, are ignored.
+        :param exc: The exception the request failed with, None if it succeeded.
+        :param token: The token allow_request returned for the request.
+        :return: None.
+        '''
+        failed = exc is not None and self.is_failure(exc)
+        with self._lock:
+            if self._state == self._HalfOpen:
+                if token not in self._trials:
+                    return
+                self._trials.discard(token)
+                if failed:
+                    self._open()
+                elif exc is None:
+                    self._successes += 1
+                    if self._successes >= self._success_threshold:
+                        self._state = self._Closed
+                        self._failures = 0
+            elif self._state == self._Closed:
+                if failed:
+                    self._failures += 1
+                    if self._failures >= self._failure_threshold:
+                        self._open()
+                elif exc is None:
+                    self._failures = 0
+
+    def _open(self):
+        '''
+        Opens the circuit. Must be called with the lock held.
+        :return: None.
+        '''
+        self._state = self._Open
+        self._opened_at = time.monotonic()
+        self._opened += 1
+
+    def get_stats(self):
+        '''
+        A getter for the breaker's counters.
+        :return: A dictionary with the state, the consecutive failures, and the opened and rejected counts.
+        '''
+        state = self.get_state()
+        with self._lock:
+            return {'state': state, 'failures': self._failures, 'opened': self._opened
+                    , 'rejected': self._rejected}
@@ -32,124 +32,596 @@ WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 '''
 
 import threading
-from urllib.parse import quote
+import time
+import socket
+import selectors
 import http.client
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
 from .luis_response import LUISResponse
+from .luis_base_client import LUISBaseClient
+from .luis_deadline import get_end_time, get_remaining
+from .luis_connection_pool import LUISConnectionPool
+from .luis_metrics import LUISCallTrace, LUISRequestTrace
+from .luis_errors import LUISRateLimitExceeded, LUISCircuitOpenError, LUISDeadlineExceeded, LUISServiceTimeout
 
-class LUISClient:
+class _LUISHedgeWon(Exception):
+    '''
+    Raised on the original request of a hedged call to abandon it once its duplicate has answered.
+    '''
+
+class LUISClient(LUISBaseClient):
     '''
     This is the interface of the LUIS
     Constructs a LUISClient with the corresponding user's App Id and Subscription Keys
     Starts the prediction procedure for the user's text, and accepts a callback function
     '''
-    _LUISURL = 'westus.api.cognitive.microsoft.com'
-    _PredictMask = '/luis/v2.0/apps/%s?subscription-key=%s&q=%s&verbose=%s'
-    _ReplyMask = '/luis/v2.0/apps/%s?subscription-key=%s&q=%s&contextid=%s&verbose=%s'
 
-    def __init__(self, app_id, app_key, verbose=True):
+    def __init__(self, app_id, app_key, verbose=True, pool=None, executor=None
+                 , max_workers=10, max_pending=1000, cache=None, lazy_responses=False, json_decoder=None
+                 , endpoint=None, router=None, hedging=None, retry=None
+                 , rate_limiter=None, circuit_breaker=None, connect_timeout=10.0, read_timeout=30.0
+                 , coalesce=False, listeners=None):
         '''
         A constructor for the LUISClient class.
         :param app_id: A string containing the application id.
         :param app_key: A string containing the subscription key.
         :param verbose: A boolean to indicate whether the verbose version should used or not.
+        :param pool: A LUISConnectionPool to send the requests through, a new one is created if None.
+        :param executor: A concurrent.futures executor to run the async calls on,
+        a ThreadPoolExecutor of max_workers threads is created on first use if None.
+        :param max_workers: The number of threads of the executor created by the client.
+        :param max_pending: The maximum number of async calls queued or running at once,
+        further calls block until one of them finishes.
+        :param cache: A LUISCacheBackend to look predictions up in before sending them, None to disable caching.
+        :param lazy_responses: A boolean to indicate whether the returned LUISResponse objects build
+        their intents, entities and dialog on first access or not.
+        :param json_decoder: A function that decodes the raw response bytes into a dictionary,
+        json.loads is used if None.
+        :param endpoint: The LUIS endpoint to send the requests to, such as "westeurope.api.cognitive.microsoft.com",
+        optionally with a port and an "https://" or "http://" prefix, the West US endpoint is used if None.
+        :param router: A LUISRouter spreading the requests over several regional endpoints, instead of endpoint.
+        :param hedging: A LUISHedgingPolicy to send duplicates of slow requests, None to disable hedging.
+        :param retry: A LUISRetryPolicy to send failed requests again, None to raise the first failure.
+        :param rate_limiter: A LUISRateLimiter every request sent takes a token from, None to send at will.
+        :param circuit_breaker: A LUISCircuitBreaker to stop sending requests during an outage, None to always send.
+        :param connect_timeout: The number of seconds allowed to connect to LUIS, for the pool created by the client,
+        None for the pool's default.
+        :param read_timeout: The number of seconds allowed to read from LUIS, for the pool created by the client,
+        None for the pool's default.
+        :param coalesce: A boolean to indicate whether concurrent predictions of the same text share
+        a single request and response or not, responses carrying a dialog are never shared.
+        :param listeners: A list of LUISMetricsListener objects to report the phases of every call sent to, or None.
+        '''
+        if max_workers is None:
+            raise TypeError('NULL number of workers')
+        if max_workers < 1:
+            raise ValueError('Invalid number of workers')
+        if max_pending is None:
+            raise TypeError('NULL number of pending calls')
+        if max_pending < 1:
+            raise ValueError('Invalid number of pending calls')
+        super().__init__(app_id, app_key, verbose, pool, lazy_responses, json_decoder, endpoint, router, hedging
+                         , retry, rate_limiter, circuit_breaker, connect_timeout, read_timeout, coalesce, listeners)
+        self._owns_executor = executor is None
+        self._executor = executor
+        self._max_workers = max_workers
+        self._executor_lock = threading.Lock()
+        self._pending = threading.BoundedSemaphore(max_pending)
+        self._cache = cache
+        if cache is not None:
+            cache.set_response_options(lazy_responses, json_decoder)
+        self._flights_lock = threading.Lock()
+
+    def _new_pool(self):
+        '''
+        Creates the connection pool used when none is passed to the constructor.
+        :return: A LUISConnectionPool object.
         '''
-        if app_id is None:
-            raise TypeError('NULL App Id')
-        if not app_id:
-            raise ValueError('Empty App Id')
-        if ' ' in app_id:
-            raise ValueError('Invalid App Id')
-        if app_key is None:
-            raise TypeError('NULL Subscription Key')
-        if not app_key:
-            raise ValueError('Empty Subscription Key')
-        if ' ' in app_key:
-            raise ValueError('Invalid Subscription Key')
-
-        self._app_id = app_id
-        self._app_key = app_key
-        self._verbose = 'true' if verbose else 'false'
-
-    def predict(self, text, response_handlers=None, daemon=False):
+        return LUISConnectionPool(connect_timeout=self._connect_timeout, read_timeout=self._read_timeout)
+
+    def shutdown(self, wait=True):
+        '''
+        Shuts the client's executor down and closes its connection pool,
+        leaving alone the ones passed in by the caller.
+        :param wait: A boolean to indicate whether to wait for the pending async calls to finish or not.
+        :return: None.
+        '''
+        with self._executor_lock:
+            executor = self._executor if self._owns_executor else None
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+        self.close()
+
+    def predict(self, text, response_handlers=None, daemon=False, deadline=None):
         '''
         Routes the prediction routine to either sync or async
         based on the presence or absence of a callback fucntion.
         :param text: the text to be analysed and predicted.
         :param response_handlers: a dictionary that contains two keys on_success and on_failure,
         whose values are two functions to be executed if async.
-        :param daemon: defines whether the new thread used for async will be daemon or not.
-        :return: LUISResponse if sync, thread object to give control over the thread if async.
-        '''
-        if text is None:
-            raise TypeError('NULL text to predict')
-        text = text.strip()
-        if not text:
-            raise ValueError('Empty text to predict')
+        :param daemon: kept for backwards compatibility, async calls run on the client's executor.
+        :param deadline: The number of seconds the call may take, None for no limit.
+        :return: LUISResponse if sync, a Future of the LUISResponse if async.
+        '''
+        text = self._check_text(text)
         if response_handlers is None:
-            return self.predict_sync(text)
+            return self.predict_sync(text, deadline)
         else:
-            return self.predict_async(text, response_handlers, daemon)
+            return self.predict_async(text, response_handlers, daemon, deadline)
 
-    def predict_sync(self, text):
+    def predict_sync(self, text, deadline=None, use_cache=True):
         '''
         Predicts synchronously and returns a LUISResponse.
+        Cached responses are shared between callers and must be treated as read-only, and so are
+        coalesced ones if the client coalesces concurrent predictions of the same text.
+        Responses carrying a dialog are never cached nor shared, since their context Id belongs to a single conversation.
+        While the client's circuit breaker is open, the prediction is answered from the cache,
+        expired responses included, if the breaker falls back to it.
         :param text: The text to be analysed and predicted.
+        :param deadline: The number of seconds the call may take, waiting for a connection,
+        for the rate limiter, retries and hedges included, None for no limit.
+        A LUISDeadlineExceeded is raised once it runs out.
+        :param use_cache: A boolean to indicate whether the client's cache and request coalescing are used or not.
+        :return: A LUISResponse object containing the response data.
+        '''
+        end_time = get_end_time(deadline)
+        key = None
+        if self._cache is not None and use_cache:
+            key = self._cache_key(text)
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+        if self._coalesce and use_cache:
+            return self._predict_coalesced(text, end_time, key)
+        return self._predict_uncached(text, end_time, key)
+
+    def _predict_coalesced(self, text, end_time, key):
+        '''
+        Predicts, sharing the request of a concurrent identical prediction if one is in flight.
+        The first caller sends the request and the others wait for its outcome; if it failed
+        because the first caller's deadline ran out, the others try again with their own.
+        A response carrying a dialog is not shared, since its context Id belongs to the first
+        caller's conversation: the others then send their own prediction.
+        :param text: The text to be analysed and predicted.
+        :param end_time: The time.monotonic() value of the call's deadline, None for no limit.
+        :param key: The cache key of the prediction, None if the client has no cache.
+        :return: A LUISResponse object containing the response data.
+        '''
+        flight = self._cache_key(text) if key is None else key
+        while True:
+            with self._flights_lock:
+                future = self._flights.get(flight)
+                leader = future is None
+                if leader:
+                    future = self._flights[flight] = Future()
+            if leader:
+                try:
+                    res = self._predict_uncached(text, end_time, key)
+                except BaseException as exc:
+                    with self._flights_lock:
+                        del self._flights[flight]
+                    future.set_exception(exc)
+                    raise
+                with self._flights_lock:
+                    del self._flights[flight]
+                future.set_result(res)
+                return res
+            done, _ = wait([future], timeout=get_remaining(end_time))
+            if not done:
+                raise LUISDeadlineExceeded('Deadline exceeded waiting for an identical prediction')
+            try:
+                res = future.result()
+            except LUISDeadlineExceeded:
+                if end_time is not None and time.monotonic() >= end_time:
+                    raise
+                continue
+            if res.get_dialog() is None:
+                return res
+            return self._predict_uncached(text, end_time, key)
+
+    def _predict_uncached(self, text, end_time, key):
+        '''
+        Sends a prediction and caches its response.
+        :param text: The text to be analysed and predicted.
+        :param end_time: The time.monotonic() value of the call's deadline, None for no limit.
+        :param key: The cache key of the prediction, None to not cache it.
         :return: A LUISResponse object containing the response data.
         '''
         try:
-            conn = http.client.HTTPSConnection(self._LUISURL)
-            conn.request('GET', self._predict_url_gen(text))
-            res = conn.getresponse()
-            return LUISResponse(res.read().decode('UTF-8'))
-        except Exception:
+            res, body = self._send_and_parse('predict', self._predict_url_gen(text), end_time)
+        except LUISCircuitOpenError:
+            if key is not None and self._circuit_breaker.get_cache_fallback():
+                stale = self._cache.get_stale(key)
+                if stale is not None:
+                    return stale
             raise
+        if key is not None and res.get_dialog() is None:
+            self._cache.set(key, res, body)
+        return res
 
-    def predict_async(self, text, response_handlers, daemon):
+    def predict_async(self, text, response_handlers=None, daemon=False, deadline=None):
         '''
-        Predicts asynchronously and executes a callback function at the end.
+        Predicts asynchronously on the client's executor and executes a callback function at the end.
         :param text: The text to be analysed and predicted.
         :param response_handlers: A dictionary that contains two keys on_success and on_failure,
-        whose values are two functions to be executed if async.
-        :param daemon: Defines whether the new thread will be daemon or not.
-        :return: A thread object to give control over the thread.
-        '''
-        if 'on_success' not in response_handlers:
-            raise KeyError('You have to specify the success handler with key: "on_success"')
-        if 'on_failure' not in response_handlers:
-            raise KeyError('You have to specify the failure handler with key: "on_failure"')
-        predict_thread = threading.Thread(target=self._predict_async_helper
-                                          , args=(text, response_handlers))
-        predict_thread.daemon = daemon
-        predict_thread.start()
-        return predict_thread
-
-    def _predict_url_gen(self, text):
-        '''
-        Returns the suitable LUIS API predict url.
-        :param text: The text to be analysed and predicted.
-        :return: LUIS API predicton url.
+        whose values are two functions to be executed if async, None to only use the returned Future.
+        :param daemon: Kept for backwards compatibility, async calls run on the client's executor.
+        :param deadline: The number of seconds the call may take from now, waiting for a free slot while
+        max_pending calls are queued and in the executor's queue included, None for no limit.
+        :return: A Future of the LUISResponse.
+        '''
+        if response_handlers is not None:
+            if 'on_success' not in response_handlers:
+                raise KeyError('You have to specify the success handler with key: "on_success"')
+            if 'on_failure' not in response_handlers:
+                raise KeyError('You have to specify the failure handler with key: "on_failure"')
+        end_time = get_end_time(deadline)
+        return self.submit(self._predict_async_helper, text, response_handlers, end_time, end_time=end_time)
+
+    def predict_many(self, texts, concurrency=10, ordered=True):
+        '''
+        Predicts a stream of texts on the client's executor, keeping at most
+        concurrency requests in flight, so memory is bounded by the window
+        and not by the number of texts.
+        The window is capped by the number of requests the client can have in flight,
+        see get_max_concurrency, since the predictions beyond it would only queue.
+        :param texts: An iterable or generator of texts to be analysed and predicted.
+        :param concurrency: The maximum number of predictions in flight at once.
+        :param ordered: A boolean to indicate whether results are yielded in input order
+        or as soon as they complete.
+        :return: A generator of (text, LUISResponse or the raised Exception) tuples.
+        '''
+        if texts is None:
+            raise TypeError('NULL texts to predict')
+        if concurrency is None:
+            raise TypeError('NULL concurrency')
+        if concurrency < 1:
+            raise ValueError('Invalid concurrency')
+        return self._predict_many_helper(iter(texts), min(concurrency, self.get_max_concurrency()), ordered)
+
+    def get_max_concurrency(self):
+        '''
+        Returns the number of requests the client can have in flight at once: the connection
+        pool's max_size per endpoint, and the max_workers of the executor if the client created it.
+        Raise both to let predict_many run more predictions at once.
+        :return: The number of requests.
+        '''
+        limit = self._pool.get_max_size() * (1 if self._router is None else len(self._router.get_endpoints()))
+        return min(limit, self._max_workers) if self._owns_executor else limit
+
+    def _predict_many_helper(self, texts, concurrency, ordered):
+        '''
+        The generator behind predict_many.
+        :param texts: An iterator of texts to be analysed and predicted.
+        :param concurrency: The maximum number of predictions in flight at once.
+        :param ordered: A boolean to indicate whether results are yielded in input order or not.
+        :return: A generator of (text, LUISResponse or the raised Exception) tuples.
+        '''
+        in_flight = deque() if ordered else {}
+        try:
+            for text in texts:
+                while len(in_flight) >= concurrency:
+                    yield from self._predict_many_collect(in_flight, ordered)
+                future = self.submit(self.predict, text)
+                if ordered:
+                    in_flight.append((text, future))
+                else:
+                    in_flight[future] = text
+            while in_flight:
+                yield from self._predict_many_collect(in_flight, ordered)
+        finally:
+            for future in (f for _, f in in_flight) if ordered else in_flight:
+                future.cancel()
+
+    @staticmethod
+    def _predict_many_collect(in_flight, ordered):
+        '''
+        Waits for in-flight predictions and removes the finished ones from the window.
+        :param in_flight: A deque of (text, Future) tuples if ordered, else a dictionary of Future to text.
+        :param ordered: A boolean to indicate whether results are collected in input order or not.
+        :return: A generator of (text, LUISResponse or the raised Exception) tuples.
+        '''
+        if ordered:
+            text, future = in_flight[0]
+            exc = future.exception()
+            in_flight.popleft()
+            yield text, exc if exc is not None else future.result()
+            return
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            text = in_flight.pop(future)
+            exc = future.exception()
+            yield text, exc if exc is not None else future.result()
+
+    def _get_executor(self):
+        '''
+        Returns the executor the async calls run on, creating it on first use.
+        :return: A concurrent.futures executor.
+        '''
+        with self._executor_lock:
+            if self._executor is None:
+                if not self._owns_executor:
+                    raise RuntimeError('Executor has been shut down')
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers
+                                                    , thread_name_prefix='LUISClient')
+            return self._executor
+
+    def submit(self, func, *args, end_time=None):
+        '''
+        Submits a call to the client's executor, where the async calls run, blocking while max_pending
+        calls are already queued or running so that bursts cannot grow the executor's queue unbounded.
+        A LUISDeadlineExceeded is raised if the deadline runs out while blocked.
+        :param func: The function to be executed.
+        :param args: The function's arguments.
+        :param end_time: The time.monotonic() value of the call's deadline, see get_end_time, None for no limit.
+        :return: A Future of the function's result.
+        '''
+        if not self._pending.acquire(timeout=get_remaining(end_time)):
+            raise LUISDeadlineExceeded('Deadline exceeded waiting for a free executor slot')
+        try:
+            future = self._get_executor().submit(func, *args)
+        except Exception:
+            self._pending.release()
+            raise
+        future.add_done_callback(lambda _: self._pending.release())
+        return future
+
+    def _send_and_parse(self, operation, url, end_time, endpoint=None):
+        '''
+        Sends a GET request and parses its response, reporting the call to the client's listeners.
+        :param operation: The name of the call, "predict" or "reply".
+        :param url: The request url, starting with the path.
+        :param end_time: The time.monotonic() value of the call's deadline, None for no limit.
+        :param endpoint: The (host, secure) endpoint the request is pinned to, None to pick one.
+        :return: A tuple of the LUISResponse object and the response body bytes.
+        '''
+        if not self._listeners:
+            _, body, endpoint = self._send_request(url, end_time, None, endpoint)
+            res = LUISResponse(body, self._lazy_responses, self._json_decoder)
+            self._pin_dialog(res, endpoint)
+            return res, body
+        call = LUISCallTrace(operation)
+        for listener in self._listeners:
+            listener.on_call_start(call)
+        try:
+            _, body, endpoint = self._send_request(url, end_time, call, endpoint)
+            start = time.perf_counter()
+            res = LUISResponse(body, self._lazy_responses, self._json_decoder)
+            call.parse = time.perf_counter() - start
+            call.size = len(body)
+            self._pin_dialog(res, endpoint)
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            call.duration = time.perf_counter() - call.start
+            for listener in self._listeners:
+                listener.on_call_end(call)
+        return res, body
+
+    def _send_request(self, url, end_time=None, call=None, endpoint=None):
+        '''
+        Sends a GET request, sending it again after a retryable failure if the client has a retry policy.
+        No retry is sent if its backoff would run past the deadline.
+        :param url: The request url, starting with the path.
+        :param end_time: The time.monotonic() value of the call's deadline, None for no limit.
+        :param call: The LUISCallTrace of the call, None if the client has no listeners.
+        :param endpoint: The (host, secure) endpoint the request is pinned to, None to pick one.
+        :return: A tuple of the HTTPResponse object, the response body bytes and the endpoint that answered.
+        '''
+        retry = self._retry
+        if retry is None:
+            return self._send_attempt(url, end_time, call, endpoint)
+        retry.start_request()
+        attempt = 1
+        while True:
+            try:
+                return self._send_attempt(url, end_time, call, endpoint)
+            except Exception as exc:
+                delay = retry.get_delay(exc, attempt)
+                if end_time is not None and time.monotonic() + delay >= end_time:
+                    raise
+                if not retry.try_retry(exc, attempt):
+                    raise
+                time.sleep(delay)
+            attempt += 1
+
+    def _send_attempt(self, url, end_time=None, call=None, endpoint=None):
+        '''
+        Sends a GET request once, hedged if the client has a hedging policy.
+        Raises a LUISCircuitOpenError without sending it while the client's circuit breaker is open.
+        :param url: The request url, starting with the path.
+        :param end_time: The time.monotonic() value of the call's deadline, None for no limit.
+        :param call: The LUISCallTrace of the call, None if the client has no listeners.
+        :param endpoint: The (host, secure) endpoint the request is pinned to, None to pick one.
+        :return: A tuple of the HTTPResponse object, the response body bytes and the endpoint that answered.
+        '''
+        get_remaining(end_time)
+        breaker = self._circuit_breaker
+        token = None
+        if breaker is not None:
+            token = breaker.allow_request()
+            if not token:
+                raise LUISCircuitOpenError('LUIS circuit is open')
+        try:
+            if self._hedging is None:
+                result = self._send_with_failover(url, [], end_time, call, endpoint)
+            else:
+                result = self._send_hedged(url, end_time, call, endpoint)
+        except BaseException as exc:
+            if breaker is not None:
+                breaker.record_result(exc, token)
+            raise
+        if breaker is not None:
+            breaker.record_result(token=token)
+        return result
+
+    def _send_with_failover(self, url, tried, end_time=None, call=None, endpoint=None, on_sent=None):
+        '''
+        Sends a GET request to the endpoint it is pinned to, else to the client's endpoint
+        or to the endpoint picked by its router. With a router, a request that is not pinned
+        and cannot reach an endpoint, or gets a server error from it, fails over to the next best one.
+        Each request sent, failovers included, waits for a token of the client's rate limiter,
+        a LUISRateLimitExceeded is raised if none is due before the deadline.
+        Throttled requests and server errors that cannot fail over raise a LUISHTTPError.
+        :param url: The request url, starting with the path.
+        :param tried: A list of the endpoints the request was already sent to, extended in place.
+        :param end_time: The time.monotonic() value of the call's deadline, None for no limit.
+        :param call: The LUISCallTrace of the call, None if the client has no listeners.
+        :param endpoint: The (host, secure) endpoint the request is pinned to, None to pick one.
+        :param on_sent: A function called with the connection each time the request is sent, see LUISConnectionPool.request.
+        :return: A tuple of the HTTPResponse object, the response body bytes and the endpoint that answered.
+        '''
+        pinned = endpoint
+        while True:
+            if pinned is None:
+                endpoint = self._endpoint if self._router is None else self._router.choose(tried)
+            tried.append(endpoint)
+            if self._rate_limiter is not None and not self._rate_limiter.acquire(timeout=self._limiter_timeout(end_time)):
+                raise LUISRateLimitExceeded('Rate limit exceeded')
+            start = time.monotonic()
+            try:
+                res, body = self._pool_request(endpoint, url, end_time, call, on_sent)
+            except LUISDeadlineExceeded as exc:
+                if self._router is not None and isinstance(exc, LUISServiceTimeout):
+                    self._router.record_failure(endpoint)
+                raise
+            except (OSError, http.client.HTTPException):
+                if self._router is None:
+                    raise
+                self._router.record_failure(endpoint)
+                if pinned is not None or len(set(tried)) >= len(self._router.get_endpoints()):
+                    raise
+                continue
+            if self._router is not None:
+                if res.status >= 500:
+                    self._router.record_failure(endpoint)
+                    if pinned is None and len(set(tried)) < len(self._router.get_endpoints()):
+                        continue
+                else:
+                    self._router.record_success(endpoint, time.monotonic() - start)
+            self._check_status(res)
+            return res, body, endpoint
+
+    def _pool_request(self, endpoint, url, end_time, call, on_sent=None):
+        '''
+        Sends a GET request through the client's connection pool, tracing it if the client has listeners.
+        :param endpoint: The (host, secure) endpoint to send the request to.
+        :param url: The request url, starting with the path.
+        :param end_time: The time.monotonic() value of the call's deadline, None for no limit.
+        :param call: The LUISCallTrace of the call, None if the client has no listeners.
+        :param on_sent: A function called with the connection once the request is sent, or None.
+        :return: A tuple of the HTTPResponse object and the response body bytes.
+        '''
+        if call is None:
+            return self._pool.request(endpoint[0], 'GET', url, endpoint[1], end_time=end_time, on_sent=on_sent)
+        request = LUISRequestTrace(endpoint[0], endpoint[1])
+        call.requests.append(request)
+        try:
+            res, body = self._pool.request(endpoint[0], 'GET', url, endpoint[1], end_time=end_time, trace=request
+                                           , on_sent=on_sent)
+            request.status = res.status
+        except BaseException as exc:
+            request.error = exc
+            raise
+        finally:
+            for listener in self._listeners:
+                listener.on_request_end(call, request)
+        return res, body
+
+    def _send_hedged(self, url, end_time=None, call=None, endpoint=None):
+        '''
+        Sends a GET request on the calling thread and, if it has not answered within the hedging
+        policy's delay from the moment it was sent, a duplicate on the policy's executor over another
+        pooled connection, or to another endpoint if the client has a router. The first answer wins:
+        the original request is abandoned, closing its connection, if the duplicate answers first,
+        and the duplicate is discarded otherwise.
+        :param url: The request url, starting with the path.
+        :param end_time: The time.monotonic() value of the call's deadline, None for no limit.
+        :param call: The LUISCallTrace of the call, None if the client has no listeners.
+        :param endpoint: The (host, secure) endpoint the request and its duplicate are pinned to, None to pick one.
+        :return: A tuple of the HTTPResponse object, the response body bytes and the endpoint that answered.
         '''
-        return self._PredictMask%(self._app_id, self._app_key, quote(text), self._verbose)
+        hedging = self._hedging
+        hedging.start_request()
+        tried = []
+        sent = []
+        hedge = []
+        wakeup = []
 
-    def _predict_async_helper(self, text, response_handlers):
+        def wake(_):
+            try:
+                wakeup[1].send(b'\0')
+            except OSError:
+                pass
+
+        def on_sent(conn):
+            if not sent:
+                sent.append(time.monotonic())
+            with selectors.DefaultSelector() as selector:
+                selector.register(conn.sock, selectors.EVENT_READ)
+                if not hedge:
+                    remaining = get_remaining(end_time, LUISServiceTimeout)
+                    delay = max(0.0, sent[0] + hedging.get_delay() - time.monotonic())
+                    if selector.select(delay if remaining is None else min(delay, remaining)):
+                        return
+                    get_remaining(end_time, LUISServiceTimeout)
+                    if not hedging.try_hedge():
+                        return
+                    wakeup.extend(socket.socketpair())
+                    hedge.append(hedging.get_executor().submit(self._send_with_failover
+                                                               , url, list(tried), end_time, call, endpoint))
+                    hedge[0].add_done_callback(wake)
+                selector.register(wakeup[0], selectors.EVENT_READ)
+                if not selector.select(conn.sock.gettimeout()):
+                    raise socket.timeout('timed out')
+                if hedge[0].done() and hedge[0].exception() is None:
+                    raise _LUISHedgeWon()
+
+        try:
+            result = self._send_with_failover(url, tried, end_time, call, endpoint, on_sent)
+        except _LUISHedgeWon:
+            hedging.record_latency(time.monotonic() - sent[0], True)
+            return hedge[0].result()
+        except Exception:
+            remaining = None if end_time is None else end_time - time.monotonic()
+            if not hedge or (remaining is not None and remaining <= 0) \
+                    or not wait(hedge, timeout=remaining)[0] or hedge[0].exception() is not None:
+                raise
+            hedging.record_latency(time.monotonic() - sent[0], True)
+            return hedge[0].result()
+        finally:
+            for sock in wakeup:
+                sock.close()
+        hedging.record_latency(time.monotonic() - sent[0])
+        return result
+
+    def _predict_async_helper(self, text, response_handlers, end_time=None):
         '''
-        A wrapper function to be executed asynchronously in an external thread.
+        A wrapper function to be executed asynchronously on the client's executor.
         It executes the predict routine and then executes a callback function.
         :param text: The text to be analysed and predicted.
         :param response: A LUISResponse object that contains the context Id.
         :param response_handlers: A dictionary that contains two keys on_success and on_failure,
-        whose values are two functions to be executed if async.
-        :return: None.
+        whose values are two functions to be executed if async, or None.
+        :param end_time: The time.monotonic() value of the call's deadline, None for no limit.
+        :return: A LUISResponse object containing the response data.
         '''
         res = None
         try:
-            res = self.predict_sync(text)
+            res = self.predict_sync(text, get_remaining(end_time))
         except Exception as exc:
-            response_handlers['on_failure'](exc)
-            return
-        response_handlers['on_success'](res)
+            if response_handlers is not None:
+                response_handlers['on_failure'](exc)
+            raise
+        if response_handlers is not None:
+            response_handlers['on_success'](res)
+        return res
 
-    def reply(self, text, response, response_handlers=None, force_set_parameter_name=None, daemon=False):
+    def reply(self, text, response, response_handlers=None, force_set_parameter_name=None, daemon=False
+              , deadline=None):
         '''
         Routes the reply routine to either sync or async
         based on the presence or absence of a callback fucntion.
@@ -159,86 +631,76 @@ class LUISClient:
         whose values are two functions
         to be executed if async.
         :param force_set_parameter_name: The name of a parameter the needs to be reset in dialog.
-        :param daemon: Defines whether the new thread used for async will be daemon or not.
-        :return: A LUISResponse object if sync, a thread object to control the thread if async.
-        '''
-        if text is None:
-            raise TypeError('NULL text to predict')
-        text = text.strip()
-        if not text:
-            raise ValueError('Empty text to predict')
+        :param daemon: Kept for backwards compatibility, async calls run on the client's executor.
+        :param deadline: The number of seconds the call may take, None for no limit.
+        :return: A LUISResponse object if sync, a Future of the LUISResponse if async.
+        '''
+        text = self._check_text(text)
         if response_handlers is None:
-            return self.reply_sync(text, response, force_set_parameter_name)
+            return self.reply_sync(text, response, force_set_parameter_name, deadline)
         else:
-            return self.reply_async(text, response, response_handlers, force_set_parameter_name, daemon)
+            return self.reply_async(text, response, response_handlers, force_set_parameter_name, daemon, deadline)
 
-    def reply_sync(self, text, response, force_set_parameter_name):
+    def reply_sync(self, text, response, force_set_parameter_name, deadline=None):
         '''
         Replies synchronously and returns a LUISResponse object.
+        Replies depend on the dialog's context, so they are never cached, and they are
+        sent to the endpoint that created it rather than to the one the router picks.
         :param text: The text to be analysed and predicted.
-        :param response: A LUISResponse object that contains the context Id.
+        :param response: A LUISResponse object that contains the context Id, or its LUISDialog.
         :param force_set_parameter_name: The name of a parameter the needs to be reset in dialog.
+        :param deadline: The number of seconds the call may take, waiting for a connection,
+        for the rate limiter, retries and hedges included, None for no limit.
+        A LUISDeadlineExceeded is raised once it runs out.
         :return: A LUISResponse object containg the response data.
         '''
-        try:
-            conn = http.client.HTTPSConnection(self._LUISURL)
-            conn.request('GET', self._reply_url_gen(text, response, force_set_parameter_name))
-            res = conn.getresponse()
-            return LUISResponse(res.read().decode('UTF-8'))
-        except Exception:
-            raise
+        end_time = get_end_time(deadline)
+        url = self._reply_url_gen(text, response, force_set_parameter_name)
+        return self._send_and_parse('reply', url, end_time, self._reply_endpoint(response))[0]
 
-    def reply_async(self, text, response, response_handlers, force_set_parameter_name, daemon):
+    def reply_async(self, text, response, response_handlers=None, force_set_parameter_name=None, daemon=False
+                    , deadline=None):
         '''
-        Predicts asynchronously and executes a callback function at the end.
+        Replies asynchronously on the client's executor and executes a callback function at the end.
         :param text: The text to be analysed and predicted.
         :param response: A LUISResponse object that contains the context Id.
         :param response_handlers: A dictionary that contains two keys on_success and on_failure,
         whose values are two functions
-        to be executed if async.
-        :param force_set_parameter_name: The name of a parameter the needs to be reset in dialog.
-        :param daemon: Defines whether the new thread used will be daemon or not.
-        :return: A thread object to give control over the thread.
-        '''
-        if 'on_success' not in response_handlers:
-            raise KeyError('You have to specify the success handler with key: "on_success"')
-        if 'on_failure' not in response_handlers:
-            raise KeyError('You have to specify the failure handler with key: "on_failure"')
-        reply_thread = threading.Thread(target=self._reply_async_helper
-                                        , args=(text, response, response_handlers, force_set_parameter_name))
-        reply_thread.daemon = daemon
-        reply_thread.start()
-        return reply_thread
-
-    def _reply_url_gen(self, text, response, force_set_parameter_name):
-        '''
-        Generates the suitable LUIS API reply url.
-        :param text: The text to be analysed and predicted.
-        :param response: A LUISResponse object that contains the context Id.
+        to be executed if async, None to only use the returned Future.
         :param force_set_parameter_name: The name of a parameter the needs to be reset in dialog.
-        :return: LUIS API reply url.
+        :param daemon: Kept for backwards compatibility, async calls run on the client's executor.
+        :param deadline: The number of seconds the call may take from now, waiting for a free slot while
+        max_pending calls are queued and in the executor's queue included, None for no limit.
+        :return: A Future of the LUISResponse.
         '''
-        url = self._ReplyMask%(self._app_id, self._app_key, quote(text)
-                                , response.get_dialog().get_context_id(), self._verbose)
-        if force_set_parameter_name is not None:
-            url += '&forceset=%s'%(force_set_parameter_name)
-        return url
+        if response_handlers is not None:
+            if 'on_success' not in response_handlers:
+                raise KeyError('You have to specify the success handler with key: "on_success"')
+            if 'on_failure' not in response_handlers:
+                raise KeyError('You have to specify the failure handler with key: "on_failure"')
+        end_time = get_end_time(deadline)
+        return self.submit(self._reply_async_helper
+                            , text, response, response_handlers, force_set_parameter_name, end_time, end_time=end_time)
 
-    def _reply_async_helper(self, text, response, response_handlers):
+    def _reply_async_helper(self, text, response, response_handlers, force_set_parameter_name=None, end_time=None):
         '''
-        A wrapper function to be executed asynchronously in an external thread.
+        A wrapper function to be executed asynchronously on the client's executor.
         It executes the reply routine and then executes a callback function.
         :param text: The text to be analysed and predicted.
         :param response: A LUISResponse object that contains the context Id.
         :param response_handlers: A dictionary that contains two keys on_success and on_failure,
-        whose values are two functions to be executed if async.
+        whose values are two functions to be executed if async, or None.
         :param force_set_parameter_name: The name of a parameter the needs to be reset in dialog.
-        :return: None.
+        :param end_time: The time.monotonic() value of the call's deadline, None for no limit.
+        :return: A LUISResponse object containg the response data.
         '''
         res = None
         try:
-            res = self.reply_sync(text, response, force_set_parameter_name)
+            res = self.reply_sync(text, response, force_set_parameter_name, get_remaining(end_time))
         except Exception as exc:
-            response_handlers['on_failure'](exc)
-            return
-        response_handlers['on_success'](res)
+            if response_handlers is not None:
+                response_handlers['on_failure'](exc)
+            raise
+        if response_handlers is not None:
+            response_handlers['on_success'](res)
+        return res
@@ -38,6 +38,7 @@ class LUISCompositeEntity:
     LUIS Composite Entity Class.
     Describes the LUIS Composite Entity structure.
     '''
+    __slots__ = ('_parent_type', '_value', '_composite_entity_children')
 
     def __init__(self, composite_entity):
         '''
@@ -36,6 +36,7 @@ class LUISCompositeEntityChild:
     LUIS Composite Entity Child Class.
     Describes the LUIS Composite Entity Child structure.
     '''
+    __slots__ = ('_type', '_value')
 
     def __init__(self, composite_entity_child):
         '''
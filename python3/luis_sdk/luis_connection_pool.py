@@ -0,0 +1,340 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import select
+import socket
+import threading
+import time
+import http.client
+from collections import deque
+from .luis_errors import LUISDeadlineExceeded, LUISServiceTimeout
+
+class LUISConnectionPool:
+    '''
+    LUIS Connection Pool Class.
+    Keeps a bounded number of keep-alive connections per host
+    and hands them out to the LUISClient request routines.
+    '''
+    _ReconnectErrors = (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                        ConnectionResetError, ConnectionAbortedError, BrokenPipeError)
+    _ConnectTimeout = 10.0
+    _ReadTimeout = 30.0
+
+    def __init__(self, max_size=10, idle_timeout=60.0, timeout=None, connect_timeout=None, read_timeout=None):
+        '''
+        A constructor for the LUISConnectionPool class.
+        :param max_size: The maximum number of open connections per host.
+        :param idle_timeout: The number of seconds an idle connection is kept before being closed.
+        :param timeout: The socket timeout in seconds used for new connections, None for the defaults below.
+        :param connect_timeout: The number of seconds allowed to connect and finish the TLS handshake,
+        timeout if None, or 10 seconds if both are None.
+        :param read_timeout: The number of seconds allowed for each read or write on the socket,
+        timeout if None, or 30 seconds if both are None.
+        '''
+        if max_size is None:
+            raise TypeError('NULL pool size')
+        if max_size < 1:
+            raise ValueError('Invalid pool size')
+        if idle_timeout is None:
+            raise TypeError('NULL idle timeout')
+        if idle_timeout < 0:
+            raise ValueError('Invalid idle timeout')
+        for value in (timeout, connect_timeout, read_timeout):
+            if value is not None and value <= 0:
+                raise ValueError('Invalid timeout')
+
+        self._max_size = max_size
+        self._idle_timeout = idle_timeout
+        self._timeout = timeout
+        self._connect_timeout = connect_timeout or timeout or self._ConnectTimeout
+        self._read_timeout = read_timeout or timeout or self._ReadTimeout
+        self._cond = threading.Condition()
+        self._idle = {}
+        self._num_conns = {}
+        self._closed = False
+
+    def get_max_size(self):
+        '''
+        A getter for the pool's maximum number of connections per host.
+        :return: Pool's maximum size.
+        '''
+        return self._max_size
+
+    def get_idle_timeout(self):
+        '''
+        A getter for the pool's idle timeout.
+        :return: Pool's idle timeout in seconds.
+        '''
+        return self._idle_timeout
+
+    def get_num_connections(self, host, secure=True):
+        '''
+        Counts the connections currently open to a host, idle or in use.
+        :param host: The host name, optionally followed by ":port".
+        :param secure: A boolean to indicate whether the connections use HTTPS or not.
+        :return: The number of open connections.
+        '''
+        with self._cond:
+            return self._num_conns.get((host, secure), 0)
+
+    def request(self, host, method, url, secure=True, headers=None, end_time=None, trace=None, on_sent=None):
+        '''
+        Sends a request over a pooled connection and reads the whole response.
+        A request that fails on a reused connection the server has already closed
+        is sent again over a fresh connection.
+        :param host: The host name, optionally followed by ":port".
+        :param method: The HTTP method.
+        :param url: The request url, starting with the path.
+        :param secure: A boolean to indicate whether HTTPS should be used or not.
+        :param headers: A dictionary of extra request headers.
+        :param end_time: The time.monotonic() value the request must be done by, waiting for
+        a connection included, or None for no limit; a LUISDeadlineExceeded is raised past it.
+        :param trace: A LUISRequestTrace to fill the timings of the request's phases and its size in, or None.
+        :param on_sent: A function called with the connection once the request is sent and before its
+        response is read, or None. An exception it raises abandons the request and closes the connection.
+        :return: A tuple of the HTTPResponse object and the response body bytes.
+        '''
+        while True:
+            try:
+                conn, reused = self.acquire(host, secure, self._timeout_until(None, end_time))
+            except TimeoutError as exc:
+                if end_time is not None and not isinstance(exc, LUISDeadlineExceeded):
+                    raise LUISDeadlineExceeded('Deadline exceeded waiting for a pooled connection') from exc
+                raise
+            try:
+                if conn.sock is None:
+                    conn.timeout = self._timeout_until(self._connect_timeout, end_time)
+                    if trace is None:
+                        conn.connect()
+                    else:
+                        self._traced_connect(conn, trace)
+                conn.sock.settimeout(self._timeout_until(self._read_timeout, end_time))
+                if trace is None:
+                    conn.request(method, url, headers=headers or {})
+                    if on_sent is not None:
+                        on_sent(conn)
+                    res = conn.getresponse()
+                    body = res.read()
+                else:
+                    trace.reused = reused
+                    start = time.perf_counter()
+                    conn.request(method, url, headers=headers or {})
+                    if on_sent is not None:
+                        on_sent(conn)
+                    res = conn.getresponse()
+                    ttfb_time = time.perf_counter()
+                    body = res.read()
+                    trace.ttfb = ttfb_time - start
+                    trace.download = time.perf_counter() - ttfb_time
+                    trace.size = len(body)
+            except self._ReconnectErrors:
+                self.release(host, conn, secure, reusable=False)
+                if reused:
+                    continue
+                raise
+            except Exception as exc:
+                self.release(host, conn, secure, reusable=False)
+                if isinstance(exc, TimeoutError) and not isinstance(exc, LUISDeadlineExceeded) \
+                        and end_time is not None and time.monotonic() >= end_time:
+                    raise LUISServiceTimeout('Deadline exceeded waiting for LUIS') from exc
+                raise
+            self.release(host, conn, secure, reusable=not res.will_close)
+            return res, body
+
+    def acquire(self, host, secure=True, timeout=None):
+        '''
+        Takes a healthy idle connection to a host out of the pool,
+        or opens a new one if the host is below the pool's maximum size.
+        Blocks while all the host's connections are in use.
+        :param host: The host name, optionally followed by ":port".
+        :param secure: A boolean to indicate whether HTTPS should be used or not.
+        :param timeout: The maximum number of seconds to wait for a connection, None to block.
+        :return: A tuple of the connection and a boolean that expresses whether it was reused or not.
+        '''
+        key = (host, secure)
+        end_time = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError('Connection pool is closed')
+                idle = self._idle.get(key)
+                while idle:
+                    conn, last_used = idle.pop()
+                    if self._is_usable(conn, last_used):
+                        return conn, True
+                    conn.close()
+                    self._num_conns[key] -= 1
+                if self._num_conns.get(key, 0) < self._max_size:
+                    self._num_conns[key] = self._num_conns.get(key, 0) + 1
+                    break
+                remaining = None if end_time is None else end_time - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError('Timed out waiting for a pooled connection')
+                self._cond.wait(remaining)
+        try:
+            return self._new_connection(host, secure), False
+        except Exception:
+            self._discard(key)
+            raise
+
+    def release(self, host, conn, secure=True, reusable=True):
+        '''
+        Gives a connection back to the pool.
+        :param host: The host name the connection was acquired for.
+        :param conn: The connection to give back.
+        :param secure: A boolean to indicate whether the connection uses HTTPS or not.
+        :param reusable: A boolean to indicate whether the connection can be kept alive or not.
+        :return: None.
+        '''
+        key = (host, secure)
+        if not reusable or conn.sock is None:
+            conn.close()
+            self._discard(key)
+            return
+        now = time.monotonic()
+        with self._cond:
+            if self._closed:
+                conn.close()
+                self._num_conns[key] -= 1
+                self._cond.notify()
+                return
+            idle = self._idle.setdefault(key, deque())
+            while idle and now - idle[0][1] > self._idle_timeout:
+                idle.popleft()[0].close()
+                self._num_conns[key] -= 1
+            idle.append((conn, now))
+            self._cond.notify()
+
+    def close(self):
+        '''
+        Closes all the idle connections, connections in use are closed once released.
+        :return: None.
+        '''
+        with self._cond:
+            self._closed = True
+            for key, idle in self._idle.items():
+                while idle:
+                    idle.pop()[0].close()
+                    self._num_conns[key] -= 1
+            self._cond.notify_all()
+
+    def _new_connection(self, host, secure):
+        '''
+        Opens a new connection to a host.
+        :param host: The host name, optionally followed by ":port".
+        :param secure: A boolean to indicate whether HTTPS should be used or not.
+        :return: An HTTPConnection or HTTPSConnection object.
+        '''
+        if secure:
+            return http.client.HTTPSConnection(host, timeout=self._connect_timeout)
+        return http.client.HTTPConnection(host, timeout=self._connect_timeout)
+
+    @staticmethod
+    def _traced_connect(conn, trace):
+        '''
+        Connects a new connection, timing the DNS lookup, the TCP connect and the TLS handshake apart.
+        :param conn: The HTTPConnection or HTTPSConnection object, not connected yet.
+        :param trace: The LUISRequestTrace to fill the timings in.
+        :return: None.
+        '''
+        create_connection = conn._create_connection
+
+        def timed_create_connection(address, timeout, source_address=None):
+            start = time.perf_counter()
+            addresses = socket.getaddrinfo(address[0], address[1], 0, socket.SOCK_STREAM)
+            resolved = time.perf_counter()
+            trace.dns = resolved - start
+            error = None
+            for _, _, _, _, sockaddr in addresses:
+                try:
+                    sock = create_connection(sockaddr[:2], timeout, source_address)
+                except OSError as exc:
+                    error = exc
+                    continue
+                trace.connect = time.perf_counter() - resolved
+                return sock
+            raise error
+
+        conn._create_connection = timed_create_connection
+        start = time.perf_counter()
+        try:
+            conn.connect()
+        finally:
+            conn._create_connection = create_connection
+        if isinstance(conn, http.client.HTTPSConnection) and trace.connect is not None:
+            trace.tls = time.perf_counter() - start - trace.dns - trace.connect
+
+    @staticmethod
+    def _timeout_until(timeout, end_time):
+        '''
+        Shortens a timeout so that it does not run past a deadline.
+        :param timeout: A number of seconds, None for no limit.
+        :param end_time: The time.monotonic() value of the deadline, None for no deadline.
+        :return: A number of seconds, or None for no limit.
+        '''
+        if end_time is None:
+            return timeout
+        remaining = end_time - time.monotonic()
+        if remaining <= 0:
+            raise LUISDeadlineExceeded('Deadline exceeded')
+        return remaining if timeout is None else min(timeout, remaining)
+
+    def _discard(self, key):
+        '''
+        Forgets a connection that was closed while it was out of the pool.
+        :param key: The (host, secure) key of the connection.
+        :return: None.
+        '''
+        with self._cond:
+            self._num_conns[key] -= 1
+            self._cond.notify()
+
+    def _is_usable(self, conn, last_used):
+        '''
+        Checks whether an idle connection can still be used or not.
+        A connection is stale once it has been idle for too long,
+        or once its socket turns readable, meaning the server closed it.
+        :param conn: The idle connection.
+        :param last_used: The monotonic time at which the connection was released.
+        :return: A boolean that expresses whether the connection is usable or not.
+        '''
+        if time.monotonic() - last_used > self._idle_timeout:
+            return False
+        sock = conn.sock
+        if sock is None:
+            return False
+        try:
+            readable, _, _ = select.select([sock], [], [], 0)
+        except (OSError, ValueError):
+            return False
+        return not readable
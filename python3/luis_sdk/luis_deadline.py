@@ -0,0 +1,61 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import time
+from .luis_errors import LUISDeadlineExceeded
+
+def get_end_time(deadline):
+    '''
+    Turns a call's deadline into the time it runs out at.
+    :param deadline: A number of seconds from now, None for no limit.
+    :return: A time.monotonic() value, or None.
+    '''
+    if deadline is None:
+        return None
+    if deadline < 0:
+        raise ValueError('Invalid deadline')
+    return time.monotonic() + deadline
+
+def get_remaining(end_time, error=LUISDeadlineExceeded):
+    '''
+    Returns what is left of a call's deadline, raising an exception once it has run out.
+    :param end_time: A time.monotonic() value, None for no limit.
+    :param error: The LUISDeadlineExceeded class raised once the deadline has run out.
+    :return: A number of seconds, or None.
+    '''
+    if end_time is None:
+        return None
+    remaining = end_time - time.monotonic()
+    if remaining <= 0:
+        raise error('Deadline exceeded')
+    return remaining
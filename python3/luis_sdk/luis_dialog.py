@@ -36,6 +36,7 @@ class LUISDialog:
     LUIS Dialog Class.
     Describes the LUIS Action structure.
     '''
+    __slots__ = ('_prompt', '_parameter_name', '_context_id', '_status', '_finished', '_endpoint')
 
     def __init__(self, dialog):
         '''
@@ -55,6 +56,7 @@ class LUISDialog:
         self._context_id = dialog['contextId']
         self._status = dialog['status']
         self._finished = self._status == 'Finished'
+        self._endpoint = None
 
     def get_prompt(self):
         '''
@@ -90,3 +92,18 @@ class LUISDialog:
         :return: A boolean that expresses whether the dialog has finished or not.
         '''
         return self._finished
+
+    def get_endpoint(self):
+        '''
+        A getter for the endpoint that holds the dialog's context.
+        :return: A (host, secure) tuple, None if the client that received the dialog has no router.
+        '''
+        return self._endpoint
+
+    def set_endpoint(self, endpoint):
+        '''
+        A setter for the endpoint that holds the dialog's context, replies to the dialog are sent to it.
+        :param endpoint: A (host, secure) tuple.
+        :return: None.
+        '''
+        self._endpoint = endpoint
@@ -36,6 +36,7 @@ class LUISEntity:
     LUIS Entity Class.
     Describes the LUIS Entity structure.
     '''
+    __slots__ = ('_name', '_type', '_start_idx', '_end_idx', '_score', '_resolution')
 
     def __init__(self, entity):
         '''
@@ -0,0 +1,144 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+from bisect import bisect_left, bisect_right
+
+class LUISEntityIndex:
+    '''
+    LUIS Entity Index Class.
+    An indexed view of a response's entities: entities grouped by type, an interval index
+    over their character spans for range and overlap lookups, and composite entities and
+    their children grouped by parent type. Built once, from the response's entity lists.
+    '''
+    __slots__ = ('_by_type', '_spans', '_starts', '_max_length', '_composites')
+
+    def __init__(self, entities, composite_entities=()):
+        '''
+        A constructor for the LUISEntityIndex class.
+        :param entities: A list of LUISEntity objects.
+        :param composite_entities: A list of LUISCompositeEntity objects.
+        '''
+        if entities is None:
+            raise TypeError('NULL entities')
+
+        by_type = {}
+        spans = []
+        for entity in entities:
+            by_type.setdefault(entity.get_type(), []).append(entity)
+            start, end = entity.get_start_idx(), entity.get_end_idx()
+            if start is not None and end is not None:
+                spans.append((start, end, entity))
+        spans.sort(key=lambda span: span[0])
+        composites = {}
+        for composite_entity in composite_entities or ():
+            composites.setdefault(composite_entity.get_parent_type(), []).append(composite_entity)
+
+        self._by_type = by_type
+        self._spans = spans
+        self._starts = [span[0] for span in spans]
+        self._max_length = max((end - start for start, end, _ in spans), default=0)
+        self._composites = composites
+
+    def get_types(self):
+        '''
+        A getter for the entity types found in the response.
+        :return: A list of entity types, in order of first appearance.
+        '''
+        return list(self._by_type)
+
+    def get_entities_by_type(self, entity_type):
+        '''
+        Looks the entities of a type up.
+        :param entity_type: The entity type, such as "builtin.number".
+        :return: A list of LUISEntity objects, in response order, empty if there is none.
+        '''
+        return list(self._by_type.get(entity_type, ()))
+
+    def get_entities_overlapping(self, start_idx, end_idx):
+        '''
+        Looks the entities sharing at least one character with a range up.
+        Entities without a start or end index are left out.
+        :param start_idx: The index of the range's first character.
+        :param end_idx: The index of the range's last character, inclusive like get_end_idx.
+        :return: A list of LUISEntity objects, ordered by start index.
+        '''
+        if start_idx is None or end_idx is None:
+            raise TypeError('NULL range')
+        if end_idx < start_idx:
+            raise ValueError('Invalid range')
+        spans = self._spans
+        first = bisect_left(self._starts, start_idx - self._max_length)
+        last = bisect_right(self._starts, end_idx)
+        return [entity for _, end, entity in spans[first:last] if end >= start_idx]
+
+    def get_entities_within(self, start_idx, end_idx):
+        '''
+        Looks the entities lying entirely inside a range up.
+        :param start_idx: The index of the range's first character.
+        :param end_idx: The index of the range's last character, inclusive like get_end_idx.
+        :return: A list of LUISEntity objects, ordered by start index.
+        '''
+        if start_idx is None or end_idx is None:
+            raise TypeError('NULL range')
+        if end_idx < start_idx:
+            raise ValueError('Invalid range')
+        first = bisect_left(self._starts, start_idx)
+        last = bisect_right(self._starts, end_idx)
+        return [entity for _, end, entity in self._spans[first:last] if end <= end_idx]
+
+    def get_entities_at(self, idx):
+        '''
+        Looks the entities covering a character up.
+        :param idx: The character's index in the query.
+        :return: A list of LUISEntity objects, ordered by start index.
+        '''
+        return self.get_entities_overlapping(idx, idx)
+
+    def get_composite_entities_by_parent_type(self, parent_type):
+        '''
+        Looks the composite entities of a parent type up.
+        :param parent_type: The composite entity's parent type.
+        :return: A list of LUISCompositeEntity objects, in response order, empty if there is none.
+        '''
+        return list(self._composites.get(parent_type, ()))
+
+    def get_composite_children(self, parent_type, child_type=None):
+        '''
+        Looks the children of the composite entities of a parent type up.
+        :param parent_type: The composite entity's parent type.
+        :param child_type: The type of the children to keep, None for all of them.
+        :return: A list of LUISCompositeEntityChild objects, in response order.
+        '''
+        return [child for composite_entity in self._composites.get(parent_type, ())
+                for child in composite_entity.get_children()
+                if child_type is None or child.get_type() == child_type]
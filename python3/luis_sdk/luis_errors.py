@@ -0,0 +1,97 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+class LUISHTTPError(Exception):
+    '''
+    LUIS HTTP Error Class.
+    Raised when the service answers with a status code the request may succeed on later,
+    such as 429 Too Many Requests or a 5xx server error.
+    '''
+
+    def __init__(self, status, reason=None, retry_after=None):
+        '''
+        A constructor for the LUISHTTPError class.
+        :param status: The HTTP status code of the response.
+        :param reason: The HTTP reason phrase of the response.
+        :param retry_after: The number of seconds the service asked to wait before retrying, or None.
+        '''
+        super().__init__('LUIS answered %s %s'%(status, reason or ''))
+        self._status = status
+        self._reason = reason
+        self._retry_after = retry_after
+
+    def get_status(self):
+        '''
+        A getter for the HTTP status code.
+        :return: An integer.
+        '''
+        return self._status
+
+    def get_reason(self):
+        '''
+        A getter for the HTTP reason phrase.
+        :return: A string, or None.
+        '''
+        return self._reason
+
+    def get_retry_after(self):
+        '''
+        A getter for the delay the service asked for in its Retry-After header.
+        :return: A number of seconds, or None.
+        '''
+        return self._retry_after
+
+class LUISRateLimitExceeded(Exception):
+    '''
+    LUIS Rate Limit Exceeded Class.
+    Raised by a fail-fast LUISRateLimiter when a request would go over the rate.
+    '''
+
+class LUISCircuitOpenError(Exception):
+    '''
+    LUIS Circuit Open Error Class.
+    Raised without sending the request while a LUISCircuitBreaker is open.
+    '''
+
+class LUISDeadlineExceeded(TimeoutError):
+    '''
+    LUIS Deadline Exceeded Class.
+    Raised when a call runs out of the time budget its caller gave it with deadline=.
+    '''
+
+class LUISServiceTimeout(LUISDeadlineExceeded):
+    '''
+    LUIS Service Timeout Class.
+    Raised when a call runs out of its deadline while connecting to LUIS or waiting for its answer,
+    rather than before the request goes out, so that a hung service still counts as failing.
+    '''
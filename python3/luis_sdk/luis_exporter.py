@@ -0,0 +1,267 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import csv
+import io
+import json
+import os
+from .luis_response import LUISResponse, json_loads
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+class LUISColumnarExporter:
+    '''
+    LUIS Columnar Exporter Class.
+    Writes a stream of prediction results as columns: the query, the top intent and its score,
+    the entities flattened into parallel lists of names, types, start and end indexes and scores,
+    and the error of the failed predictions. Rows are buffered into row groups of a bounded size,
+    each written out as a Parquet row group when pyarrow is installed, or as CSV or JSONL rows.
+    '''
+    _Formats = ('parquet', 'csv', 'jsonl')
+    _Columns = ('query', 'top_intent', 'score', 'entity_names', 'entity_types', 'entity_starts'
+                , 'entity_ends', 'entity_scores', 'error')
+
+    def __init__(self, output, output_format=None, fallback_format='jsonl', row_group_size=10000
+                 , compression='zstd', json_decoder=None):
+        '''
+        A constructor for the LUISColumnarExporter class.
+        :param output: The path of the file to write, or a binary file object.
+        :param output_format: "parquet", "csv" or "jsonl", None for Parquet if pyarrow is installed
+        and fallback_format otherwise.
+        :param fallback_format: "csv" or "jsonl", the format used when output_format is None and
+        pyarrow is not installed.
+        :param row_group_size: The number of rows buffered before being written out.
+        :param compression: The Parquet compression codec, such as "zstd", "snappy" or None.
+        :param json_decoder: A function that decodes raw JSON strings or bytes, luis_response.json_loads is used if None.
+        '''
+        if output is None:
+            raise TypeError('NULL output')
+        if fallback_format not in self._Formats[1:]:
+            raise ValueError('Invalid fallback format')
+        if output_format is None:
+            output_format = 'parquet' if pyarrow is not None else fallback_format
+        if output_format not in self._Formats:
+            raise ValueError('Invalid output format')
+        if output_format == 'parquet' and pyarrow is None:
+            raise ImportError('Parquet export requires pyarrow, install it with "pip install pyarrow"')
+        if row_group_size is None:
+            raise TypeError('NULL row group size')
+        if row_group_size < 1:
+            raise ValueError('Invalid row group size')
+
+        self._format = output_format
+        self._row_group_size = row_group_size
+        self._compression = compression
+        self._decode = json_decoder or json_loads
+        self._owns_file = isinstance(output, (str, bytes, os.PathLike))
+        self._file = open(output, 'wb') if self._owns_file else output
+        self._rows = self._new_row_group()
+        self._num_rows = 0
+        self._num_row_groups = 0
+        self._writer = None
+        self._text = None
+        if output_format != 'parquet':
+            self._text = io.TextIOWrapper(self._file, encoding='UTF-8', newline=''
+                                          , write_through=True)
+            if output_format == 'csv':
+                self._writer = csv.writer(self._text)
+                self._writer.writerow(self._Columns)
+
+    def __enter__(self):
+        '''
+        Returns the exporter itself when entering a with block.
+        :return: The exporter.
+        '''
+        return self
+
+    def __exit__(self, *exc_info):
+        '''
+        Closes the exporter when leaving a with block.
+        :return: None.
+        '''
+        self.close()
+
+    def get_format(self):
+        '''
+        A getter for the format the exporter writes.
+        :return: "parquet", "csv" or "jsonl".
+        '''
+        return self._format
+
+    def get_num_rows(self):
+        '''
+        Counts the rows written so far, buffered ones included.
+        :return: The number of rows.
+        '''
+        return self._num_rows
+
+    def get_num_row_groups(self):
+        '''
+        Counts the row groups written out so far.
+        :return: The number of row groups.
+        '''
+        return self._num_row_groups
+
+    def write(self, response, query=None):
+        '''
+        Adds a prediction result as a row, writing the row group out once it is full.
+        :param response: A LUISResponse object, its raw JSON as a string, bytes or a decoded dictionary,
+        or the Exception the prediction failed with.
+        :param query: The utterance, the response's query if None.
+        :return: None.
+        '''
+        if response is None:
+            raise TypeError('NULL response')
+        if self._rows is None:
+            raise ValueError('Exporter is closed')
+        rows = self._rows
+        if isinstance(response, BaseException):
+            rows['query'].append(query)
+            rows['top_intent'].append(None)
+            rows['score'].append(None)
+            for name in self._Columns[3:8]:
+                rows[name].append([])
+            rows['error'].append('%s: %s' % (type(response).__name__, response))
+        elif isinstance(response, LUISResponse):
+            top_intent = response.get_top_intent()
+            entities = response.get_entities() or ()
+            rows['query'].append(response.get_query() if query is None else query)
+            rows['top_intent'].append(None if top_intent is None else top_intent.get_name())
+            rows['score'].append(None if top_intent is None else top_intent.get_score())
+            rows['entity_names'].append([entity.get_name() for entity in entities])
+            rows['entity_types'].append([entity.get_type() for entity in entities])
+            rows['entity_starts'].append([entity.get_start_idx() for entity in entities])
+            rows['entity_ends'].append([entity.get_end_idx() for entity in entities])
+            rows['entity_scores'].append([entity.get_score() for entity in entities])
+            rows['error'].append(None)
+        else:
+            if isinstance(response, (str, bytes, bytearray, memoryview)):
+                response = self._decode(response)
+            top_intent = response.get('topScoringIntent') or {}
+            entities = response.get('entities') or ()
+            rows['query'].append(response.get('query') if query is None else query)
+            rows['top_intent'].append(top_intent.get('intent'))
+            rows['score'].append(top_intent.get('score'))
+            rows['entity_names'].append([entity['entity'] for entity in entities])
+            rows['entity_types'].append([entity['type'] for entity in entities])
+            rows['entity_starts'].append([entity.get('startIndex') for entity in entities])
+            rows['entity_ends'].append([entity.get('endIndex') for entity in entities])
+            rows['entity_scores'].append([entity.get('score') for entity in entities])
+            rows['error'].append(None)
+        self._num_rows += 1
+        if len(rows['query']) >= self._row_group_size:
+            self.flush()
+
+    def write_many(self, results):
+        '''
+        Adds a stream of prediction results, such as the ones yielded by LUISClient.predict_many.
+        :param results: An iterable of (query, LUISResponse or Exception) tuples, or of responses.
+        :return: The number of rows added.
+        '''
+        count = 0
+        for result in results:
+            if isinstance(result, tuple):
+                self.write(result[1], result[0])
+            else:
+                self.write(result)
+            count += 1
+        return count
+
+    def flush(self):
+        '''
+        Writes the buffered rows out as a row group.
+        :return: None.
+        '''
+        rows = self._rows
+        if rows is None or not rows['query']:
+            return
+        self._rows = self._new_row_group()
+        if self._format == 'parquet':
+            table = pyarrow.Table.from_pydict(rows, schema=self._schema())
+            if self._writer is None:
+                self._writer = pyarrow.parquet.ParquetWriter(self._file, table.schema, compression=self._compression)
+            self._writer.write_table(table, row_group_size=len(rows['query']))
+        elif self._format == 'csv':
+            self._writer.writerows(
+                row[:3] + tuple(json.dumps(value, ensure_ascii=False) for value in row[3:8]) + row[8:]
+                for row in zip(*(rows[name] for name in self._Columns)))
+        else:
+            self._text.writelines(json.dumps(dict(zip(self._Columns, row)), ensure_ascii=False) + '\n'
+                                  for row in zip(*(rows[name] for name in self._Columns)))
+        self._num_row_groups += 1
+
+    def close(self):
+        '''
+        Writes the buffered rows out and finishes the file, closing it unless it was passed in by the caller.
+        :return: None.
+        '''
+        if self._rows is None:
+            return
+        try:
+            self.flush()
+            if self._format == 'parquet':
+                if self._writer is None:
+                    self._writer = pyarrow.parquet.ParquetWriter(self._file, self._schema()
+                                                                 , compression=self._compression)
+                self._writer.close()
+            else:
+                self._text.flush()
+                self._text.detach()
+        finally:
+            self._rows = None
+            if self._owns_file:
+                self._file.close()
+
+    def _new_row_group(self):
+        '''
+        Creates the buffers of a row group.
+        :return: A dictionary of column name to list of values.
+        '''
+        return {name: [] for name in self._Columns}
+
+    @staticmethod
+    def _schema():
+        '''
+        Describes the Parquet columns.
+        :return: A pyarrow.Schema object.
+        '''
+        return pyarrow.schema([('query', pyarrow.string()), ('top_intent', pyarrow.string())
+                               , ('score', pyarrow.float64()), ('entity_names', pyarrow.list_(pyarrow.string()))
+                               , ('entity_types', pyarrow.list_(pyarrow.string()))
+                               , ('entity_starts', pyarrow.list_(pyarrow.int32()))
+                               , ('entity_ends', pyarrow.list_(pyarrow.int32()))
+                               , ('entity_scores', pyarrow.list_(pyarrow.float64())), ('error', pyarrow.string())])
@@ -0,0 +1,168 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+class LUISHedgingPolicy:
+    '''
+    LUIS Hedging Policy Class.
+    Decides when a duplicate of a slow request is sent: once the request has been
+    in flight for longer than a percentile of the recent latencies. The number of
+    duplicates is capped to a fraction of the requests, and the policy counts how
+    often duplicates are sent and how often they answer first.
+    '''
+    _MinSamples = 20
+    _RefreshEvery = 50
+
+    def __init__(self, percentile=95.0, min_delay=0.005, max_delay=1.0, max_hedge_ratio=0.1
+                 , window=1000, max_workers=20):
+        '''
+        A constructor for the LUISHedgingPolicy class.
+        :param percentile: The percentile of the recent latencies after which a duplicate is sent.
+        :param min_delay: The minimum number of seconds to wait before sending a duplicate.
+        :param max_delay: The maximum number of seconds to wait before sending a duplicate,
+        also used until enough latencies have been recorded.
+        :param max_hedge_ratio: The maximum number of duplicates per request, between 0 and 1.
+        :param window: The number of recent latencies the percentile is computed over.
+        :param max_workers: The number of threads sending the duplicate requests of the sync clients.
+        '''
+        if not 0 < percentile < 100:
+            raise ValueError('Invalid percentile')
+        if min_delay < 0 or max_delay < min_delay:
+            raise ValueError('Invalid hedging delays')
+        if not 0 <= max_hedge_ratio <= 1:
+            raise ValueError('Invalid hedge ratio')
+        if window < 1:
+            raise ValueError('Invalid window')
+        if max_workers < 1:
+            raise ValueError('Invalid number of workers')
+
+        self._percentile = percentile
+        self._min_delay = min_delay
+        self._max_delay = max_delay
+        self._max_hedge_ratio = max_hedge_ratio
+        self._max_workers = max_workers
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self._since_refresh = 0
+        self._delay = max_delay
+        self._budget = 0.0
+        self._executor = None
+        self._requests = 0
+        self._hedges = 0
+        self._hedges_won = 0
+        self._hedges_skipped = 0
+
+    def get_delay(self):
+        '''
+        A getter for the current hedging delay.
+        :return: The number of seconds to wait before sending a duplicate.
+        '''
+        return self._delay
+
+    def start_request(self):
+        '''
+        Counts a new request, adding its share to the duplicates budget.
+        :return: None.
+        '''
+        with self._lock:
+            self._requests += 1
+            self._budget = min(self._budget + self._max_hedge_ratio, max(1.0, self._max_hedge_ratio * 100))
+
+    def try_hedge(self):
+        '''
+        Takes a duplicate out of the budget.
+        :return: A boolean that expresses whether a duplicate may be sent or not.
+        '''
+        with self._lock:
+            if self._budget < 1:
+                self._hedges_skipped += 1
+                return False
+            self._budget -= 1
+            self._hedges += 1
+            return True
+
+    def record_latency(self, latency, hedge_won=False):
+        '''
+        Records the latency of a finished request, refreshing the hedging delay now and then.
+        :param latency: The number of seconds until the first answer.
+        :param hedge_won: A boolean to indicate whether the duplicate answered first or not.
+        :return: None.
+        '''
+        with self._lock:
+            self._latencies.append(latency)
+            if hedge_won:
+                self._hedges_won += 1
+            self._since_refresh += 1
+            if self._since_refresh >= self._RefreshEvery and len(self._latencies) >= self._MinSamples:
+                self._since_refresh = 0
+                ordered = sorted(self._latencies)
+                value = ordered[min(len(ordered) - 1, int(len(ordered) * self._percentile / 100.0))]
+                self._delay = min(self._max_delay, max(self._min_delay, value))
+
+    def get_executor(self):
+        '''
+        Returns the executor the sync clients send the duplicate requests on, creating it on first use.
+        The original requests are sent on the calling threads, so the executor never delays them.
+        It is separate from the client's executor so that a hedged call made from one of
+        the client's threads cannot starve it.
+        :return: A ThreadPoolExecutor object.
+        '''
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers
+                                                    , thread_name_prefix='LUISHedging')
+            return self._executor
+
+    def shutdown(self, wait=True):
+        '''
+        Shuts the policy's executor down.
+        :param wait: A boolean to indicate whether to wait for the running requests to finish or not.
+        :return: None.
+        '''
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def get_stats(self):
+        '''
+        A getter for the policy's counters.
+        :return: A dictionary with the requests, hedges, hedges won and hedges skipped counts and the current delay.
+        '''
+        with self._lock:
+            return {'requests': self._requests, 'hedges': self._hedges, 'hedges_won': self._hedges_won
+                    , 'hedges_skipped': self._hedges_skipped, 'delay': self._delay}
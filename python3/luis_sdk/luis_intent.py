@@ -38,6 +38,7 @@ class LUISIntent:
     LUIS Intent Class.
     Describes the LUIS Intent structure.
     '''
+    __slots__ = ('_name', '_score', '_actions')
 
     def __init__(self, intent):
         '''
@@ -0,0 +1,335 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import bisect
+import threading
+import time
+
+class LUISRequestTrace:
+    '''
+    LUIS Request Trace Class.
+    Describes the phases of a single HTTP request sent for a call, retries and hedges
+    each having their own. The connection pool fills the timings in, in seconds; the DNS,
+    connect and TLS timings are None for requests sent over a reused connection, and so is
+    the TLS one over plain HTTP.
+    '''
+    __slots__ = ('host', 'secure', 'reused', 'dns', 'connect', 'tls', 'ttfb', 'download', 'size'
+                 , 'status', 'error')
+
+    def __init__(self, host, secure):
+        '''
+        A constructor for the LUISRequestTrace class.
+        :param host: The host name the request is sent to, optionally followed by ":port".
+        :param secure: A boolean to indicate whether the request uses HTTPS or not.
+        '''
+        self.host = host
+        self.secure = secure
+        self.reused = None
+        self.dns = None
+        self.connect = None
+        self.tls = None
+        self.ttfb = None
+        self.download = None
+        self.size = None
+        self.status = None
+        self.error = None
+
+class LUISCallTrace:
+    '''
+    LUIS Call Trace Class.
+    Describes a predict or reply call: its duration from the first request sent to the parsed
+    response, the time spent parsing, the response size and the traces of its HTTP requests.
+    '''
+    __slots__ = ('operation', 'start', 'duration', 'parse', 'size', 'requests', 'error')
+
+    def __init__(self, operation):
+        '''
+        A constructor for the LUISCallTrace class.
+        :param operation: The name of the call, "predict" or "reply".
+        '''
+        self.operation = operation
+        self.start = time.perf_counter()
+        self.duration = None
+        self.parse = None
+        self.size = None
+        self.requests = []
+        self.error = None
+
+class LUISMetricsListener:
+    '''
+    LUIS Metrics Listener Class.
+    Describes the hooks the clients call around every predict and reply call sent to LUIS,
+    cached and coalesced answers aside. Hooks run on the thread or event loop making the call,
+    so they must be quick and must not raise; the default ones do nothing.
+    '''
+
+    def on_call_start(self, call):
+        '''
+        Called before the first request of a call is sent.
+        :param call: The LUISCallTrace of the call.
+        :return: None.
+        '''
+
+    def on_request_end(self, call, request):
+        '''
+        Called once an HTTP request of a call has been answered or has failed.
+        :param call: The LUISCallTrace of the call.
+        :param request: The LUISRequestTrace of the request.
+        :return: None.
+        '''
+
+    def on_call_end(self, call):
+        '''
+        Called once a call has returned its response or failed.
+        :param call: The LUISCallTrace of the call.
+        :return: None.
+        '''
+
+class _LUISHistogram:
+    '''
+    A fixed-bucket histogram of observed values.
+    '''
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self, num_buckets):
+        '''
+        A constructor for the _LUISHistogram class.
+        :param num_buckets: The number of bounded buckets, an unbounded one is added past them.
+        '''
+        self.counts = [0] * (num_buckets + 1)
+        self.sum = 0.0
+        self.count = 0
+
+class LUISMetricsCollector(LUISMetricsListener):
+    '''
+    LUIS Metrics Collector Class.
+    A listener keeping in-memory histograms of the phases of the calls per operation:
+    DNS lookup, connect, TLS handshake, time to first byte, download, parse, call duration
+    and response size, along with request and call counters. Exports them in the
+    Prometheus text exposition format.
+    '''
+    _LatencyBuckets = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    _SizeBuckets = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+    _Histograms = (
+        ('luis_dns_seconds', 'DNS lookup time of the new LUIS connections.', False),
+        ('luis_connect_seconds', 'TCP connect time of the new LUIS connections.', False),
+        ('luis_tls_seconds', 'TLS handshake time of the new LUIS connections.', False),
+        ('luis_ttfb_seconds', 'Time from sending a LUIS request to the first byte of its response.', False),
+        ('luis_download_seconds', 'Time reading the rest of the LUIS responses.', False),
+        ('luis_parse_seconds', 'Time parsing the LUIS responses.', False),
+        ('luis_call_seconds', 'Duration of the LUIS calls, retries and hedges included.', False),
+        ('luis_response_bytes', 'Size of the LUIS response bodies.', True))
+
+    def __init__(self, latency_buckets=None, size_buckets=None):
+        '''
+        A constructor for the LUISMetricsCollector class.
+        :param latency_buckets: The increasing upper bounds in seconds of the timing histograms' buckets,
+        from 0.5 ms to 10 s if None.
+        :param size_buckets: The increasing upper bounds in bytes of the response size histogram's buckets,
+        from 256 B to 1 MiB if None.
+        '''
+        latency_buckets = self._LatencyBuckets if latency_buckets is None else tuple(latency_buckets)
+        size_buckets = self._SizeBuckets if size_buckets is None else tuple(size_buckets)
+        for buckets in (latency_buckets, size_buckets):
+            if not buckets or any(low >= high for low, high in zip(buckets, buckets[1:])):
+                raise ValueError('Invalid histogram buckets')
+
+        self._latency_buckets = latency_buckets
+        self._size_buckets = size_buckets
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._requests = {}
+        self._calls = {}
+
+    def on_request_end(self, call, request):
+        '''
+        Records the phases of an HTTP request and counts it by status code, or by error type if it failed.
+        :param call: The LUISCallTrace of the call.
+        :param request: The LUISRequestTrace of the request.
+        :return: None.
+        '''
+        outcome = str(request.status) if request.error is None or request.status is not None \
+            else type(request.error).__name__
+        with self._lock:
+            for name, value in (('luis_dns_seconds', request.dns), ('luis_connect_seconds', request.connect)
+                                , ('luis_tls_seconds', request.tls), ('luis_ttfb_seconds', request.ttfb)
+                                , ('luis_download_seconds', request.download)):
+                if value is not None:
+                    self._observe(name, call.operation, value, self._latency_buckets)
+            key = (call.operation, outcome)
+            self._requests[key] = self._requests.get(key, 0) + 1
+
+    def on_call_end(self, call):
+        '''
+        Records the duration, parse time and response size of a call and counts it by outcome.
+        :param call: The LUISCallTrace of the call.
+        :return: None.
+        '''
+        outcome = 'ok' if call.error is None else type(call.error).__name__
+        with self._lock:
+            self._observe('luis_call_seconds', call.operation, call.duration, self._latency_buckets)
+            if call.parse is not None:
+                self._observe('luis_parse_seconds', call.operation, call.parse, self._latency_buckets)
+            if call.size is not None:
+                self._observe('luis_response_bytes', call.operation, call.size, self._size_buckets)
+            key = (call.operation, outcome)
+            self._calls[key] = self._calls.get(key, 0) + 1
+
+    def _observe(self, name, operation, value, buckets):
+        '''
+        Adds a value to a histogram, the collector's lock being held.
+        :param name: The metric name.
+        :param operation: The name of the call, "predict" or "reply".
+        :param value: The observed value.
+        :param buckets: The upper bounds of the histogram's buckets.
+        :return: None.
+        '''
+        histogram = self._histograms.get((name, operation))
+        if histogram is None:
+            histogram = self._histograms[(name, operation)] = _LUISHistogram(len(buckets))
+        histogram.counts[bisect.bisect_left(buckets, value)] += 1
+        histogram.sum += value
+        histogram.count += 1
+
+    def get_histogram(self, name, operation):
+        '''
+        A getter for a histogram.
+        :param name: The metric name, such as "luis_ttfb_seconds".
+        :param operation: The name of the call, "predict" or "reply".
+        :return: A dictionary with the count, the sum and the list of (upper bound, cumulative count) buckets,
+        or None if nothing was recorded.
+        '''
+        with self._lock:
+            histogram = self._histograms.get((name, operation))
+            if histogram is None:
+                return None
+            buckets = self._size_buckets if name == 'luis_response_bytes' else self._latency_buckets
+            cumulative, total = [], 0
+            for bound, count in zip(buckets + (float('inf'),), histogram.counts):
+                total += count
+                cumulative.append((bound, total))
+            return {'count': histogram.count, 'sum': histogram.sum, 'buckets': cumulative}
+
+    def get_percentile(self, name, operation, percentile):
+        '''
+        Estimates a percentile of a histogram, as the upper bound of the bucket it falls in.
+        :param name: The metric name, such as "luis_ttfb_seconds".
+        :param operation: The name of the call, "predict" or "reply".
+        :param percentile: The percentile, between 0 and 100.
+        :return: The bucket's upper bound, infinite past the last bucket, or None if nothing was recorded.
+        '''
+        if not 0 <= percentile <= 100:
+            raise ValueError('Invalid percentile')
+        histogram = self.get_histogram(name, operation)
+        if histogram is None:
+            return None
+        rank = histogram['count'] * percentile / 100.0
+        for bound, count in histogram['buckets']:
+            if count >= rank:
+                return bound
+        return float('inf')
+
+    def get_stats(self):
+        '''
+        A getter for the collector's counters.
+        :return: A dictionary with the requests counted by (operation, status code or error type)
+        and the calls counted by (operation, "ok" or error type).
+        '''
+        with self._lock:
+            return {'requests': dict(self._requests), 'calls': dict(self._calls)}
+
+    def reset(self):
+        '''
+        Forgets everything recorded so far.
+        :return: None.
+        '''
+        with self._lock:
+            self._histograms.clear()
+            self._requests.clear()
+            self._calls.clear()
+
+    def export_prometheus(self):
+        '''
+        Exports the histograms and counters in the Prometheus text exposition format,
+        labelled by operation, to be served on a scrape endpoint or written to a textfile collector.
+        :return: A string in the text exposition format, version 0.0.4.
+        '''
+        lines = []
+        with self._lock:
+            for name, description, is_size in self._Histograms:
+                operations = sorted(op for metric, op in self._histograms if metric == name)
+                if not operations:
+                    continue
+                buckets = self._size_buckets if is_size else self._latency_buckets
+                lines.append('# HELP %s %s' % (name, description))
+                lines.append('# TYPE %s histogram' % name)
+                for operation in operations:
+                    histogram = self._histograms[(name, operation)]
+                    label = 'operation="%s"' % self._escape(operation)
+                    total = 0
+                    for bound, count in zip(buckets, histogram.counts):
+                        total += count
+                        lines.append('%s_bucket{%s,le="%s"} %d' % (name, label, self._format(bound), total))
+                    lines.append('%s_bucket{%s,le="+Inf"} %d' % (name, label, histogram.count))
+                    lines.append('%s_sum{%s} %s' % (name, label, self._format(histogram.sum)))
+                    lines.append('%s_count{%s} %d' % (name, label, histogram.count))
+            for name, description, label_name, counters in (
+                    ('luis_requests_total', 'LUIS HTTP requests by status code or error type.', 'status'
+                     , self._requests),
+                    ('luis_calls_total', 'LUIS calls by outcome.', 'outcome', self._calls)):
+                if not counters:
+                    continue
+                lines.append('# HELP %s %s' % (name, description))
+                lines.append('# TYPE %s counter' % name)
+                for (operation, outcome), count in sorted(counters.items()):
+                    lines.append('%s{operation="%s",%s="%s"} %d' % (
+                        name, self._escape(operation), label_name, self._escape(outcome), count))
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    @staticmethod
+    def _escape(value):
+        '''
+        Escapes a label value for the text exposition format.
+        :param value: The label value.
+        :return: The escaped label value.
+        '''
+        return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+    @staticmethod
+    def _format(value):
+        '''
+        Formats a number for the text exposition format.
+        :param value: An int or a float.
+        :return: The formatted number.
+        '''
+        return repr(float(value)) if isinstance(value, float) else str(value)
@@ -38,6 +38,7 @@ class LUISParameter:
     LUIS Parameter Class.
     Describes the LUIS Parameter structure.
     '''
+    __slots__ = ('_name', '_required', '_parameter_values')
 
     def __init__(self, parameter):
         '''
@@ -36,6 +36,7 @@ class LUISParameterValue:
     LUIS Paramater Value Class.
     Describes the LUIS Paramter Value structure.
     '''
+    __slots__ = ('_name', '_type', '_score', '_resolution')
 
     def __init__(self, parameter_value):
         '''
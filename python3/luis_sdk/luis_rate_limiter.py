@@ -0,0 +1,179 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import asyncio
+import threading
+import time
+
+class LUISRateLimiter:
+    '''
+    LUIS Rate Limiter Class.
+    A token bucket that refills at rate tokens per second up to burst tokens, taking one
+    token per request sent. Callers reserve their token under a lock and then wait outside
+    of it until the token is due, so waiting threads and coroutines are served in order
+    without waking each other up. A single limiter can be shared by several clients.
+    '''
+
+    def __init__(self, rate, burst=None, blocking=True, timeout=None):
+        '''
+        A constructor for the LUISRateLimiter class.
+        :param rate: The number of requests per second, such as the subscription's transactions per second.
+        :param burst: The number of requests that may be sent at once after an idle period, rate if None.
+        :param blocking: A boolean to indicate whether requests wait for a token by default,
+        or raise a LUISRateLimitExceeded right away.
+        :param timeout: The maximum number of seconds a request waits for a token by default, None to wait indefinitely.
+        '''
+        if rate is None:
+            raise TypeError('NULL rate')
+        if rate <= 0:
+            raise ValueError('Invalid rate')
+        if burst is None:
+            burst = max(1, rate)
+        if burst < 1:
+            raise ValueError('Invalid burst')
+        if timeout is not None and timeout < 0:
+            raise ValueError('Invalid timeout')
+
+        self._rate = float(rate)
+        self._burst = float(burst)
+        self._blocking = blocking
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._tokens = self._burst
+        self._updated = time.monotonic()
+        self._waiting = 0
+        self._acquired = 0
+        self._rejected = 0
+
+    def get_rate(self):
+        '''
+        A getter for the rate.
+        :return: The number of requests per second.
+        '''
+        return self._rate
+
+    def get_burst(self):
+        '''
+        A getter for the burst.
+        :return: The number of requests that may be sent at once.
+        '''
+        return self._burst
+
+    def get_timeout(self):
+        '''
+        A getter for the maximum number of seconds a request waits for a token by default.
+        :return: A number of seconds, or None for no limit.
+        '''
+        return self._timeout
+
+    def get_queue_depth(self):
+        '''
+        A getter for the number of requests waiting for a token.
+        :return: An integer.
+        '''
+        return self._waiting
+
+    def _reserve(self, blocking, timeout):
+        '''
+        Takes a token, possibly one that is not due yet. Counts the caller as waiting if it has to wait.
+        :param blocking: A boolean to indicate whether the caller may wait for the token or not.
+        :param timeout: The maximum number of seconds the caller may wait, None for no limit.
+        :return: The number of seconds to wait for the token, or None if it could not be taken.
+        '''
+        if blocking is None:
+            blocking = self._blocking
+        if timeout is None:
+            timeout = self._timeout
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            delay = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self._rate
+            if delay > 0 and (not blocking or (timeout is not None and delay > timeout)):
+                self._rejected += 1
+                return None
+            self._tokens -= 1
+            self._acquired += 1
+            if delay > 0:
+                self._waiting += 1
+            return delay
+
+    def _done_waiting(self):
+        '''
+        Stops counting a caller as waiting.
+        :return: None.
+        '''
+        with self._lock:
+            self._waiting -= 1
+
+    def acquire(self, blocking=None, timeout=None):
+        '''
+        Takes a token, waiting until it is due if needed.
+        :param blocking: A boolean to indicate whether to wait for a token or not, the limiter's default if None.
+        :param timeout: The maximum number of seconds to wait, the limiter's default if None.
+        :return: A boolean that expresses whether the token was taken or not.
+        '''
+        delay = self._reserve(blocking, timeout)
+        if delay is None:
+            return False
+        if delay > 0:
+            try:
+                time.sleep(delay)
+            finally:
+                self._done_waiting()
+        return True
+
+    async def acquire_async(self, blocking=None, timeout=None):
+        '''
+        Takes a token, waiting until it is due without blocking the event loop if needed.
+        :param blocking: A boolean to indicate whether to wait for a token or not, the limiter's default if None.
+        :param timeout: The maximum number of seconds to wait, the limiter's default if None.
+        :return: A boolean that expresses whether the token was taken or not.
+        '''
+        delay = self._reserve(blocking, timeout)
+        if delay is None:
+            return False
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self._done_waiting()
+        return True
+
+    def get_stats(self):
+        '''
+        A getter for the limiter's counters.
+        :return: A dictionary with the acquired and rejected counts and the queue depth.
+        '''
+        with self._lock:
+            return {'acquired': self._acquired, 'rejected': self._rejected, 'waiting': self._waiting}
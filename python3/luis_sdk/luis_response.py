@@ -36,6 +36,18 @@ from .luis_intent import LUISIntent
 from .luis_entity import LUISEntity
 from .luis_composite_entity import LUISCompositeEntity
 from .luis_dialog import LUISDialog
+from .luis_entity_index import LUISEntityIndex
+
+def json_loads(data):
+    '''
+    The default JSON decoder, LUIS always answers in UTF-8
+    so the payload is decoded without sniffing its encoding.
+    :param data: A string, bytes, bytearray or memoryview containing the JSON.
+    :return: The decoded JSON data.
+    '''
+    if not isinstance(data, str):
+        data = str(data, 'UTF-8')
+    return json.loads(data)
 
 class LUISResponse:
     '''
@@ -43,20 +55,27 @@ class LUISResponse:
     Describes the response structure, and is the main point
     to access the response sent by LUIS after prediction.
     '''
+    __slots__ = ('_query', '_response', '_dialog', '_top_scoring_intent', '_intents'
+                 , '_entities', '_composite_entities', '_entity_index')
 
-    def __init__(self, JSONResponse):
+    def __init__(self, JSONResponse, lazy=False, json_decoder=None):
         '''
         A constructor for the LUISResponse class.
-        :param JSONResponse: A string containing the incoming JSON.
+        :param JSONResponse: A string, bytes, bytearray or memoryview containing the incoming JSON,
+        or the already decoded dictionary.
+        :param lazy: A boolean to indicate whether the intents, entities, composite entities
+        and dialog are built on first access instead of right away.
+        :param json_decoder: A function that decodes the incoming JSON into a dictionary,
+        taking it as it was passed in, json.loads is used if None.
         '''
         if JSONResponse is None:
             raise TypeError('NULL JSON response')
         if not JSONResponse:
             raise ValueError('Invalid App Id')
 
-        if isinstance(JSONResponse, str):
+        if isinstance(JSONResponse, (str, bytes, bytearray, memoryview)):
             try:
-                response = json.loads(JSONResponse)
+                response = (json_decoder or json_loads)(JSONResponse)
             except Exception:
                 raise Exception('Error in parsing json')
         else:
@@ -66,30 +85,21 @@ class LUISResponse:
             raise Exception(u'Invalid Subscription Key')
 
         self._query = response['query']
-
-        if 'dialog' in response:
-            self._dialog = LUISDialog(response['dialog'])
-        else:
-            self._dialog = None
-
-        self._intents = []
-        self._entities = []
-        self._composite_entities = []
-
-        self._top_scoring_intent = LUISIntent(response['topScoringIntent'])
-        
-        if 'intents' in response:
-            for intent in response['intents']:
-                self._intents.append(LUISIntent(intent))
-        else:
-            self._intents.append(self._top_scoring_intent)
-        
-        for entity in response['entities']:
-            self._entities.append(LUISEntity(entity))
-
-        if 'compositeEntities' in response:
-            for composite_entity in response['compositeEntities']:
-                self._composite_entities.append(LUISCompositeEntity(composite_entity))
+        self._response = response
+        self._dialog = None
+        self._top_scoring_intent = None
+        self._intents = None
+        self._entities = None
+        self._composite_entities = None
+        self._entity_index = None
+
+        if not lazy:
+            self.get_dialog()
+            self.get_top_intent()
+            self.get_intents()
+            self.get_entities()
+            self.get_composite_entities()
+            self._response = None
 
     def get_query(self):
         '''
@@ -103,6 +113,8 @@ class LUISResponse:
         A getter for the response's top scoring intent.
         :return: Response's top scoring intent.
         '''
+        if self._top_scoring_intent is None:
+            self._top_scoring_intent = LUISIntent(self._response['topScoringIntent'])
         return self._top_scoring_intent
 
     def get_intents(self):
@@ -110,6 +122,11 @@ class LUISResponse:
         A getter for the response's intents.
         :return: A list of intents.
         '''
+        if self._intents is None:
+            if 'intents' in self._response:
+                self._intents = [LUISIntent(intent) for intent in self._response['intents']]
+            else:
+                self._intents = [self.get_top_intent()]
         return self._intents
 
     def get_entities(self):
@@ -117,6 +134,8 @@ class LUISResponse:
         A getter for the response's entities.
         :return: A list of entities.
         '''
+        if self._entities is None:
+            self._entities = [LUISEntity(entity) for entity in self._response['entities']]
         return self._entities
 
     def get_composite_entities(self):
@@ -124,6 +143,9 @@ class LUISResponse:
         A getter for the response's composite entities.
         :return: A list of composite entities.
         '''
+        if self._composite_entities is None:
+            self._composite_entities = [LUISCompositeEntity(composite_entity) for composite_entity
+                                        in self._response.get('compositeEntities', ())]
         return self._composite_entities
 
     def get_dialog(self):
@@ -131,4 +153,17 @@ class LUISResponse:
         A getter for the response's dialog.
         :return: Response's dialog.
         '''
+        if self._dialog is None and self._response is not None and 'dialog' in self._response:
+            self._dialog = LUISDialog(self._response['dialog'])
         return self._dialog
+
+    def get_entity_index(self):
+        '''
+        Returns an indexed view of the response's entities and composite entities,
+        to look them up by type, character range or parent type without scanning the lists.
+        It is built on first call and reused afterwards.
+        :return: A LUISEntityIndex object.
+        '''
+        if self._entity_index is None:
+            self._entity_index = LUISEntityIndex(self.get_entities(), self.get_composite_entities())
+        return self._entity_index
@@ -0,0 +1,169 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import random
+import threading
+import time
+import http.client
+from email.utils import parsedate_to_datetime
+from .luis_errors import LUISHTTPError, LUISDeadlineExceeded
+
+def parse_retry_after(value):
+    '''
+    Parses the value of a Retry-After header.
+    :param value: A number of seconds or an HTTP date, or None.
+    :return: A non negative number of seconds, or None if the value is missing or invalid.
+    '''
+    if value is None:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+class LUISRetryPolicy:
+    '''
+    LUIS Retry Policy Class.
+    Decides whether a failed request is sent again and how long to wait before doing so.
+    Connection errors, 429 and 5xx answers are retried with an exponential backoff and full
+    jitter, or after the delay the service asked for in its Retry-After header. Retries are
+    taken out of a budget that each request adds max_retry_ratio to, so that an outage does
+    not multiply the load on the service by the number of attempts.
+    '''
+    _RetryStatuses = (429, 500, 502, 503, 504)
+
+    def __init__(self, max_attempts=3, base_delay=0.1, max_delay=10.0, max_retry_ratio=0.1
+                 , retry_statuses=None):
+        '''
+        A constructor for the LUISRetryPolicy class.
+        :param max_attempts: The maximum number of times a request is sent, including the first one.
+        :param base_delay: The number of seconds the backoff starts from, doubled after each attempt.
+        :param max_delay: The maximum number of seconds to wait before a retry. A request whose
+        Retry-After asks for a longer wait is not retried, since retrying sooner would be throttled again.
+        :param max_retry_ratio: The maximum number of retries per request, between 0 and 1.
+        :param retry_statuses: A collection of the HTTP status codes to retry, 429 and 5xx if None.
+        '''
+        if max_attempts is None:
+            raise TypeError('NULL number of attempts')
+        if max_attempts < 1:
+            raise ValueError('Invalid number of attempts')
+        if base_delay < 0 or max_delay < base_delay:
+            raise ValueError('Invalid retry delays')
+        if not 0 <= max_retry_ratio <= 1:
+            raise ValueError('Invalid retry ratio')
+
+        self._max_attempts = max_attempts
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._max_retry_ratio = max_retry_ratio
+        self._retry_statuses = frozenset(self._RetryStatuses if retry_statuses is None else retry_statuses)
+        self._lock = threading.Lock()
+        self._budget = 0.0
+        self._requests = 0
+        self._retries = 0
+        self._retries_skipped = 0
+
+    def get_max_attempts(self):
+        '''
+        A getter for the maximum number of attempts.
+        :return: The maximum number of times a request is sent.
+        '''
+        return self._max_attempts
+
+    def is_retryable(self, exc):
+        '''
+        Classifies a failure.
+        :param exc: The exception a request failed with.
+        :return: A boolean that expresses whether sending the request again may succeed or not.
+        '''
+        if isinstance(exc, LUISDeadlineExceeded):
+            return False
+        if isinstance(exc, LUISHTTPError):
+            return exc.get_status() in self._retry_statuses
+        return isinstance(exc, (OSError, EOFError, http.client.HTTPException))
+
+    def start_request(self):
+        '''
+        Counts a new request, adding its share to the retries budget.
+        :return: None.
+        '''
+        with self._lock:
+            self._requests += 1
+            self._budget = min(self._budget + self._max_retry_ratio, max(1.0, self._max_retry_ratio * 100))
+
+    def try_retry(self, exc, attempt):
+        '''
+        Decides whether a failed attempt is retried, taking the retry out of the budget if so.
+        An attempt whose Retry-After is longer than the maximum delay is not retried.
+        :param exc: The exception the attempt failed with.
+        :param attempt: The number of attempts made so far, starting at 1.
+        :return: A boolean that expresses whether the request may be sent again or not.
+        '''
+        if attempt >= self._max_attempts or not self.is_retryable(exc):
+            return False
+        retry_after = exc.get_retry_after() if isinstance(exc, LUISHTTPError) else None
+        if retry_after is not None and retry_after > self._max_delay:
+            return False
+        with self._lock:
+            if self._budget < 1:
+                self._retries_skipped += 1
+                return False
+            self._budget -= 1
+            self._retries += 1
+            return True
+
+    def get_delay(self, exc, attempt):
+        '''
+        Returns how long to wait before a retry, never less than the service's Retry-After.
+        :param exc: The exception the attempt failed with.
+        :param attempt: The number of attempts made so far, starting at 1.
+        :return: The number of seconds to wait.
+        '''
+        retry_after = exc.get_retry_after() if isinstance(exc, LUISHTTPError) else None
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(0, min(self._max_delay, self._base_delay * 2 ** (attempt - 1)))
+
+    def get_stats(self):
+        '''
+        A getter for the policy's counters.
+        :return: A dictionary with the requests, retries and retries skipped counts.
+        '''
+        with self._lock:
+            return {'requests': self._requests, 'retries': self._retries
+                    , 'retries_skipped': self._retries_skipped}
@@ -0,0 +1,180 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import random
+import threading
+import time
+
+def parse_endpoint(endpoint):
+    '''
+    Splits an endpoint into the host and scheme the connection pools expect.
+    :param endpoint: A host name such as "westeurope.api.cognitive.microsoft.com",
+    optionally with a port and an "https://" or "http://" prefix.
+    :return: A (host, secure) tuple.
+    '''
+    if endpoint is None:
+        raise TypeError('NULL endpoint')
+    endpoint = endpoint.strip().rstrip('/')
+    secure = True
+    if endpoint.lower().startswith('https://'):
+        endpoint = endpoint[len('https://'):]
+    elif endpoint.lower().startswith('http://'):
+        endpoint = endpoint[len('http://'):]
+        secure = False
+    if not endpoint or ' ' in endpoint or '/' in endpoint:
+        raise ValueError('Invalid endpoint')
+    return endpoint, secure
+
+class LUISRouter:
+    '''
+    LUIS Router Class.
+    Spreads requests over several regional endpoints, tracking an exponentially weighted
+    moving average of the latency and of the error rate of each one, and sending each
+    request to the fastest healthy endpoint. An endpoint whose error rate crosses the
+    threshold is skipped for a cooldown period, after which it is tried again.
+    '''
+
+    def __init__(self, endpoints, alpha=0.2, error_threshold=0.5, cooldown=30.0, explore=0.05):
+        '''
+        A constructor for the LUISRouter class.
+        :param endpoints: A list of endpoints, see parse_endpoint.
+        :param alpha: The weight of the newest sample in the moving averages, between 0 and 1.
+        :param error_threshold: The error rate above which an endpoint is considered unhealthy.
+        :param cooldown: The number of seconds an unhealthy endpoint is skipped for.
+        :param explore: The probability of sending a request to a random healthy endpoint,
+        so that the latency of the slower ones stays up to date.
+        '''
+        if endpoints is None:
+            raise TypeError('NULL endpoints')
+        endpoints = [parse_endpoint(endpoint) for endpoint in endpoints]
+        if not endpoints:
+            raise ValueError('Empty endpoints')
+        if not 0 < alpha <= 1:
+            raise ValueError('Invalid alpha')
+        if not 0 < error_threshold <= 1:
+            raise ValueError('Invalid error threshold')
+        if cooldown < 0:
+            raise ValueError('Invalid cooldown')
+        if not 0 <= explore <= 1:
+            raise ValueError('Invalid exploration rate')
+
+        self._endpoints = list(dict.fromkeys(endpoints))
+        self._alpha = alpha
+        self._error_threshold = error_threshold
+        self._cooldown = cooldown
+        self._explore = explore
+        self._lock = threading.Lock()
+        self._latency = dict.fromkeys(self._endpoints)
+        self._error_rate = dict.fromkeys(self._endpoints, 0.0)
+        self._down_until = dict.fromkeys(self._endpoints, 0.0)
+
+    def get_endpoints(self):
+        '''
+        A getter for the router's endpoints.
+        :return: A list of (host, secure) tuples.
+        '''
+        return list(self._endpoints)
+
+    def choose(self, exclude=()):
+        '''
+        Picks the endpoint for the next request.
+        Endpoints never used yet are tried first, then the fastest healthy one is picked.
+        If all of them are unhealthy, the one whose cooldown ends first is picked.
+        :param exclude: A collection of (host, secure) tuples that already failed for this request.
+        :return: A (host, secure) tuple.
+        '''
+        now = time.monotonic()
+        with self._lock:
+            candidates = [endpoint for endpoint in self._endpoints if endpoint not in exclude] \
+                or self._endpoints
+            healthy = [endpoint for endpoint in candidates if self._down_until[endpoint] <= now]
+            if not healthy:
+                return min(candidates, key=self._down_until.__getitem__)
+            if len(healthy) > 1 and random.random() < self._explore:
+                return random.choice(healthy)
+            return min(healthy, key=self._rank)
+
+    def _rank(self, endpoint):
+        '''
+        Ranks an endpoint by its latency, endpoints that never answered yet come first
+        unless they have only failed so far. Must be called with the lock held.
+        :param endpoint: A (host, secure) tuple.
+        :return: A number, lower is better.
+        '''
+        latency = self._latency[endpoint]
+        if latency is None:
+            return 0.0 if self._error_rate[endpoint] == 0 else float('inf')
+        return latency
+
+    def record_success(self, endpoint, latency):
+        '''
+        Records a successful request, requests to endpoints the router does not know are ignored.
+        :param endpoint: The (host, secure) tuple the request was sent to.
+        :param latency: The request's latency in seconds.
+        :return: None.
+        '''
+        if endpoint not in self._latency:
+            return
+        with self._lock:
+            previous = self._latency[endpoint]
+            self._latency[endpoint] = latency if previous is None \
+                else self._alpha * latency + (1 - self._alpha) * previous
+            self._error_rate[endpoint] *= 1 - self._alpha
+
+    def record_failure(self, endpoint):
+        '''
+        Records a failed request, marking the endpoint unhealthy once its error rate crosses the threshold.
+        Requests to endpoints the router does not know are ignored.
+        :param endpoint: The (host, secure) tuple the request was sent to.
+        :return: None.
+        '''
+        if endpoint not in self._error_rate:
+            return
+        with self._lock:
+            error_rate = self._alpha + (1 - self._alpha) * self._error_rate[endpoint]
+            self._error_rate[endpoint] = error_rate
+            if error_rate >= self._error_threshold:
+                self._down_until[endpoint] = time.monotonic() + self._cooldown
+
+    def get_stats(self):
+        '''
+        A getter for the router's view of each endpoint.
+        :return: A list of dictionaries with the endpoint, latency, error rate and healthy flag.
+        '''
+        now = time.monotonic()
+        with self._lock:
+            return [{'endpoint': ('https://' if secure else 'http://') + host
+                     , 'latency': self._latency[(host, secure)]
+                     , 'error_rate': self._error_rate[(host, secure)]
+                     , 'healthy': self._down_until[(host, secure)] <= now}
+                    for host, secure in self._endpoints]
@@ -0,0 +1,233 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+from array import array
+from .luis_response import LUISResponse, json_loads
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class LUISScoreMatrix:
+    '''
+    LUIS Score Matrix Class.
+    A dense NumPy matrix of the intent scores of a batch of responses, one row per utterance
+    and one column per intent, with vectorized top-k, margin and entropy computations and
+    threshold filters for offline analysis. Requires numpy.
+    '''
+
+    def __init__(self, responses, intents=None, missing=0.0, json_decoder=None):
+        '''
+        A constructor for the LUISScoreMatrix class.
+        :param responses: An iterable of LUISResponse objects, or of their raw JSON as strings, bytes
+        or decoded dictionaries; raw JSON is read without building LUISResponse objects.
+        :param intents: A list of intent names fixing the columns and their order, intents missing from it
+        being ignored, or None to have a column per intent seen, sorted by name so that batches
+        of the same app share the same index.
+        :param missing: The score of the intents a response has no score for, such as all but the top
+        scoring one in non verbose responses.
+        :param json_decoder: A function that decodes raw JSON strings or bytes, luis_response.json_loads is used if None.
+        '''
+        if numpy is None:
+            raise ImportError('LUISScoreMatrix requires numpy, install it with "pip install numpy"')
+        if responses is None:
+            raise TypeError('NULL responses')
+
+        fixed = intents is not None
+        index = {name: i for i, name in enumerate(intents)} if fixed else {}
+        if fixed and len(index) != len(intents):
+            raise ValueError('Invalid intents, names must be unique')
+        decode = json_decoder or json_loads
+        queries = []
+        rows = array('q')
+        columns = array('q')
+        scores = array('d')
+        for response in responses:
+            row = len(queries)
+            for name, score in self._read(response, decode, queries):
+                column = index.get(name)
+                if column is None:
+                    if fixed:
+                        continue
+                    column = index[name] = len(index)
+                rows.append(row)
+                columns.append(column)
+                scores.append(score)
+
+        names = list(intents) if fixed else sorted(index)
+        columns = numpy.frombuffer(columns, dtype=numpy.int64) if columns else numpy.zeros(0, numpy.int64)
+        if not fixed and names:
+            order = numpy.empty(len(names), numpy.int64)
+            order[[index[name] for name in names]] = numpy.arange(len(names))
+            columns = order[columns]
+        matrix = numpy.full((len(queries), len(names)), missing, dtype=numpy.float64)
+        if scores:
+            matrix[numpy.frombuffer(rows, dtype=numpy.int64), columns] = numpy.frombuffer(scores, dtype=numpy.float64)
+        self._queries = queries
+        self._intents = names
+        self._index = {name: i for i, name in enumerate(names)}
+        self._scores = matrix
+
+    @staticmethod
+    def _read(response, decode, queries):
+        '''
+        Reads the query and the intent scores of a response.
+        :param response: A LUISResponse object, or its raw JSON as a string, bytes or a decoded dictionary.
+        :param decode: The function decoding raw JSON strings or bytes.
+        :param queries: The list of queries, the response's query is appended to it.
+        :return: A list of (intent name, score) tuples.
+        '''
+        if isinstance(response, LUISResponse):
+            queries.append(response.get_query())
+            return [(intent.get_name(), intent.get_score()) for intent in response.get_intents()]
+        if isinstance(response, (str, bytes, bytearray, memoryview)):
+            response = decode(response)
+        queries.append(response['query'])
+        intents = response.get('intents') or [response['topScoringIntent']]
+        return [(intent['intent'], intent['score']) for intent in intents]
+
+    def get_scores(self):
+        '''
+        A getter for the score matrix.
+        :return: A float64 numpy array of shape (number of utterances, number of intents).
+        '''
+        return self._scores
+
+    def get_queries(self):
+        '''
+        A getter for the utterances, in row order.
+        :return: A list of queries.
+        '''
+        return self._queries
+
+    def get_intents(self):
+        '''
+        A getter for the intent names, in column order.
+        :return: A list of intent names.
+        '''
+        return self._intents
+
+    def get_intent_index(self, intent):
+        '''
+        Looks up the column of an intent.
+        :param intent: The intent name.
+        :return: The column index.
+        '''
+        if intent not in self._index:
+            raise KeyError('Unknown intent: %s' % intent)
+        return self._index[intent]
+
+    def get_top_k(self, k=1):
+        '''
+        Finds the k best scoring intents of every utterance.
+        :param k: The number of intents per utterance, at most the number of intents.
+        :return: A tuple of two numpy arrays of shape (number of utterances, k), the column indices
+        and the scores, best first.
+        '''
+        if k is None:
+            raise TypeError('NULL k')
+        if not 1 <= k <= len(self._intents):
+            raise ValueError('Invalid k')
+        scores = self._scores
+        if k < len(self._intents):
+            top = numpy.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = numpy.broadcast_to(numpy.arange(k), scores.shape).copy()
+        top_scores = numpy.take_along_axis(scores, top, axis=1)
+        order = numpy.argsort(-top_scores, axis=1, kind='stable')
+        return numpy.take_along_axis(top, order, axis=1), numpy.take_along_axis(top_scores, order, axis=1)
+
+    def get_top_intents(self):
+        '''
+        Names the best scoring intent of every utterance.
+        :return: A numpy array of intent names.
+        '''
+        columns, _ = self.get_top_k(1)
+        return numpy.asarray(self._intents, dtype=object)[columns[:, 0]]
+
+    def get_margins(self):
+        '''
+        Computes the margin between the best and the second best score of every utterance,
+        small margins marking utterances the model hesitates on.
+        :return: A numpy array of margins, the best score itself if there is a single intent.
+        '''
+        if len(self._intents) < 2:
+            return self._scores[:, 0].copy() if self._intents else numpy.zeros(len(self._queries))
+        _, top_scores = self.get_top_k(2)
+        return top_scores[:, 0] - top_scores[:, 1]
+
+    def get_entropies(self, normalized=True):
+        '''
+        Computes the entropy of every utterance's scores, once rescaled to sum to 1,
+        high entropies marking utterances no intent stands out for.
+        :param normalized: A boolean to indicate whether entropies are divided by their maximum,
+        the logarithm of the number of intents, to lie between 0 and 1 or not.
+        :return: A numpy array of entropies, in nats if not normalized.
+        '''
+        scores = numpy.clip(self._scores, 0.0, None)
+        totals = scores.sum(axis=1, keepdims=True)
+        probabilities = numpy.divide(scores, totals, out=numpy.zeros_like(scores), where=totals > 0)
+        logs = numpy.log(probabilities, out=numpy.zeros_like(probabilities), where=probabilities > 0)
+        entropies = -(probabilities * logs).sum(axis=1)
+        if normalized:
+            entropies = entropies / numpy.log(len(self._intents)) if len(self._intents) > 1 \
+                else numpy.zeros_like(entropies)
+        return entropies
+
+    def filter_rows(self, min_score=None, max_score=None, max_margin=None, min_entropy=None, intent=None):
+        '''
+        Selects the utterances matching all the given thresholds, such as the low confidence ones to review.
+        :param min_score: The minimum best score, None for no minimum.
+        :param max_score: The maximum best score, None for no maximum.
+        :param max_margin: The maximum margin between the best two scores, None for no maximum.
+        :param min_entropy: The minimum normalized entropy, None for no minimum.
+        :param intent: The name of the best scoring intent the utterances must have, None for any.
+        :return: A numpy array of row indices, in row order.
+        '''
+        if not self._intents:
+            return numpy.zeros(0, dtype=numpy.int64)
+        mask = numpy.ones(len(self._queries), dtype=bool)
+        if min_score is not None or max_score is not None or intent is not None:
+            columns, top_scores = self.get_top_k(1)
+            if min_score is not None:
+                mask &= top_scores[:, 0] >= min_score
+            if max_score is not None:
+                mask &= top_scores[:, 0] <= max_score
+            if intent is not None:
+                mask &= columns[:, 0] == self.get_intent_index(intent)
+        if max_margin is not None:
+            mask &= self.get_margins() <= max_margin
+        if min_entropy is not None:
+            mask &= self.get_entropies() >= min_entropy
+        return numpy.flatnonzero(mask)
@@ -0,0 +1,294 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import threading
+import time
+from itertools import islice
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from .luis_deadline import get_end_time, get_remaining
+
+class _LUISSession:
+    '''
+    The state of one conversation: the dialog of its last turn and the turns waiting to be sent.
+    '''
+    __slots__ = ('dialog', 'last_used', 'turns', 'busy')
+
+    def __init__(self, now):
+        '''
+        A constructor for the _LUISSession class.
+        :param now: The time.monotonic() value of the session's creation.
+        '''
+        self.dialog = None
+        self.last_used = now
+        self.turns = deque()
+        self.busy = False
+
+class LUISSessionManager:
+    '''
+    LUIS Session Manager Class.
+    Keeps the dialog state of many conversations, keyed by the caller's conversation ids,
+    and sends each turn of a conversation to LUIS: a prediction when no dialog is in
+    progress, a reply carrying the dialog's context Id otherwise. The turns of one
+    conversation are sent one after the other in the order they were submitted, while
+    different conversations run concurrently on the client's executor and share its
+    connection pool. The number of sessions is bounded, the least recently used ones
+    that have no turn in flight being dropped first, and idle sessions expire.
+    '''
+
+    def __init__(self, client, max_sessions=10000, idle_timeout=600.0):
+        '''
+        A constructor for the LUISSessionManager class.
+        :param client: The LUISClient the turns are sent with.
+        :param max_sessions: The maximum number of conversations kept.
+        :param idle_timeout: The number of seconds a conversation is kept after its last turn, None for no expiry.
+        '''
+        if client is None:
+            raise TypeError('NULL client')
+        if max_sessions is None:
+            raise TypeError('NULL maximum number of sessions')
+        if max_sessions < 1:
+            raise ValueError('Invalid maximum number of sessions')
+        if idle_timeout is not None and idle_timeout <= 0:
+            raise ValueError('Invalid idle timeout')
+
+        self._client = client
+        self._max_sessions = max_sessions
+        self._idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._sessions = OrderedDict()
+        self._expired = 0
+        self._evicted = 0
+
+    def send(self, conversation_id, text, force_set_parameter_name=None, deadline=None):
+        '''
+        Sends a turn of a conversation and waits for its response.
+        :param conversation_id: A hashable id of the conversation, chosen by the caller.
+        :param text: The text to be analysed and predicted.
+        :param force_set_parameter_name: The name of a dialog parameter to be reset, ignored when no dialog is in progress.
+        :param deadline: The number of seconds the turn may take, waiting for the conversation's earlier turns included,
+        None for no limit.
+        :return: A LUISResponse object containing the response data.
+        '''
+        return self.send_async(conversation_id, text, force_set_parameter_name, deadline=deadline).result()
+
+    def send_async(self, conversation_id, text, force_set_parameter_name=None, response_handlers=None
+                   , deadline=None):
+        '''
+        Queues a turn of a conversation, to be sent once the conversation's earlier turns are done.
+        :param conversation_id: A hashable id of the conversation, chosen by the caller.
+        :param text: The text to be analysed and predicted.
+        :param force_set_parameter_name: The name of a dialog parameter to be reset, ignored when no dialog is in progress.
+        :param response_handlers: A dictionary that contains two keys on_success and on_failure,
+        whose values are two functions to be executed once the turn is done, None to only use the returned Future.
+        :param deadline: The number of seconds the turn may take from now, None for no limit. The wait for
+        a free executor slot counts, and a LUISDeadlineExceeded is raised, failing the turns queued behind
+        this one too, if it runs out before the conversation could be scheduled.
+        :return: A Future of the LUISResponse.
+        '''
+        if conversation_id is None:
+            raise TypeError('NULL conversation id')
+        if text is None:
+            raise TypeError('NULL text to predict')
+        text = text.strip()
+        if not text:
+            raise ValueError('Empty text to predict')
+        if response_handlers is not None:
+            if 'on_success' not in response_handlers:
+                raise KeyError('You have to specify the success handler with key: "on_success"')
+            if 'on_failure' not in response_handlers:
+                raise KeyError('You have to specify the failure handler with key: "on_failure"')
+        future = Future()
+        if response_handlers is not None:
+            future.add_done_callback(lambda done: self._call_handlers(response_handlers, done))
+        turn = (text, force_set_parameter_name, get_end_time(deadline), future)
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            session = self._sessions.get(conversation_id)
+            if session is None:
+                self._evict(len(self._sessions) + 1 - self._max_sessions)
+                session = self._sessions[conversation_id] = _LUISSession(now)
+            else:
+                self._sessions.move_to_end(conversation_id)
+                session.last_used = now
+            session.turns.append(turn)
+            start = not session.busy
+            session.busy = True
+        if start:
+            try:
+                self._client.submit(self._run_turns, session, end_time=turn[2])
+            except BaseException as exc:
+                # The turns queued while submit was blocked would have run in this call.
+                with self._lock:
+                    session.turns.remove(turn)
+                    queued = list(session.turns)
+                    session.turns.clear()
+                    session.busy = False
+                for _, _, _, queued_future in queued:
+                    if queued_future.set_running_or_notify_cancel():
+                        queued_future.set_exception(exc)
+                raise
+        return future
+
+    def get_dialog(self, conversation_id):
+        '''
+        A getter for the dialog of a conversation's last turn.
+        :param conversation_id: The id of the conversation.
+        :return: A LUISDialog object, or None if the conversation is unknown or has no dialog.
+        '''
+        with self._lock:
+            self._expire(time.monotonic())
+            session = self._sessions.get(conversation_id)
+            return None if session is None else session.dialog
+
+    def end(self, conversation_id):
+        '''
+        Forgets a conversation, its queued turns are still sent.
+        :param conversation_id: The id of the conversation.
+        :return: A boolean that expresses whether the conversation was known or not.
+        '''
+        with self._lock:
+            return self._sessions.pop(conversation_id, None) is not None
+
+    def get_num_sessions(self):
+        '''
+        Counts the conversations currently kept, expiring the idle ones first.
+        :return: The number of conversations.
+        '''
+        with self._lock:
+            self._expire(time.monotonic())
+            return len(self._sessions)
+
+    def get_stats(self):
+        '''
+        A getter for the manager's counters.
+        :return: A dictionary with the sessions, expired and evicted counts.
+        '''
+        with self._lock:
+            self._expire(time.monotonic())
+            return {'sessions': len(self._sessions), 'expired': self._expired, 'evicted': self._evicted}
+
+    def _expire(self, now):
+        '''
+        Drops the conversations idle for longer than the idle timeout, the least recently
+        used ones being at the front. Busy conversations are skipped rather than stopping
+        the scan, so a long one cannot keep the idle ones behind it alive.
+        Must be called with the lock held.
+        :param now: The current time.monotonic() value.
+        :return: None.
+        '''
+        if self._idle_timeout is None:
+            return
+        expired = []
+        for conversation_id, session in self._sessions.items():
+            if session.busy:
+                continue
+            if now - session.last_used <= self._idle_timeout:
+                break
+            expired.append(conversation_id)
+        for conversation_id in expired:
+            del self._sessions[conversation_id]
+            self._expired += 1
+
+    def _evict(self, count):
+        '''
+        Drops the least recently used conversations that have no turn in flight, so that a busy
+        conversation keeps its dialog and the order of its turns. The number of sessions stays
+        above max_sessions while too many of them are busy. Must be called with the lock held.
+        :param count: The number of conversations to drop.
+        :return: None.
+        '''
+        if count <= 0:
+            return
+        idle = (conversation_id for conversation_id, session in self._sessions.items() if not session.busy)
+        for conversation_id in list(islice(idle, count)):
+            del self._sessions[conversation_id]
+            self._evicted += 1
+
+    def _run_turns(self, session):
+        '''
+        Sends a conversation's queued turns one after the other, on the client's executor.
+        :param session: The _LUISSession object.
+        :return: None.
+        '''
+        while True:
+            with self._lock:
+                if not session.turns:
+                    session.busy = False
+                    session.last_used = time.monotonic()
+                    return
+                text, force_set_parameter_name, end_time, future = session.turns.popleft()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                res = self._send_turn(session, text, force_set_parameter_name, end_time)
+            except Exception as exc:
+                future.set_exception(exc)
+                continue
+            future.set_result(res)
+
+    @staticmethod
+    def _call_handlers(response_handlers, future):
+        '''
+        Executes the success or failure handler of a finished turn.
+        :param response_handlers: A dictionary that contains two keys on_success and on_failure.
+        :param future: The turn's Future.
+        :return: None.
+        '''
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is not None:
+            response_handlers['on_failure'](exc)
+        else:
+            response_handlers['on_success'](future.result())
+
+    def _send_turn(self, session, text, force_set_parameter_name, end_time):
+        '''
+        Sends a turn as a prediction, or as a reply if the conversation has a dialog in progress,
+        and keeps the dialog of the response.
+        :param session: The _LUISSession object.
+        :param text: The text to be analysed and predicted.
+        :param force_set_parameter_name: The name of a dialog parameter to be reset.
+        :param end_time: The time.monotonic() value of the turn's deadline, None for no limit.
+        :return: A LUISResponse object containing the response data.
+        '''
+        client = self._client
+        dialog = session.dialog
+        if dialog is None or dialog.is_finished():
+            res = client.predict_sync(text, get_remaining(end_time), use_cache=False)
+        else:
+            res = client.reply_sync(text, dialog, force_set_parameter_name, get_remaining(end_time))
+        session.dialog = res.get_dialog()
+        return res
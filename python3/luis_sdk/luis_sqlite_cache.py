@@ -0,0 +1,303 @@
+'''
+Copyright (c) Microsoft. All rights reserved.
+Licensed under the MIT license.
+
+Microsoft Cognitive Services (formerly Project Oxford): https://www.microsoft.com/cognitive-services
+
+Microsoft Cognitive Services (formerly Project Oxford) GitHub:
+https://github.com/Microsoft/ProjectOxford-ClientSDK
+
+Copyright (c) Microsoft Corporation
+All rights reserved.
+
+MIT License:
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be
+included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED ""AS IS"", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+'''
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from .luis_cache import LUISCacheBackend
+from .luis_response import LUISResponse
+
+class LUISSQLiteCache(LUISCacheBackend):
+    '''
+    LUIS SQLite Cache Class.
+    A cache backend stored in an SQLite file, so several processes on one host
+    can share their predictions. The raw JSON payloads are stored as they were received,
+    writes are transactional in write-ahead-log mode, and the least recently used
+    entries are evicted to stay within the limits.
+    '''
+    _Schema = (
+        'CREATE TABLE IF NOT EXISTS luis_cache (key TEXT PRIMARY KEY, body BLOB NOT NULL'
+        ', size INTEGER NOT NULL, expires REAL, accessed REAL NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS luis_cache_accessed ON luis_cache (accessed)',
+        'CREATE TABLE IF NOT EXISTS luis_cache_totals (id INTEGER PRIMARY KEY CHECK (id = 0)'
+        ', entries INTEGER NOT NULL, bytes INTEGER NOT NULL)',
+        'INSERT OR IGNORE INTO luis_cache_totals VALUES (0, 0, 0)',
+        'CREATE TRIGGER IF NOT EXISTS luis_cache_insert AFTER INSERT ON luis_cache BEGIN '
+        'UPDATE luis_cache_totals SET entries = entries + 1, bytes = bytes + new.size; END',
+        'CREATE TRIGGER IF NOT EXISTS luis_cache_delete AFTER DELETE ON luis_cache BEGIN '
+        'UPDATE luis_cache_totals SET entries = entries - 1, bytes = bytes - old.size; END',
+    )
+    _EvictBatch = 64
+    _TouchInterval = 1.0
+
+    def __init__(self, path, max_entries=100000, max_bytes=None, ttl=300.0, timeout=5.0, stale_ttl=0.0):
+        '''
+        A constructor for the LUISSQLiteCache class.
+        :param path: The path of the SQLite file, created if missing.
+        :param max_entries: The maximum number of cached responses.
+        :param max_bytes: The maximum total size of the cached JSON payloads, None for no limit.
+        :param ttl: The number of seconds a response stays valid, None for no expiry.
+        :param timeout: The number of seconds to wait for another process's write to finish.
+        :param stale_ttl: The number of seconds an expired response is kept for get_stale.
+        '''
+        if path is None:
+            raise TypeError('NULL cache path')
+        if not path:
+            raise ValueError('Empty cache path')
+        if max_entries is None:
+            raise TypeError('NULL maximum number of entries')
+        if max_entries < 1:
+            raise ValueError('Invalid maximum number of entries')
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError('Invalid maximum size')
+        if ttl is not None and ttl <= 0:
+            raise ValueError('Invalid time to live')
+        if stale_ttl is None or stale_ttl < 0:
+            raise ValueError('Invalid stale time to live')
+
+        self._path = path
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._timeout = timeout
+        self._stale_ttl = stale_ttl
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lazy_responses = False
+        self._json_decoder = None
+        self._forked_conns = []
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                for statement in self._Schema:
+                    conn.execute(statement)
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+        finally:
+            conn.close()
+
+    def set_response_options(self, lazy_responses, json_decoder):
+        '''
+        Makes the responses parsed from the cached payloads match the ones of the client using the cache.
+        :param lazy_responses: A boolean to indicate whether the LUISResponse objects are built lazily or not.
+        :param json_decoder: A function that decodes the raw payload bytes into a dictionary, or None.
+        :return: None.
+        '''
+        self._lazy_responses = lazy_responses
+        self._json_decoder = json_decoder
+
+    def get(self, key):
+        '''
+        Looks a response up and marks it as recently used.
+        :param key: The cache key.
+        :return: A LUISResponse object parsed from the cached payload, or None if missing or expired.
+        '''
+        db_key = self._db_key(key)
+        conn = self._get_conn()
+        row = conn.execute('SELECT body, expires, accessed FROM luis_cache WHERE key = ?'
+                           , (db_key,)).fetchone()
+        now = time.time()
+        if row is None or (row[1] is not None and row[1] <= now):
+            if row is not None and row[1] + self._stale_ttl <= now:
+                self._write(conn, 'DELETE FROM luis_cache WHERE key = ? AND expires <= ?'
+                            , (db_key, now - self._stale_ttl))
+            with self._lock:
+                self._misses += 1
+            return None
+        if now - row[2] > self._TouchInterval:
+            self._write(conn, 'UPDATE luis_cache SET accessed = ? WHERE key = ?', (now, db_key))
+        with self._lock:
+            self._hits += 1
+        return LUISResponse(row[0], self._lazy_responses, self._json_decoder)
+
+    def get_stale(self, key):
+        '''
+        Looks a response up even if it has expired, within stale_ttl seconds of its expiry.
+        :param key: The cache key.
+        :return: A LUISResponse object parsed from the cached payload, or None if missing.
+        '''
+        row = self._get_conn().execute('SELECT body FROM luis_cache WHERE key = ? AND '
+                                       '(expires IS NULL OR expires > ?)'
+                                       , (self._db_key(key), time.time() - self._stale_ttl)).fetchone()
+        return None if row is None else LUISResponse(row[0], self._lazy_responses, self._json_decoder)
+
+    def set(self, key, response, body):
+        '''
+        Caches a response's raw payload, evicting the least recently used ones to stay within the limits.
+        :param key: The cache key.
+        :param response: The LUISResponse object to be cached.
+        :param body: The raw JSON payload bytes the response was parsed from.
+        :return: None.
+        '''
+        size = len(body)
+        if self._max_bytes is not None and size > self._max_bytes:
+            return
+        db_key = self._db_key(key)
+        now = time.time()
+        expires = None if self._ttl is None else now + self._ttl
+        conn = self._get_conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('DELETE FROM luis_cache WHERE key = ?', (db_key,))
+            conn.execute('INSERT INTO luis_cache VALUES (?, ?, ?, ?, ?)'
+                         , (db_key, sqlite3.Binary(body), size, expires, now))
+            evicted = self._evict(conn, now)
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+        if evicted:
+            with self._lock:
+                self._evictions += evicted
+
+    def clear(self):
+        '''
+        Removes all the cached responses, the counters are kept.
+        :return: None.
+        '''
+        self._write(self._get_conn(), 'DELETE FROM luis_cache', ())
+
+    def close(self):
+        '''
+        Closes the calling thread's connection to the SQLite file.
+        :return: None.
+        '''
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            if self._local.pid == os.getpid():
+                conn.close()
+            self._local.conn = None
+
+    def get_stats(self):
+        '''
+        A getter for the cache's counters, entries and bytes are shared by all the processes,
+        hits, misses and evictions are counted for this process only.
+        :return: A dictionary with the entries, bytes, hits, misses and evictions counts.
+        '''
+        entries, size = self._get_conn().execute(
+            'SELECT entries, bytes FROM luis_cache_totals WHERE id = 0').fetchone()
+        with self._lock:
+            return {'entries': entries, 'bytes': size, 'hits': self._hits
+                    , 'misses': self._misses, 'evictions': self._evictions}
+
+    def _get_conn(self):
+        '''
+        Returns the calling thread's connection to the SQLite file, opening it on first use
+        and again in a process forked after it was opened, such as a pre-forking server's workers,
+        since SQLite connections must not be used across a fork.
+        :return: An sqlite3.Connection object.
+        '''
+        conn = getattr(self._local, 'conn', None)
+        pid = os.getpid()
+        if conn is not None and self._local.pid != pid:
+            # The parent's connection is never used nor closed here, closing it
+            # could release or checkpoint state the parent still relies on.
+            self._forked_conns.append(conn)
+            conn = None
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            self._local.pid = pid
+        return conn
+
+    def _connect(self):
+        '''
+        Opens a new connection to the SQLite file.
+        :return: An sqlite3.Connection object.
+        '''
+        conn = sqlite3.connect(self._path, timeout=self._timeout, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _write(self, conn, statement, args):
+        '''
+        Executes a single write statement in its own transaction.
+        :param conn: The sqlite3.Connection object.
+        :param statement: The SQL statement.
+        :param args: The statement's arguments.
+        :return: None.
+        '''
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(statement, args)
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+    def _evict(self, conn, now):
+        '''
+        Removes expired entries, then the least recently used ones, until the cache is within its limits.
+        Must be called inside a write transaction.
+        :param conn: The sqlite3.Connection object.
+        :param now: The current time.
+        :return: The number of removed entries.
+        '''
+        entries, size = conn.execute('SELECT entries, bytes FROM luis_cache_totals WHERE id = 0').fetchone()
+        if not self._over_limits(entries, size):
+            return 0
+        evicted = conn.execute('DELETE FROM luis_cache WHERE expires <= ?', (now,)).rowcount
+        entries, size = conn.execute('SELECT entries, bytes FROM luis_cache_totals WHERE id = 0').fetchone()
+        while self._over_limits(entries, size):
+            evicted += conn.execute('DELETE FROM luis_cache WHERE key IN '
+                                    '(SELECT key FROM luis_cache ORDER BY accessed LIMIT ?)'
+                                    , (max(1, min(self._EvictBatch, entries - self._max_entries)),)).rowcount
+            entries, size = conn.execute('SELECT entries, bytes FROM luis_cache_totals WHERE id = 0').fetchone()
+        return evicted
+
+    def _over_limits(self, entries, size):
+        '''
+        Checks whether the cache holds too many entries or bytes or not.
+        :param entries: The number of cached entries.
+        :param size: The total size of the cached payloads.
+        :return: A boolean that expresses whether entries have to be evicted or not.
+        '''
+        return entries > self._max_entries or (self._max_bytes is not None and size > self._max_bytes)
+
+    @staticmethod
+    def _db_key(key):
+        '''
+        Serializes a cache key into the text stored in the SQLite file.
+        :param key: The cache key tuple.
+        :return: A string.
+        '''
+        return json.dumps(key, separators=(',', ':'), ensure_ascii=False)